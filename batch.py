@@ -0,0 +1,287 @@
+""" batch.py
+------------
+Apply a chain of Sequence transforms to many patterns, streaming records from
+files or stdin and processing them in chunks across a process pool. Run as
+`python -m musicians`.
+
+Records are one per line, either text (values separated by spaces or commas)
+or JSON lines (a list of values, or an object holding the list under a key).
+Output records have the same form as their input, in input order.
+
+A chain is a list of transforms separated by semicolons or newlines, each a
+method name followed by space separated arguments:
+
+    stretch 16; shift 2; replace_value 1 3
+
+Examples
+--------
+    python -m musicians -t 'stretch 16; loop 2' patterns.txt > out.txt
+    cat patterns.jsonl | python -m musicians -f chain.txt -w 8 -o out.jsonl
+"""
+
+from __future__ import annotations
+from typing import Optional
+
+import argparse
+import fileinput
+import itertools as its
+import json
+import os
+import sys
+import time
+
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from sequence import Sequence
+from history import NullHistorian
+
+# Defaults
+
+DEFAULT_CHUNK = 1000
+
+# JSON object key holding the sequence
+DEFAULT_KEY = 'seq'
+
+# chunks in flight per worker; bounds memory use regardless of input size
+CHUNKS_PER_WORKER = 2
+
+# transform name -> Sequence method
+TRANSFORMS = {
+    'stretch': 'stretch_to',
+    'stretch_to': 'stretch_to',
+    'stretch_by': 'stretch_by',
+    'shrink': 'shrink_to',
+    'shrink_to': 'shrink_to',
+    'shrink_by': 'shrink_by',
+    'expand': 'expand_to',
+    'expand_to': 'expand_to',
+    'expand_by': 'expand_by',
+    'contract': 'contract_to',
+    'contract_to': 'contract_to',
+    'contract_by': 'contract_by',
+    'shift': 'shift',
+    'loop': 'loop',
+    'reverse': 'reverse',
+    'replace_value': 'replace_value',
+    'replace_step': 'replace_step',
+    'remove_step': 'remove_step',
+}
+
+# Helper functions
+
+def parse_value(v: str):
+    "Parse int, float, None or string argument"
+
+    for conv in (int, float):
+        try:
+            return conv(v)
+        except ValueError:
+            pass
+
+    return None if v == 'None' else v
+
+def parse_chain(text: str):
+    "Parse chain text to a list of (method, args) tuples"
+
+    chain = []
+    for step in text.replace(';', '\n').splitlines():
+        name, *args = step.split() or ['']
+        if not name or name.startswith('#'): continue
+
+        if name not in TRANSFORMS: raise ValueError(f'Invalid transform: {name}')
+
+        chain.append((TRANSFORMS[name], tuple(parse_value(a) for a in args)))
+
+    return chain
+
+def _check_values(values):
+    "Check that record values are a list of numbers"
+
+    if type(values) != list or not all(type(v) in (int, float) for v in values):
+        raise ValueError(f'Invalid sequence: {values!r}')
+
+    return values
+
+def parse_record(line: str, key: str = DEFAULT_KEY):
+    "Parse record line to (form, data, values) where form and data are needed to format it again"
+
+    line = line.strip()
+
+    match line[:1]:
+        case '[':
+            return 'list', None, _check_values(json.loads(line))
+        case '{':
+            data = json.loads(line)
+            return 'object', data, _check_values(data[key])
+        case _:
+            sep = ', ' if ', ' in line else ',' if ',' in line else None
+            parts = line.split(sep and ',')
+
+            try:
+                values = [int(v) for v in parts]
+            except ValueError:
+                values = [parse_value(v.strip()) for v in parts]
+
+            return sep or ' ', None, _check_values(values)
+
+def format_record(form: str, data: Optional[dict], values: list, key: str = DEFAULT_KEY):
+    "Format record like the line it was parsed from"
+
+    match form:
+        case 'list':
+            return json.dumps(values)
+        case 'object':
+            return json.dumps(data | {key: values})
+        case sep:
+            return sep.join(map(str, values))
+
+class _BatchSequence(Sequence):
+    "Sequence for transform chains, where stretching to the same size leaves the sequence alone"
+
+    def stretch_to(self, size: Optional[int] = None, *args, **kwargs):
+        if size == self.steps: return self
+
+        return Sequence.stretch_to(self, size, *args, **kwargs)
+
+def apply_chain(values: list, chain: list, options: Optional[dict] = None):
+    "Apply transform chain to list of values, returning the result list"
+
+    seq = _BatchSequence(values, options = options)
+
+    # nothing is undone, so keep no undo copies
+    seq._undomgr = NullHistorian()
+
+    for method, args in chain: getattr(seq, method)(*args)
+
+    return seq.seq
+
+def process_chunk(start: int, lines: list, chain: list, options: Optional[dict] = None, key: str = DEFAULT_KEY):
+    """
+    Transform a chunk of record lines, numbered from start. Returns (output
+    lines, steps read, errors) where errors are (line number, message)
+    tuples for records that were skipped.
+    """
+
+    out, steps, errors = [], 0, []
+    for n, line in enumerate(lines, start):
+        if not line.strip(): continue
+
+        try:
+            form, data, values = parse_record(line, key)
+            out.append(format_record(form, data, apply_chain(values, chain, options), key))
+
+            # steps of skipped records are not counted as read
+            steps += len(values)
+        except (ValueError, TypeError, KeyError, IndexError, ArithmeticError) as e:
+            errors.append((n, f'{type(e).__name__}: {e}'))
+
+    return out, steps, errors
+
+def chunked(lines, size: int = DEFAULT_CHUNK):
+    "Yield (first line number, lines) chunks without reading ahead"
+
+    lines = iter(lines)
+    start = 1
+    while chunk := list(its.islice(lines, size)):
+        yield start, chunk
+        start += len(chunk)
+
+def run(lines, chain: list, out, *,
+        options: Optional[dict] = None,
+        key: str = DEFAULT_KEY,
+        workers: int = 1,
+        chunk: int = DEFAULT_CHUNK,
+        errors = None
+    ):
+    """
+    Transform record lines and write results to out in input order. Returns
+    statistics as a dict.
+
+    With more than one worker, chunks are processed in a process pool with at
+    most CHUNKS_PER_WORKER chunks per worker in flight.
+    """
+
+    stats = {'records': 0, 'steps': 0, 'errors': 0, 'seconds': 0.0}
+    start = time.perf_counter()
+
+    def write(result):
+        lines, steps, errs = result
+        if lines: out.write('\n'.join(lines) + '\n')
+
+        stats['records'] += len(lines)
+        stats['steps'] += steps
+        stats['errors'] += len(errs)
+        if errors is not None:
+            for n, msg in errs: errors.write(f'line {n}: {msg}\n')
+
+    if workers <= 1:
+        for first, lines_ in chunked(lines, chunk):
+            write(process_chunk(first, lines_, chain, options, key))
+    else:
+        with ProcessPoolExecutor(workers) as pool:
+            pending = deque()
+            for first, lines_ in chunked(lines, chunk):
+                pending.append(pool.submit(process_chunk, first, lines_, chain, options, key))
+                if len(pending) >= workers * CHUNKS_PER_WORKER: write(pending.popleft().result())
+
+            while pending: write(pending.popleft().result())
+
+    stats['seconds'] = time.perf_counter() - start
+
+    return stats
+
+def format_stats(stats: dict):
+    "Throughput report"
+
+    s = stats['seconds'] or 1e-9
+
+    return (f'{stats["records"]} records, {stats["steps"]} steps in {stats["seconds"]:.3f} s '
+            f'({stats["records"] / s:.0f} records/s, {stats["steps"] / s:.0f} steps/s), '
+            f'{stats["errors"]} errors')
+
+# Command line
+
+def main(argv: Optional[list] = None):
+    parser = argparse.ArgumentParser(prog = 'python -m musicians',
+                                     description = 'Apply Sequence transforms to pattern files')
+    parser.add_argument('files', nargs = '*', help = 'input files (default or - for stdin)')
+    parser.add_argument('-t', '--transforms', default = '', help = 'transform chain, e.g. "stretch 16; shift 2"')
+    parser.add_argument('-f', '--chain-file', help = 'read transform chain from file')
+    parser.add_argument('-o', '--output', help = 'output file (default stdout)')
+    parser.add_argument('-w', '--workers', type = int, default = os.cpu_count() or 1,
+                        help = 'worker processes (1 processes in this process)')
+    parser.add_argument('-c', '--chunk', type = int, default = DEFAULT_CHUNK, help = 'records per chunk')
+    parser.add_argument('-k', '--key', default = DEFAULT_KEY, help = 'JSON object key holding the sequence')
+    parser.add_argument('--option', action = 'append', default = [], metavar = 'NAME=VALUE',
+                        help = 'sequence option, e.g. stretch-with=repeat')
+    parser.add_argument('-q', '--quiet', action = 'store_true', help = 'do not report throughput')
+    args = parser.parse_args(argv)
+
+    text = args.transforms
+    if args.chain_file:
+        with open(args.chain_file) as f: text += '\n' + f.read()
+
+    try:
+        chain = parse_chain(text)
+        options = dict((name, parse_value(value)) for name, value in (o.split('=', 1) for o in args.option))
+    except ValueError as e:
+        parser.error(str(e))
+
+    if not chain: parser.error('no transforms given')
+
+    out = open(args.output, 'w') if args.output else sys.stdout
+
+    try:
+        with fileinput.input(args.files or ('-',)) as lines:
+            stats = run(lines, chain, out, options = options or None, key = args.key,
+                        workers = args.workers, chunk = max(args.chunk, 1), errors = sys.stderr)
+    finally:
+        if out is not sys.stdout: out.close()
+
+    if not args.quiet: print(format_stats(stats), file = sys.stderr)
+
+    return 1 if stats['errors'] else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,55 @@
+""" bench_duration.py
+---------------------
+Benchmarks for duration parsing and arithmetic
+"""
+
+import context
+
+import duration as d
+
+from harness import benchmark
+
+NAMES = ['4n', '8n', '16n', '8d', '4t', '2n', '16d', '32n']
+
+def _names(n: int):
+    return [NAMES[i % len(NAMES)] for i in range(n)]
+
+@benchmark('duration.validate_dur x n')
+def validate(n):
+    names = _names(n)
+    return lambda: [d.validate_dur(s) for s in names]
+
+@benchmark('duration.dur_to_frac x n')
+def to_frac(n):
+    names = _names(n)
+    return lambda: [d.dur_to_frac(s) for s in names]
+
+@benchmark('duration.frac_to_dur tied x n')
+def from_frac(n):
+    fracs = [d.Fraction(i % 61 + 3, 64) for i in range(n)]
+    return lambda: [d.frac_to_dur(f) for f in fracs]
+
+@benchmark('Duration(str) x n')
+def duration_str(n):
+    names = _names(n)
+    return lambda: [d.Duration(s) for s in names]
+
+@benchmark('Duration + Duration x n')
+def add(n):
+    durs = [d.Duration(s) for s in _names(n)]
+    return lambda: [x + y for x, y in zip(durs, reversed(durs))]
+
+@benchmark('FrozenDuration + str x n')
+def add_frozen(n):
+    durs = [d.FrozenDuration(s) for s in _names(n)]
+    return lambda: [x + '8n' for x in durs]
+
+@benchmark('DurationArray(strs)')
+def array_from_strs(n):
+    names = _names(n)
+    return lambda: d.DurationArray(names)
+
+@benchmark('DurationArray.onsets')
+def onsets(n):
+    da = d.DurationArray(_names(n))
+    return lambda: da.onsets()
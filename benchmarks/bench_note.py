@@ -0,0 +1,44 @@
+""" bench_note.py
+-----------------
+Benchmarks for Note construction and NoteArray conversion
+"""
+
+import context
+
+import duration as d
+from note import Note, NoteArray
+
+from harness import benchmark
+
+@benchmark('Note(int, int, int) x n')
+def note_ints(n):
+    return lambda: [Note(60 + i % 12, 4, 100) for i in range(n)]
+
+@benchmark('Note(str, str, int) x n')
+def note_strs(n):
+    return lambda: [Note('C#4', '8d', 100) for _ in range(n)]
+
+@benchmark('Note.from_values x n')
+def from_values(n):
+    return lambda: [Note.from_values(60 + i % 12, d.PPQ, 100) for i in range(n)]
+
+@benchmark('Note.many')
+def many(n):
+    pitches = [60 + i % 12 for i in range(n)]
+    ticks = [d.PPQ for _ in range(n)]
+    return lambda: Note.many(pitches, ticks, 100)
+
+@benchmark('Note.copy x n')
+def copy(n):
+    notes = [Note(60 + i % 12, 4, 100) for i in range(n)]
+    return lambda: [x.copy() for x in notes]
+
+@benchmark('NoteArray(notes)')
+def note_array(n):
+    notes = Note.many([60 + i % 12 for i in range(n)], [d.PPQ for _ in range(n)], 100)
+    return lambda: NoteArray(notes)
+
+@benchmark('NoteArray.transpose')
+def transpose(n):
+    na = NoteArray.from_columns([60 + i % 12 for i in range(n)], [d.PPQ] * n, [100] * n)
+    return lambda: na.transpose(1)
@@ -0,0 +1,45 @@
+""" bench_pitch.py
+------------------
+Benchmarks for pitch parsing and Pitch operations
+"""
+
+import context
+
+import pitch as p
+
+from harness import benchmark
+
+NAMES = ['C4', 'C#4', 'Db3', 'E5', 'F#2', 'G', 'Ab6', 'B1']
+
+def _names(n: int):
+    return [NAMES[i % len(NAMES)] for i in range(n)]
+
+@benchmark('pitch.parse_pitch x n')
+def parse(n):
+    names = _names(n)
+    return lambda: [p.parse_pitch(s) for s in names]
+
+@benchmark('pitch.pitch_to_value x n')
+def to_value(n):
+    names = _names(n)
+    return lambda: [p.pitch_to_value(s) for s in names]
+
+@benchmark('pitch.value_to_pitch x n')
+def to_pitch(n):
+    values = [i % 128 for i in range(n)]
+    return lambda: [p.value_to_pitch(v) for v in values]
+
+@benchmark('Pitch(str) x n')
+def pitch_str(n):
+    names = _names(n)
+    return lambda: [p.Pitch(s) for s in names]
+
+@benchmark('Pitch(int) x n')
+def pitch_int(n):
+    values = [i % 128 for i in range(n)]
+    return lambda: [p.Pitch(v) for v in values]
+
+@benchmark('Pitch.transpose x n')
+def transpose(n):
+    pitches = [p.Pitch(i % 128) for i in range(n)]
+    return lambda: [x.transpose(1, 12) for x in pitches]
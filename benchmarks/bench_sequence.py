@@ -0,0 +1,77 @@
+""" bench_sequence.py
+---------------------
+Benchmarks for Sequence methods, including undo registration
+"""
+
+import context
+
+from sequence import Sequence
+
+from harness import benchmark
+
+def _seq(n: int):
+    "List of n values with a hit every 4 steps"
+    return [(i % 7) + 1 if i % 4 == 0 else 0 for i in range(n)]
+
+# Methods that change length start from a fresh copy of the list each call
+# (set() is O(n) so this adds a constant factor, not a change in scaling)
+
+@benchmark('Sequence.set')
+def seq_set(n):
+    s, base = Sequence(), _seq(n)
+    return lambda: s.set(base[:])
+
+@benchmark('Sequence.insert')
+def insert(n):
+    s, base = Sequence(), _seq(n)
+    return lambda: s.set(base[:]).insert([1, 2, 3, 4], n // 2)
+
+@benchmark('Sequence.remove')
+def remove(n):
+    s, base = Sequence(), _seq(n)
+    return lambda: s.set(base[:]).remove(n // 2, 4)
+
+@benchmark('Sequence.shift')
+def shift(n):
+    s = Sequence(_seq(n))
+    return lambda: s.shift(3)
+
+@benchmark('Sequence.stretch_to')
+def stretch_to(n):
+    s, base = Sequence(), _seq(n)
+    return lambda: s.set(base[:]).stretch_to(n * 2 + n // 3)
+
+@benchmark('Sequence.expand_to loop')
+def expand_to(n):
+    s, base = Sequence(), _seq(n)
+    return lambda: s.set(base[:]).expand_to(n * 2, "loop")
+
+@benchmark('Sequence.reverse')
+def reverse(n):
+    s = Sequence(_seq(n))
+    return lambda: s.reverse()
+
+@benchmark('Sequence.loop')
+def loop(n):
+    s, base = Sequence(), _seq(max(n // 4, 1))
+    return lambda: s.set(base[:]).loop(4)
+
+@benchmark('Sequence.replace_value')
+def replace_value(n):
+    s = Sequence(_seq(n))
+    return lambda: s.replace_value(1, 1)
+
+@benchmark('Sequence.replace_step x n')
+def replace_step(n):
+    s = Sequence(_seq(n))
+    def run():
+        for step in range(1, n + 1): s.replace_step(step, 1)
+    return run
+
+@benchmark('Sequence.undo')
+def undo(n):
+    s, base = Sequence(), _seq(n)
+    def run():
+        s.set(base[:]).reverse()
+        s.undo()
+    return run
@@ -0,0 +1,72 @@
+""" bench_sequence_base.py
+--------------------------
+Benchmarks for list functions in sequence_base
+"""
+
+import context
+
+import sequence_base as sb
+
+from harness import benchmark
+
+def _seq(n: int):
+    "List of n values with a hit every 4 steps"
+    return [(i % 7) + 1 if i % 4 == 0 else 0 for i in range(n)]
+
+@benchmark('sequence_base.shift_seq')
+def shift(n):
+    seq = _seq(n)
+    return lambda: sb.shift_seq(seq, n // 3)
+
+@benchmark('sequence_base.stretch_seq int')
+def stretch_int(n):
+    seq = _seq(n)
+    return lambda: sb.stretch_seq(seq, n * 2 + n // 3, 0)
+
+@benchmark('sequence_base.stretch_seq repeat')
+def stretch_repeat(n):
+    seq = _seq(n)
+    return lambda: sb.stretch_seq(seq, n * 2 + n // 3, "repeat")
+
+@benchmark('sequence_base.stretch_seq interpolate')
+def stretch_interpolate(n):
+    seq = _seq(n)
+    return lambda: sb.stretch_seq(seq, n * 2 + n // 3, "interpolate")
+
+@benchmark('sequence_base.stretch_seq shrink')
+def shrink(n):
+    seq = _seq(n)
+    return lambda: sb.stretch_seq(seq, n // 2 + 1, 0)
+
+@benchmark('sequence_base.stretch_positions')
+def stretch_positions(n):
+    return lambda: sb.stretch_positions(n, n * 2 + n // 3)
+
+@benchmark('sequence_base.expand_seq int')
+def expand_int(n):
+    seq = _seq(n)
+    return lambda: sb.expand_seq(seq, n * 2, 0)
+
+@benchmark('sequence_base.expand_seq loop')
+def expand_loop(n):
+    seq = _seq(n)
+    return lambda: sb.expand_seq(seq, n * 2, "loop", n // 4 or 1)
+
+@benchmark('sequence_base.expand_seq interpolate')
+def expand_interpolate(n):
+    seq = _seq(n)
+    return lambda: sb.expand_seq(seq, n * 2, "interpolate")
+
+@benchmark('sequence_base.reverse_seq')
+def reverse(n):
+    seq = _seq(n)
+    return lambda: sb.reverse_seq(seq)
+
+@benchmark('sequence_base.loop_seq')
+def loop(n):
+    seq = _seq(max(n // 4, 1))
+    return lambda: sb.loop_seq(seq, 4)
+
+@benchmark('sequence_base.generate_euclidean')
+def euclidean(n):
+    return lambda: sb.generate_euclidean(n, n // 4 + 1, 1)
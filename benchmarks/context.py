@@ -0,0 +1,7 @@
+# same layout as tests/context.py
+
+import os
+import sys
+
+# add package path to search path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
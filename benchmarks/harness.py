@@ -0,0 +1,136 @@
+""" harness.py
+--------------
+Minimal benchmark registry, timer, baseline storage and scaling report
+"""
+
+from __future__ import annotations
+from typing import Optional
+
+import json
+import math
+import timeit
+
+# Defaults
+
+DEFAULT_SIZES = (16, 256, 4096, 65536)
+FULL_SIZES = DEFAULT_SIZES + (1048576,)
+
+# stop growing a benchmark once a single call takes longer than this
+DEFAULT_MAX_CALL = 1.0
+
+# allowed slowdown against baseline before reporting a regression
+DEFAULT_THRESHOLD = 0.25
+
+# scaling exponent above which growth is reported as superlinear
+SUPERLINEAR = 1.3
+
+# Registry
+
+BENCHMARKS = {}
+
+def benchmark(name: str, max_size: Optional[int] = None):
+    """
+    Register a benchmark.
+
+    Decorates a setup function that takes a size n and returns a callable
+    doing n items of work. Only the returned callable is timed.
+    """
+
+    def register(setup):
+        BENCHMARKS[name] = (setup, max_size)
+        return setup
+
+    return register
+
+# Timing
+
+def measure(fn, repeat: int = 3):
+    "Best time of a single call in seconds"
+
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+
+    return min(timer.repeat(repeat, number)) / number
+
+def run(names: Optional[list] = None, sizes: tuple = DEFAULT_SIZES, max_call: float = DEFAULT_MAX_CALL, out = print):
+    """
+    Run benchmarks at each size.
+
+    Returns {name: {size: seconds}}. Sizes are strings so results match
+    saved JSON.
+    """
+
+    results = {}
+
+    for name, (setup, max_size) in BENCHMARKS.items():
+        if names and not any(n in name for n in names): continue
+
+        results[name] = {}
+
+        for n in sizes:
+            if max_size and n > max_size: break
+
+            t = measure(setup(n))
+            results[name][str(n)] = t
+
+            out(f'{name:40} {n:>9} {t * 1e6:14.2f} us')
+
+            if t > max_call: break
+
+    return results
+
+# Baselines
+
+def save(results: dict, path: str):
+    "Save results as a JSON baseline"
+
+    with open(path, 'w') as f:
+        json.dump(results, f, indent = 2, sort_keys = True)
+
+def load(path: str):
+    "Load a JSON baseline"
+
+    with open(path) as f:
+        return json.load(f)
+
+def compare(results: dict, baseline: dict, threshold: float = DEFAULT_THRESHOLD):
+    """
+    Compare results with baseline.
+
+    Returns a list of (name, size, baseline seconds, seconds, ratio) for each
+    result slower than baseline by more than threshold.
+    """
+
+    r = []
+    for name, times in results.items():
+        for n, t in times.items():
+            base = baseline.get(name, {}).get(n)
+            if base and t / base > 1 + threshold:
+                r.append((name, int(n), base, t, t / base))
+
+    return r
+
+# Reporting
+
+def exponents(times: dict):
+    "Scaling exponent between each pair of consecutive sizes (1 is linear)"
+
+    points = sorted((int(n), t) for n, t in times.items())
+
+    return [(n2, math.log(t2 / t1) / math.log(n2 / n1)) for (n1, t1), (n2, t2) in zip(points, points[1:])]
+
+def scaling_report(results: dict):
+    "Text table of time per item and scaling exponent for each benchmark"
+
+    lines = []
+    for name, times in results.items():
+        lines.append(name)
+
+        exps = dict(exponents(times))
+        for n, t in sorted((int(n), t) for n, t in times.items()):
+            e = exps.get(n)
+            flag = '  superlinear' if e is not None and e > SUPERLINEAR else ''
+            e = f'{e:6.2f}' if e is not None else '     -'
+            lines.append(f'  {n:>9} {t * 1e9 / n:12.1f} ns/item  x^{e}{flag}')
+
+    return '\n'.join(lines)
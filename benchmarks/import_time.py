@@ -0,0 +1,75 @@
+#!python
+""" import_time.py
+------------------
+Measure cold import time of the package and its modules, each in a fresh
+interpreter, as seen by short-lived worker processes.
+
+Examples
+--------
+    python benchmarks/import_time.py
+    python benchmarks/import_time.py --repeat 50 'musicians.Pitch' sequence
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# statement run after import -> what it imports
+TARGETS = {
+    'musicians': 'import musicians',
+    'musicians.Pitch': 'import musicians; musicians.Pitch',
+    'musicians.Duration': 'import musicians; musicians.Duration',
+    'musicians.Sequence': 'import musicians; musicians.Sequence',
+    'musicians.Note': 'import musicians; musicians.Note',
+    'pitch': 'import pitch',
+    'duration': 'import duration',
+    'sequence': 'import sequence',
+    'note': 'import note',
+    'tempo': 'import tempo',
+}
+
+DEFAULT_REPEAT = 20
+
+# timing code run in the child; prints seconds spent in the statement
+CHILD = 'import time; t = time.perf_counter(); {}; print(time.perf_counter() - t)'
+
+def measure(stmt: str, repeat: int = DEFAULT_REPEAT):
+    "Run statement in fresh interpreters, returning (import times, process times) in seconds"
+
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(p for p in (ROOT, env.get('PYTHONPATH')) if p)
+
+    imports, procs = [], []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        out = subprocess.run([sys.executable, '-c', CHILD.format(stmt)], env = env,
+                             capture_output = True, text = True, check = True).stdout
+        procs.append(time.perf_counter() - start)
+        imports.append(float(out))
+
+    return imports, procs
+
+def main(argv = None):
+    parser = argparse.ArgumentParser(description = 'Measure cold import times')
+    parser.add_argument('targets', nargs = '*', help = f'targets to measure (default all): {", ".join(TARGETS)}')
+    parser.add_argument('--repeat', type = int, default = DEFAULT_REPEAT, help = 'fresh interpreters per target')
+    args = parser.parse_args(argv)
+
+    _, base = measure('pass', args.repeat)
+    print(f'{"target":24} {"import ms":>10} {"min ms":>10} {"process ms":>11}')
+    print(f'{"(empty interpreter)":24} {"":>10} {"":>10} {statistics.median(base) * 1e3:>11.2f}')
+
+    for name in args.targets or TARGETS:
+        imports, procs = measure(TARGETS.get(name, f'import {name}'), args.repeat)
+        print(f'{name:24} {statistics.median(imports) * 1e3:>10.2f} {min(imports) * 1e3:>10.2f} '
+              f'{statistics.median(procs) * 1e3:>11.2f}')
+
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
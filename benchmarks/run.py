@@ -0,0 +1,64 @@
+#!python
+""" run.py
+----------
+Run benchmarks, print scaling curves and save or compare JSON baselines.
+
+Examples
+--------
+    python benchmarks/run.py
+    python benchmarks/run.py --full --save benchmarks/baseline.json
+    python benchmarks/run.py --compare benchmarks/baseline.json --threshold 0.2
+    python benchmarks/run.py stretch Note
+"""
+
+import argparse
+import sys
+
+import harness
+
+# register benchmarks
+
+import bench_sequence_base
+import bench_sequence
+import bench_pitch
+import bench_duration
+import bench_note
+
+def main(argv = None):
+    parser = argparse.ArgumentParser(description = 'Run benchmarks')
+    parser.add_argument('names', nargs = '*', help = 'only run benchmarks with names containing these')
+    parser.add_argument('--sizes', help = 'comma separated input sizes')
+    parser.add_argument('--full', action = 'store_true', help = 'include 1M item inputs')
+    parser.add_argument('--max-call', type = float, default = harness.DEFAULT_MAX_CALL,
+                        help = 'stop growing a benchmark once a call takes this many seconds')
+    parser.add_argument('--save', metavar = 'PATH', help = 'save results as JSON baseline')
+    parser.add_argument('--compare', metavar = 'PATH', help = 'compare results with JSON baseline')
+    parser.add_argument('--threshold', type = float, default = harness.DEFAULT_THRESHOLD,
+                        help = 'allowed slowdown against baseline (0.25 is 25%%)')
+    args = parser.parse_args(argv)
+
+    sizes = harness.FULL_SIZES if args.full else harness.DEFAULT_SIZES
+    if args.sizes: sizes = tuple(int(n) for n in args.sizes.split(','))
+
+    results = harness.run(args.names, sizes, args.max_call)
+
+    print()
+    print(harness.scaling_report(results))
+
+    if args.save:
+        harness.save(results, args.save)
+        print(f'\nSaved baseline to {args.save}')
+
+    if args.compare:
+        regressions = harness.compare(results, harness.load(args.compare), args.threshold)
+
+        print(f'\n{len(regressions)} regression(s) against {args.compare}')
+        for name, n, base, t, ratio in regressions:
+            print(f'  {name} n={n}: {base * 1e6:.2f} us -> {t * 1e6:.2f} us ({ratio:.2f}x)')
+
+        if regressions: return 1
+
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -13,52 +13,129 @@ import re
 from fractions import Fraction
 
 import itertools as its
+import functools
+import math
+
+from array import array
 
 # durations: 64, 32, 16, 8, 4, 2, 1
 # modifiers: [d]otted, [t]riplet
 
 # Constants
 
-RE_DURATION = re.compile(r'(64|32|16|8|4|2|1)(d?t?|n?)')
-
-MOD_DURATIONS = {
-    '1n': Fraction(1, 1),
-    '2d': Fraction(1, 2) + Fraction(1, 4),
-    '2n': Fraction(1, 2),
-    '4d': Fraction(1, 4) + Fraction(1, 8),
-    '4n': Fraction(1, 4),
-    '8d': Fraction(1, 8) + Fraction(1, 16),
-    '8n': Fraction(1, 8),
-    '16d': Fraction(1, 16) + Fraction(1, 32),
-    '16n': Fraction(1, 16),
-    '32d': Fraction(1, 32) + Fraction(1, 64),
-    '32n': Fraction(1, 32),
-    '64n': Fraction(1, 64),
-    Fraction(1, 1): '1n',
-    Fraction(1, 2) + Fraction(1, 4): '2d',
-    Fraction(1, 2): '2n',
-    Fraction(1, 4) + Fraction(1, 8): '4d',
-    Fraction(1, 4): '4n',
-    Fraction(1, 8) + Fraction(1, 16): '8d',
-    Fraction(1, 8): '8n',
-    Fraction(1, 16) + Fraction(1, 32): '16d',
-    Fraction(1, 16): '16n',
-    Fraction(1, 32) + Fraction(1, 64): '32d',
-    Fraction(1, 32): '32n',
-    Fraction(1, 64): '64n',
-}
-
-DUR_STRINGS = [k for k in MOD_DURATIONS if type(k) == str]
-DUR_FRACTIONS = [k for k in MOD_DURATIONS if type(k) == Fraction]
+# regexes and tables that are rarely needed are built on first use (see
+# __getattr__); RE_DURATION, MOD_DURATIONS, DUR_STRINGS and DUR_FRACTIONS are
+# still available as module attributes
+
+DURATION_RE = r'(64|32|16|8|4|2|1)(d?t?|n?)'
+
+_lazy = {}
+
+def _regex():
+    "Get compiled duration regex"
+
+    r = _lazy.get('RE_DURATION')
+    if r is None: r = _lazy['RE_DURATION'] = re.compile(DURATION_RE)
+
+    return r
+
+def _mod_durations():
+    "Duration string <-> fraction table"
+
+    return {
+        '1n': Fraction(1, 1),
+        '2d': Fraction(1, 2) + Fraction(1, 4),
+        '2n': Fraction(1, 2),
+        '4d': Fraction(1, 4) + Fraction(1, 8),
+        '4n': Fraction(1, 4),
+        '8d': Fraction(1, 8) + Fraction(1, 16),
+        '8n': Fraction(1, 8),
+        '16d': Fraction(1, 16) + Fraction(1, 32),
+        '16n': Fraction(1, 16),
+        '32d': Fraction(1, 32) + Fraction(1, 64),
+        '32n': Fraction(1, 32),
+        '64n': Fraction(1, 64),
+        Fraction(1, 1): '1n',
+        Fraction(1, 2) + Fraction(1, 4): '2d',
+        Fraction(1, 2): '2n',
+        Fraction(1, 4) + Fraction(1, 8): '4d',
+        Fraction(1, 4): '4n',
+        Fraction(1, 8) + Fraction(1, 16): '8d',
+        Fraction(1, 8): '8n',
+        Fraction(1, 16) + Fraction(1, 32): '16d',
+        Fraction(1, 16): '16n',
+        Fraction(1, 32) + Fraction(1, 64): '32d',
+        Fraction(1, 32): '32n',
+        Fraction(1, 64): '64n',
+    }
+
+def __getattr__(name: str):
+    if name not in _lazy:
+        match name:
+            case 'RE_DURATION':
+                _regex()
+            case 'MOD_DURATIONS':
+                _lazy[name] = _mod_durations()
+            case 'DUR_STRINGS':
+                _lazy[name] = [k for k in __getattr__('MOD_DURATIONS') if type(k) == str]
+            case 'DUR_FRACTIONS':
+                _lazy[name] = [k for k in __getattr__('MOD_DURATIONS') if type(k) == Fraction]
+            case _:
+                raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+    return _lazy[name]
 
 DEFAULT_DURATION = '4n'
 
+# Tick resolution
+
+# pulses per quarter note. Must be divisible by 96 so that 64th note dotted and
+# triplet values are whole tick counts
+PPQ = 480
+
+TICKS_PER_WHOLE = PPQ * 4
+
+# duration string -> ticks, including dotted and triplet modifiers
+DUR_TICKS = {}
+
+# ticks -> duration string, preferring plain and dotted notes over triplets
+TICK_DURS = {}
+
+# plain note tick values, longest first, used for decomposition
+SIMPLE_TICKS = []
+
+# plain and dotted note tick values, longest first
+DOTTED_TICKS = []
+
+# ticks -> ticks of the note with modifiers stripped, for floor
+FLOOR_TICKS = {}
+
+# ticks -> ticks of the next longer plain note, for ceil
+CEIL_TICKS = {}
+
+# Tied duration tables
+
+# ways to split a value that is not a single note into tied notes
+TIE_STRATEGIES = ('greedy', 'fewest', 'dotted', 'beats')
+
+# number of 4/4 bars covered by the precomputed tie tables
+TIE_TABLE_BARS = 4
+
+# strategy -> {ticks: tuple of duration strings}, built on first use
+TIE_TABLES = {}
+
+# valid int and string duration values (e.g. 4, '4', '8d') -> ticks
+TICKS_CACHE = {}
+
+# ticks -> interned FrozenDuration
+FROZEN_DURATIONS = {}
+
 # Helper functions
 
 def validate_dur(dstr: str|int):
     "Validate duration string"
 
-    m = RE_DURATION.match(str(dstr))
+    m = _regex().match(str(dstr))
 
     if not m: raise ValueError(f'Invalid duration: {dstr}')
 
@@ -70,178 +147,413 @@ def split_dur(dstr: str|int):
     "Split duration string into (dur, mods)"
 
     dstr = validate_dur(dstr)
-    m = RE_DURATION.match(dstr)
+    m = _regex().match(dstr)
 
     return m[1], m[2]
 
 def dur_to_frac(d):
     "Convert duration string to fraction"
 
-    dur, mods = split_dur(d)
+    return _mods_to_frac(*split_dur(d))
+
+def _mods_to_frac(dur: str, mods: str):
+    "Convert split duration string to fraction"
+
     d = Fraction(1, int(dur))
     if 'd' in mods: d += (d / 2)
+    if 't' in mods: d *= Fraction(2, 3)
 
     return d
 
-def frac_to_dur(f: int|float|Fraction):
-    "Convert fraction to a duration"
+def frac_to_dur(f: int|float|Fraction, strategy: str = 'greedy', onset: int|float|Fraction = 0):
+    "Convert fraction to a duration, or a tuple of tied durations (see ticks_to_dur, onset as a fraction)"
+
+    return ticks_to_dur(frac_to_ticks(f), strategy, frac_to_ticks(onset) if onset else 0)
+
+# Tick functions
+
+def _build_tick_tables():
+    "Build tick lookup tables for the current PPQ"
+
+    DUR_TICKS.clear()
+    TICK_DURS.clear()
+
+    # triplets last so plain and dotted names win on collisions (e.g. 4dt == 4n)
+    for mods in ('n', 'd', 't', 'dt'):
+        for dur in ('1', '2', '4', '8', '16', '32', '64'):
+            dstr = dur + mods
+            ticks = frac_to_ticks(_mods_to_frac(dur, mods))
+            DUR_TICKS[dstr] = ticks
+            TICK_DURS.setdefault(ticks, dstr)
+
+    SIMPLE_TICKS[:] = sorted((t for d, t in DUR_TICKS.items() if d[-1] == 'n'), reverse = True)
+    DOTTED_TICKS[:] = sorted((t for d, t in DUR_TICKS.items() if d[-1] in 'nd'), reverse = True)
+
+    FLOOR_TICKS.clear()
+    CEIL_TICKS.clear()
+    for ticks, dstr in TICK_DURS.items():
+        dur = dstr.rstrip('ndt')
+        mods = dstr[len(dur):]
+        FLOOR_TICKS[ticks] = DUR_TICKS[dur + 'n']
+        CEIL_TICKS[ticks] = FLOOR_TICKS[ticks] * 2 if 'd' in mods else ticks
+
+    # anything derived from tick values depends on tick resolution
+    TIE_TABLES.clear()
+    _decompose.cache_clear()
+    TICKS_CACHE.clear()
+    FROZEN_DURATIONS.clear()
+
+def set_ppq(ppq: int):
+    """
+    Set tick resolution in pulses per quarter note.
 
-    if type(f) != Fraction: f = Fraction(f)
+    Existing Duration instances keep their tick counts, so this should be set
+    before creating durations.
+    """
 
-    if f in MOD_DURATIONS: return MOD_DURATIONS[f]
+    global PPQ, TICKS_PER_WHOLE
 
-    # get simplest set of notes that add to f
-    def _frac_to_dur(f, _):
-        if f in MOD_DURATIONS:
-            _.append(MOD_DURATIONS[f])
+    if ppq <= 0 or ppq % 96: raise ValueError(f'Invalid PPQ (must be a multiple of 96): {ppq}')
+
+    PPQ = ppq
+    TICKS_PER_WHOLE = ppq * 4
+
+    _build_tick_tables()
+
+def frac_to_ticks(f: int|float|Fraction):
+    "Convert fraction of a whole note to ticks"
+
+    return round(f * TICKS_PER_WHOLE)
+
+def ticks_to_frac(ticks: int):
+    "Convert ticks to fraction of a whole note"
+
+    return Fraction(ticks, TICKS_PER_WHOLE)
+
+def dur_to_ticks(d: str|int):
+    "Convert duration string to ticks"
+
+    ticks = DUR_TICKS.get(d)
+
+    if ticks is None: ticks = DUR_TICKS[validate_dur(d)]
+
+    return ticks
+
+def ticks_to_dur(ticks: int, strategy: str = 'greedy', onset: int = 0):
+    """
+    Convert ticks to a duration, or a tuple of tied durations if not a single
+    note.
+
+    Tied values are looked up in a precomputed table covering the 64th note and
+    64th triplet grids up to TIE_TABLE_BARS bars of 4/4. Values outside the
+    table are computed and kept in an LRU cache.
+
+    Parameters
+    ----------
+    ticks
+        Tick count to convert
+    strategy
+        How to split tied values. Valid values:
+        "greedy": longest plain note first (default)
+        "fewest": fewest notes
+        "dotted": longest plain or dotted note first
+        "beats": split at quarter note beat boundaries counted from onset
+    onset
+        Tick position the value starts at, used by "beats" so that a value
+        starting off the beat is tied at the next beat first
+    """
+
+    # the tables assume values start on the beat, so values crossing a beat
+    # from off the beat are split here, even if they are a single note
+    onset %= PPQ
+    if onset and strategy == 'beats' and onset + ticks > PPQ: return _decompose(ticks, strategy, onset)
+
+    if ticks in TICK_DURS: return TICK_DURS[ticks]
+
+    table = TIE_TABLES.get(strategy)
+    if table is None: table = _build_tie_table(strategy)
+
+    r = table.get(ticks)
+    if r is None: r = _decompose(ticks, strategy)
+
+    return r
+
+def _greedy(ticks: int, choices: list):
+    "Take the longest choice shorter than what remains until a single note remains"
+
+    r = []
+    while ticks > 0 and ticks not in TICK_DURS:
+        for t in choices:
+            if t < ticks:
+                r.append(TICK_DURS[t])
+                ticks -= t
+                break
         else:
-            for df in DUR_FRACTIONS:
-                if df < f and df.numerator == 1:
-                    _.append(MOD_DURATIONS[df])
-                    _frac_to_dur(f - df, _)
-                    break
+            break
 
-        return _
+    if ticks in TICK_DURS: r.append(TICK_DURS[ticks])
 
-    return tuple(_frac_to_dur(f, []))
+    return r
 
-def add_durs(d1, d2):
-    "Add durations"
+def _fewest_notes(n: int, units: list):
+    "For each count of grid units up to n, the last note of the fewest notes adding to it"
 
-    dr = [dur_to_frac(d1), dur_to_frac(d2)]
+    # count[i] is the fewest notes adding to i units, 0 in last[i] if impossible
+    count = [0] + [n + 1] * n
+    last = [0] * (n + 1)
+    for i in range(1, n + 1):
+        for u in units:
+            if u <= i and count[i - u] + 1 < count[i]:
+                count[i] = count[i - u] + 1
+                last[i] = u
 
-    r = dr[0] + dr[1]
+    return last
 
-    return frac_to_dur(r)
+def _fewest(ticks: int, last: Optional[list] = None):
+    "Fewest notes adding to ticks, longest first"
 
-def sub_durs(d1, d2):
-    "Subtract durations"
+    # plain and dotted notes before triplets so they win ties
+    choices = [t for t in TICK_DURS if TICK_DURS[t][-1] != 't'] + \
+              [t for t in TICK_DURS if TICK_DURS[t][-1] == 't']
 
-    dr = [dur_to_frac(d1), dur_to_frac(d2)]
+    unit = math.gcd(*choices)
+    if ticks <= 0 or ticks % unit: return _greedy(ticks, SIMPLE_TICKS)
 
-    r = dr[0] - dr[1]
+    n = ticks // unit
+    if last is None: last = _fewest_notes(n, [t // unit for t in choices])
 
-    return frac_to_dur(r)
+    r = []
+    while n and last[n]:
+        r.append(last[n] * unit)
+        n -= last[n]
 
-def mul_dur(d, m):
-    "Multiply duration"
+    if n: return _greedy(ticks, SIMPLE_TICKS)
 
-    d = dur_to_frac(d)
+    return [TICK_DURS[t] for t in sorted(r, reverse = True)]
 
-    r = d * m
+def _decompose_uncached(ticks: int, strategy: str, onset: int = 0):
+    "Split ticks into tied durations by strategy, starting onset ticks into a beat"
 
-    return frac_to_dur(r)
+    match strategy:
+        case 'greedy':
+            r = _greedy(ticks, SIMPLE_TICKS)
+        case 'fewest':
+            r = _fewest(ticks)
+        case 'dotted':
+            r = _greedy(ticks, DOTTED_TICKS)
+        case 'beats':
+            # up to the next beat, then whole beats, then the remainder
+            lead = min(-onset % PPQ, ticks) if ticks > 0 else 0
+            r = _greedy(lead, SIMPLE_TICKS)
+            ticks -= lead
 
-def div_dur(d, v):
-    "Divide duration"
+            beats, ticks = divmod(ticks, PPQ) if ticks > 0 else (0, ticks)
+            r += [TICK_DURS[PPQ]] * beats
+            if ticks: r += _greedy(ticks, SIMPLE_TICKS)
+        case _:
+            raise ValueError(f'Invalid tie strategy: {strategy}')
+
+    return tuple(r)
+
+_decompose = functools.lru_cache(maxsize = 4096)(_decompose_uncached)
+
+def _build_tie_table(strategy: str):
+    "Precompute tied durations for the 64th and 64th triplet grids"
+
+    if strategy not in TIE_STRATEGIES: raise ValueError(f'Invalid tie strategy: {strategy}')
+
+    limit = TIE_TABLE_BARS * TICKS_PER_WHOLE
+    grid = set(range(0, limit + 1, DUR_TICKS['64n'])) | set(range(0, limit + 1, DUR_TICKS['64t']))
+
+    # share one pass of the fewest notes search across the whole table
+    last = None
+    if strategy == 'fewest':
+        unit = math.gcd(*TICK_DURS)
+        last = _fewest_notes(limit // unit, [t // unit for t in TICK_DURS])
+
+    table = {}
+    for ticks in sorted(grid):
+        if ticks in TICK_DURS: continue
+
+        if last is None:
+            table[ticks] = _decompose_uncached(ticks, strategy)
+        else:
+            table[ticks] = tuple(_fewest(ticks, last))
+
+    TIE_TABLES[strategy] = table
+
+    return table
+
+def set_tie_table_bars(bars: int):
+    "Set the number of 4/4 bars covered by the precomputed tie tables"
+
+    global TIE_TABLE_BARS
+
+    if bars < 0: raise ValueError(f'Invalid number of bars: {bars}')
+
+    TIE_TABLE_BARS = bars
+
+    TIE_TABLES.clear()
+
+def to_ticks(d: int|str|Duration|Fraction):
+    "Convert any duration representation to ticks"
+
+    match d:
+        case Duration():
+            return d.ticks
+        case Fraction():
+            return frac_to_ticks(d)
+        case int() | str():
+            ticks = TICKS_CACHE.get(d)
+            if ticks is None: ticks = TICKS_CACHE[d] = dur_to_ticks(d)
+
+            return ticks
+
+    return dur_to_ticks(d)
+
+def ticks_to_durations(ticks: int, cls: Optional[type] = None):
+    "Convert ticks to a Duration, or a tuple of tied Durations"
+
+    cls = cls or Duration
+
+    if ticks in TICK_DURS: return cls.from_ticks(ticks)
+
+    return tuple([cls.from_ticks(DUR_TICKS[d]) for d in ticks_to_dur(ticks)])
+
+def durs_to_ticks(durs):
+    "Convert an iterable of durations to an array of ticks"
+
+    return array('q', [to_ticks(d) for d in durs])
 
-    d = dur_to_frac(d)
+_build_tick_tables()
 
-    r = d / v
+def add_durs(d1, d2):
+    "Add durations"
+
+    return ticks_to_dur(dur_to_ticks(d1) + dur_to_ticks(d2))
+
+def sub_durs(d1, d2):
+    "Subtract durations"
+
+    return ticks_to_dur(dur_to_ticks(d1) - dur_to_ticks(d2))
+
+def mul_dur(d, m):
+    "Multiply duration"
+
+    return ticks_to_dur(round(dur_to_ticks(d) * m))
+
+def div_dur(d, v):
+    "Divide duration"
 
-    return frac_to_dur(r)
+    return ticks_to_dur(round(dur_to_ticks(d) / v))
 
 # Duration class
 
 class Duration:
-    "Represents a quantized musical note duration"
+    """
+    Represents a quantized musical note duration.
+
+    The duration is stored as an integer tick count (see PPQ). String and
+    Fraction forms are derived from ticks when needed.
+    """
+
+    __slots__ = ('ticks',)
 
     def __init__(self, dur: Optional[int|str|Duration|Fraction] = None):
-        self.duration = None
+        self.ticks = 0
 
         self.set(dur)
 
+    @classmethod
+    def from_ticks(cls, ticks: int):
+        "Create Duration from a tick count"
+
+        if ticks not in TICK_DURS: raise ValueError(f'Invalid duration ticks: {ticks}')
+
+        d = cls.__new__(cls)
+        d.ticks = ticks
+
+        return d
+
     # Object creation
 
     def set(self, dur: Optional[int|str|Duration|Fraction] = None):
         "Set duration attributes"
 
-        if type(dur) == Fraction: dur = frac_to_dur(dur)
+        ticks = to_ticks(dur) if dur else DUR_TICKS[DEFAULT_DURATION]
+
+        if ticks not in TICK_DURS: raise ValueError(f'Invalid duration: {dur}')
 
-        self.duration = validate_dur(str(dur)) if dur else DEFAULT_DURATION
+        self.ticks = ticks
 
         return self
 
+    def copy(self):
+        "Make a copy of Duration"
+
+        return Duration.from_ticks(self.ticks)
+
+    def freeze(self):
+        "Get interned immutable version of Duration"
+
+        return FrozenDuration.from_ticks(self.ticks)
+
+    @property
+    def duration(self):
+        "Duration string"
+
+        return TICK_DURS[self.ticks]
+
     # Math
 
     def __eq__(self, dur: int|str|Duration|Fraction):
         "Equality"
 
         match dur:
-            case int() | str():
-                return self.duration == validate_dur(dur)
-            case Duration():
-                return self.duration == dur.duration
-            case Fraction():
-                return self.duration == frac_to_dur(dur)
+            case int() | str() | Duration() | Fraction():
+                return self.ticks == to_ticks(dur)
 
         return False
 
     def __add__(self, other: int|str|Duration|Fraction):
         "Addition"
 
-        v1 = self.as_str()
-        other = Duration(other).as_str()
-        r = add_durs(v1, other)
-
-        return tuple([Duration(d) for d in r]) if type(r) == tuple else Duration(r)
+        return ticks_to_durations(self.ticks + to_ticks(other), type(self))
 
     def __iadd__(self, other: int|str|Duration|Fraction):
         "In-place addition"
 
-        other = Duration(other)
-
-        self.set(self + other)
-
-        return self
+        return self.set(self + other)
 
     def __sub__(self, other: int|str|Duration|Fraction):
         "Subtraction"
 
-        v1 = self.as_str()
-        other = Duration(other).as_str()
-        r = sub_durs(v1, other)
-
-        return tuple([Duration(d) for d in r]) if type(r) == tuple else Duration(r)
+        return ticks_to_durations(self.ticks - to_ticks(other), type(self))
 
     def __isub__(self, other: int|str|Duration|Fraction):
         "In-place subtraction"
 
-        other = Duration(other)
-
-        self.set(self - other)
-
-        return self
+        return self.set(self - other)
 
     def __mul__(self, multiplier: int|float):
         "Multiplication"
 
-        v1 = self.as_str()
-        r = mul_dur(v1, multiplier)
-
-        return tuple([Duration(d) for d in r]) if type(r) == tuple else Duration(r)
+        return ticks_to_durations(round(self.ticks * multiplier), type(self))
 
     def __imul__(self, multiplier: int|float):
         "In-place multiplication"
 
-        self.set(mul_dur(self.duration, multiplier))
-
-        return self
+        return self.set(self * multiplier)
 
     def __truediv__(self, divisor: int|float):
         "Division"
 
-        v1 = self.as_str()
-        r = div_dur(v1, divisor)
-
-        return tuple([Duration(d) for d in r]) if type(r) == tuple else Duration(r)
+        return ticks_to_durations(round(self.ticks / divisor), type(self))
 
     def __idiv__(self, divisor: int|float):
         "In-place division"
 
-        self.set(div_dur(self.duration, divisor))
-
-        return self
+        return self.set(self / divisor)
 
     def __round__(self):
         "Rounding strips modifiers"
@@ -251,25 +563,19 @@ class Duration:
     def __floor__(self):
         "Floor operation strips modifiers"
 
-        return Duration(split_dur(self.duration)[0])
+        return type(self).from_ticks(FLOOR_TICKS[self.ticks])
 
     def __ceil__(self):
         "Ceil operation rounds to longer note"
 
-        dur, mods = split_dur(self.duration)
-
-        if mods == 'n': return self.copy()
-
-        if 'd' in mods: return Duration(mul_dur(dur, 2))
-
-        return self.copy()
+        return ticks_to_durations(CEIL_TICKS[self.ticks], type(self))
 
     # Conversion
 
     def to_fraction(self):
         "Return duration as a Fraction instance"
 
-        return dur_to_frac(self.duration)
+        return ticks_to_frac(self.ticks)
 
     # String representation
 
@@ -283,3 +589,223 @@ class Duration:
 
     def __str__(self):
         return self.as_str()
+
+class FrozenDuration(Duration):
+    """
+    Immutable, interned Duration.
+
+    There is one instance per tick value, so creating duplicates costs a dict
+    lookup and FrozenDurations compare by identity. FrozenDurations are
+    hashable and can be used as dict keys. Arithmetic returns FrozenDurations,
+    and in-place operators rebind to a new value instead of modifying.
+
+    FrozenDurations hash by ticks, so a FrozenDuration equal to a string or
+    int (e.g. '4n') does not hash like it: dict and set keys should all be
+    FrozenDurations.
+    """
+
+    __slots__ = ('name', 'fraction')
+
+    def __new__(cls, dur: Optional[int|str|Duration|Fraction] = None):
+        ticks = to_ticks(dur) if dur else DUR_TICKS[DEFAULT_DURATION]
+
+        return cls.from_ticks(ticks)
+
+    def __init__(self, dur: Optional[int|str|Duration|Fraction] = None):
+        pass
+
+    @classmethod
+    def from_ticks(cls, ticks: int):
+        "Get interned FrozenDuration for a tick count"
+
+        d = FROZEN_DURATIONS.get(ticks)
+
+        if d is None:
+            if ticks not in TICK_DURS: raise ValueError(f'Invalid duration ticks: {ticks}')
+
+            d = object.__new__(cls)
+            object.__setattr__(d, 'ticks', ticks)
+            object.__setattr__(d, 'name', TICK_DURS[ticks])
+            object.__setattr__(d, 'fraction', ticks_to_frac(ticks))
+
+            FROZEN_DURATIONS[ticks] = d
+
+        return d
+
+    def set(self, *args, **kwargs):
+        raise TypeError('FrozenDuration is immutable')
+
+    def __setattr__(self, name, value):
+        raise TypeError('FrozenDuration is immutable')
+
+    def copy(self):
+        "Interned values are shared rather than copied"
+
+        return self
+
+    def freeze(self):
+        return self
+
+    def thaw(self):
+        "Get mutable Duration with the same value"
+
+        return Duration.from_ticks(self.ticks)
+
+    @property
+    def duration(self):
+        "Duration string"
+
+        return self.name
+
+    def __eq__(self, dur: int|str|Duration|Fraction):
+        "Equality"
+
+        if dur is self: return True
+        if isinstance(dur, Duration): return self.ticks == dur.ticks
+
+        # other keys in the same dict or set may not be valid durations
+        try:
+            return Duration.__eq__(self, dur)
+        except (ValueError, TypeError):
+            return False
+
+    def __hash__(self):
+        return hash(self.ticks)
+
+    def __iadd__(self, other: int|str|Duration|Fraction):
+        return self + other
+
+    def __isub__(self, other: int|str|Duration|Fraction):
+        return self - other
+
+    def __imul__(self, multiplier: int|float):
+        return self * multiplier
+
+    def __idiv__(self, divisor: int|float):
+        return self / divisor
+
+    def to_fraction(self):
+        "Return duration as a Fraction instance"
+
+        return self.fraction
+
+    def __reduce__(self):
+        return (FrozenDuration.from_ticks, (self.ticks,))
+
+# Duration array class
+
+class DurationArray:
+    """
+    A compact list of durations stored as an array of integer ticks.
+
+    Can pass any iterable of durations (strings, ints, Durations, Fractions) to
+    the constructor. Use from_ticks() to wrap existing tick values.
+    """
+
+    def __init__(self, durs: Optional[list] = None):
+        self.ticks = durs_to_ticks(durs) if durs else array('q')
+
+    @classmethod
+    def from_ticks(cls, ticks):
+        "Create DurationArray from tick values"
+
+        da = cls()
+        da.ticks = array('q', ticks)
+
+        return da
+
+    def copy(self):
+        "Make a copy of DurationArray"
+
+        return DurationArray.from_ticks(self.ticks)
+
+    # Manipulation
+
+    def append(self, dur: int|str|Duration|Fraction):
+        "Append a duration"
+
+        self.ticks.append(to_ticks(dur))
+
+        return self
+
+    def extend(self, durs):
+        "Append durations"
+
+        self.ticks.extend(durs.ticks if isinstance(durs, DurationArray) else durs_to_ticks(durs))
+
+        return self
+
+    # Timeline
+
+    def onsets(self):
+        "Start of each duration in ticks, counting from 0"
+
+        r = array('q', its.accumulate(self.ticks, initial = 0))
+        r.pop()
+
+        return r
+
+    def total_ticks(self):
+        "Length of all durations in ticks"
+
+        return sum(self.ticks)
+
+    def total(self):
+        "Length of all durations as a Duration or tuple of tied Durations"
+
+        return ticks_to_durations(self.total_ticks())
+
+    def positions(self, beats: int = 4, beat: int|str|Duration = '4n'):
+        """
+        Position of each onset as a (bar, beat, ticks) tuple, where bar and beat
+        count from 1 and ticks is the offset into the beat.
+
+        Parameters
+        ----------
+        beats
+            Beats per bar
+        beat
+            Beat duration
+        """
+
+        beat = to_ticks(beat)
+        bar = beat * beats
+
+        r = []
+        for onset in self.onsets():
+            b, t = divmod(onset, bar)
+            q, t = divmod(t, beat)
+            r.append((b + 1, q + 1, t))
+
+        return r
+
+    # Querying
+
+    def as_list(self):
+        "Get durations as a list of Durations (or tuples for tied values)"
+
+        return [ticks_to_durations(t) for t in self.ticks]
+
+    def __len__(self):
+        return len(self.ticks)
+
+    def __getitem__(self, ix: int|slice):
+        if isinstance(ix, slice): return DurationArray.from_ticks(self.ticks[ix])
+
+        return ticks_to_durations(self.ticks[ix])
+
+    def __iter__(self):
+        return (ticks_to_durations(t) for t in self.ticks)
+
+    def __eq__(self, other: DurationArray|list):
+        if isinstance(other, DurationArray): return self.ticks == other.ticks
+
+        return self.ticks == durs_to_ticks(other)
+
+    # String representation
+
+    def __repr__(self):
+        return f'{self.__class__}({[ticks_to_dur(t) for t in self.ticks]})'
+
+    def __str__(self):
+        return f'{len(self)}:{self.total_ticks()} {[ticks_to_dur(t) for t in self.ticks]}'
@@ -0,0 +1,96 @@
+""" history.py
+--------------
+Undo support for sequences that only loads historian when it is first used.
+
+Undo history can be turned off with set_history(False), or by setting the
+MUSICIANS_HISTORY environment variable to 0 before starting Python. Sequences
+created while history is off keep no undo entries and never import historian,
+which saves both the import and the list copies kept for undo.
+"""
+
+from __future__ import annotations
+
+import os
+
+# Defaults
+
+HISTORY = os.environ.get('MUSICIANS_HISTORY', '1').lower() not in ('0', 'false', 'no', 'off')
+
+# Helper functions
+
+def set_history(enabled: bool = True):
+    "Turn undo history on or off for sequences that have not used it yet"
+
+    global HISTORY
+
+    HISTORY = bool(enabled)
+
+def _mixin():
+    "Import historian on first use"
+
+    from historian import HistorianMixin
+
+    return HistorianMixin
+
+def _new_undomgr():
+    "Create an undo manager, or a NullHistorian if history is off"
+
+    if not HISTORY: return NullHistorian()
+
+    holder = object.__new__(_mixin())
+    _mixin().__init__(holder)
+
+    return holder._undomgr
+
+# Classes
+
+class NullHistorian:
+    "Undo manager that keeps nothing"
+
+    def register(self, *args, **kwargs):
+        pass
+
+    def undo(self, n: int = 1):
+        pass
+
+    def redo(self, n: int = 1):
+        pass
+
+    def size(self, *args):
+        return 0
+
+class LazyHistorianMixin:
+    """
+    Stand-in for historian.HistorianMixin that creates the undo manager on
+    first use.
+    """
+
+    def __init__(self):
+        pass
+
+    @property
+    def _undomgr(self):
+        try:
+            return self._history
+        except AttributeError:
+            self._history = _new_undomgr()
+
+            return self._history
+
+    @_undomgr.setter
+    def _undomgr(self, mgr):
+        self._history = mgr
+
+    def undo(self, n: int = 1):
+        "Undo n operations"
+
+        if not isinstance(self._undomgr, NullHistorian): _mixin().undo(self, n)
+
+        return self
+
+    def redo(self, n: int = 1):
+        "Redo n operations"
+
+        if not isinstance(self._undomgr, NullHistorian): _mixin().redo(self, n)
+
+        return self
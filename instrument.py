@@ -0,0 +1,204 @@
+""" instrument.py
+-----------------
+Opt-in per-operation timing and size statistics for Sequence classes.
+
+Nothing is measured until enable() is called. Enabling replaces the
+instrumented methods on the class with timing wrappers and disabling puts the
+originals back, so there is no cost at all while disabled.
+
+Only the outermost instrumented call is recorded, so e.g. the set() done
+inside stretch_to() counts towards stretch_to() and not set().
+"""
+
+from __future__ import annotations
+from typing import Optional
+
+import functools
+import struct
+import threading
+import time
+
+from collections import deque
+
+from sequence import Sequence
+
+# Constants
+
+# methods instrumented by default
+METHODS = (
+    'set', 'insert', 'remove', 'append', 'prepend',
+    'replace', 'replace_value', 'replace_step', 'remove_step',
+    'shift', 'stretch_to', 'expand_to', 'reverse', 'loop',
+    'undo', 'redo',
+)
+
+# estimated list copies per operation as (copies of input, copies of output),
+# counting undo snapshots (self.seq[:]) and newly built lists
+COPIES = {
+    'set': (0, 1),
+    'insert': (0, 2),
+    'remove': (0, 2),
+    'append': (0, 2),
+    'prepend': (0, 2),
+    'replace': (1, 2),
+    'replace_value': (1, 0),
+    'replace_step': (0, 0),
+    'remove_step': (1, 1),
+    'shift': (0, 1),
+    'stretch_to': (1, 2),
+    'expand_to': (1, 2),
+    'reverse': (0, 2),
+    'loop': (1, 2),
+}
+
+# bytes per copied list item (one pointer)
+ITEM_BYTES = struct.calcsize('P')
+
+# latency samples kept per operation for percentiles
+MAX_SAMPLES = 10000
+
+# State
+
+_originals = {}
+_stats = {}
+_local = threading.local()
+
+# Statistics
+
+class OpStats:
+    "Running statistics for one operation"
+
+    __slots__ = ('calls', 'total', 'samples', 'steps_in', 'steps_out', 'bytes')
+
+    def __init__(self):
+        self.samples = deque(maxlen = MAX_SAMPLES)
+        self.reset()
+
+    def reset(self):
+        "Clear statistics"
+
+        self.calls = 0
+        self.total = 0.0
+        self.samples.clear()
+        self.steps_in = 0
+        self.steps_out = 0
+        self.bytes = 0
+
+    def record(self, elapsed: float, steps_in: int, steps_out: int, copies: tuple):
+        "Record a call"
+
+        self.calls += 1
+        self.total += elapsed
+        self.samples.append(elapsed)
+        self.steps_in += steps_in
+        self.steps_out += steps_out
+        self.bytes += (copies[0] * steps_in + copies[1] * steps_out) * ITEM_BYTES
+
+    def percentile(self, p: float):
+        "Latency percentile (0-100) of recent calls"
+
+        if not self.samples: return 0.0
+
+        s = sorted(self.samples)
+
+        return s[min(int(len(s) * p / 100), len(s) - 1)]
+
+    def as_dict(self):
+        "Statistics as a dict"
+
+        calls = self.calls or 1
+
+        return {
+            'calls': self.calls,
+            'total': self.total,
+            'mean': self.total / calls,
+            'p50': self.percentile(50),
+            'p90': self.percentile(90),
+            'p99': self.percentile(99),
+            'max': max(self.samples, default = 0.0),
+            'mean_steps_in': self.steps_in / calls,
+            'mean_steps_out': self.steps_out / calls,
+            'bytes_copied': self.bytes,
+        }
+
+# Instrumentation
+
+def _wrap(func, stats: OpStats, copies: tuple):
+    "Wrap method to record outermost calls"
+
+    perf = time.perf_counter
+
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        if getattr(_local, 'active', False): return func(self, *args, **kwargs)
+
+        _local.active = True
+        steps_in = self.steps
+        start = perf()
+
+        try:
+            return func(self, *args, **kwargs)
+        finally:
+            elapsed = perf() - start
+            _local.active = False
+            stats.record(elapsed, steps_in, self.steps, copies)
+
+    return wrapper
+
+def enable(*classes: type, methods: tuple = METHODS):
+    """
+    Start recording operations on classes (default Sequence).
+
+    Subclasses that override a method need to be enabled separately to record
+    their version.
+    """
+
+    for cls in classes or (Sequence,):
+        for name in methods:
+            if (cls, name) in _originals or not hasattr(cls, name): continue
+
+            _originals[(cls, name)] = cls.__dict__.get(name)
+
+            stats = _stats.setdefault(f'{cls.__name__}.{name}', OpStats())
+            setattr(cls, name, _wrap(getattr(cls, name), stats, COPIES.get(name, (0, 0))))
+
+def disable():
+    "Stop recording and restore original methods. Statistics are kept"
+
+    for (cls, name), func in _originals.items():
+        if func is None:
+            delattr(cls, name)
+        else:
+            setattr(cls, name, func)
+
+    _originals.clear()
+
+def is_enabled(cls: Optional[type] = None):
+    "Whether any (or cls) methods are instrumented"
+
+    return any(c is cls or cls is None for c, _ in _originals)
+
+def reset():
+    "Clear all statistics"
+
+    for stats in _stats.values(): stats.reset()
+
+def snapshot():
+    "Current statistics as {'Class.method': dict} for operations that have been called"
+
+    return {name: stats.as_dict() for name, stats in sorted(_stats.items()) if stats.calls}
+
+def export_text(data: Optional[dict] = None):
+    "Statistics as a text table, slowest total first"
+
+    data = snapshot() if data is None else data
+
+    lines = [f'{"operation":24} {"calls":>8} {"total ms":>10} {"mean us":>10} {"p50 us":>10} '
+             f'{"p90 us":>10} {"p99 us":>10} {"steps in":>10} {"steps out":>10} {"bytes":>12}']
+
+    for name, s in sorted(data.items(), key = lambda i: -i[1]['total']):
+        lines.append(f'{name:24} {s["calls"]:>8} {s["total"] * 1e3:>10.3f} {s["mean"] * 1e6:>10.2f} '
+                     f'{s["p50"] * 1e6:>10.2f} {s["p90"] * 1e6:>10.2f} {s["p99"] * 1e6:>10.2f} '
+                     f'{s["mean_steps_in"]:>10.1f} {s["mean_steps_out"]:>10.1f} {s["bytes_copied"]:>12}')
+
+    return '\n'.join(lines)
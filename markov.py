@@ -0,0 +1,312 @@
+""" markov.py
+-------------
+N-th order Markov models of sequence values, trained on lanes of sequences
+and sampled to make new ones.
+
+States are the distinct values seen in training, numbered in order of first
+appearance. A context of n states is packed into one integer key, STATE_BITS
+bits per state, and a transition is its context key with the next state
+packed on the end, so training is counting integers.
+"""
+
+from __future__ import annotations
+from typing import Optional
+
+import bisect
+import itertools as its
+import random
+import struct
+import zlib
+
+from array import array
+from collections import Counter
+
+# Sequence classes
+
+from sequence_base import SequenceBase
+
+# Seeds
+
+from sequence_generate import derive_seed, new_seed
+
+# Constants
+
+# bits per state in packed keys
+STATE_BITS = 16
+STATE_MASK = (1 << STATE_BITS) - 1
+MAX_STATES = 1 << STATE_BITS
+
+# binary format: magic, version, order, state count, start count, transition count
+MAGIC = b'MRKV'
+VERSION = 1
+HEADER = struct.Struct('<4sBBIII')
+
+# Helper functions
+
+def _lane(lane):
+    "Get list of values from a Sequence or iterable"
+
+    return lane.seq if isinstance(lane, SequenceBase) else list(lane)
+
+def pack(ids):
+    "Pack state ids into an integer key"
+
+    key = 0
+    for i in ids: key = (key << STATE_BITS) | i
+
+    return key
+
+def unpack(key: int, n: int):
+    "Unpack integer key into n state ids"
+
+    return [(key >> (STATE_BITS * (n - 1 - i))) & STATE_MASK for i in range(n)]
+
+def ngram_keys(ids: list, n: int):
+    "Integer keys of all n-grams in a list of state ids"
+
+    keys = ids[:len(ids) - n + 1]
+    for j in range(1, n):
+        keys = [(k << STATE_BITS) | i for k, i in zip(keys, ids[j:])]
+
+    return keys
+
+# Model class
+
+class MarkovModel:
+    """
+    N-th order Markov model.
+
+    Public Attributes
+    -----------------
+    order: int
+        number of previous values each value depends on
+    states: list
+        distinct values, indexed by state id
+    counts: Counter
+        transition counts by packed (context + next state) key
+    starts: Counter
+        counts of opening contexts by packed key
+    """
+
+    def __init__(self, order: int = 1):
+        if order < 1: raise ValueError(f'Invalid order: {order}')
+
+        self.order = order
+        self.states = []
+        self.counts = Counter()
+        self.starts = Counter()
+
+        self._ids = {}
+        self._tables = None
+
+    # Training
+
+    def _encode(self, values: list):
+        "Get state ids for values, adding new states"
+
+        ids = self._ids
+        for v in values:
+            if v not in ids:
+                if len(self.states) >= MAX_STATES: raise ValueError(f'Too many states (max {MAX_STATES})')
+
+                ids[v] = len(self.states)
+                self.states.append(v)
+
+        return [ids[v] for v in values]
+
+    def train(self, lanes):
+        """
+        Count transitions in lanes (Sequences or lists of values). Can be
+        called repeatedly to add more material.
+        """
+
+        n = self.order
+
+        for lane in lanes:
+            ids = self._encode(_lane(lane))
+            if len(ids) <= n: continue
+
+            self.starts[pack(ids[:n])] += 1
+            self.counts.update(ngram_keys(ids, n + 1))
+
+        self._tables = None
+
+        return self
+
+    # Transition tables
+
+    def _build(self):
+        """
+        Build sparse transition tables: context key -> (next state ids,
+        cumulative counts), and the same for opening contexts
+        """
+
+        tables = {}
+        for key, count in sorted(self.counts.items()):
+            context = key >> STATE_BITS
+            nexts, cum = tables.get(context) or tables.setdefault(context, (array('H'), array('q')))
+            nexts.append(key & STATE_MASK)
+            cum.append((cum[-1] if cum else 0) + count)
+
+        starts = sorted(self.starts)
+        start_cum = array('q', its.accumulate(self.starts[k] for k in starts))
+
+        self._tables = (tables, starts, start_cum)
+
+        return self._tables
+
+    @property
+    def tables(self):
+        "Sparse transition tables, built when first needed after training"
+
+        return self._tables or self._build()
+
+    def probabilities(self, context: list):
+        "Get {next value: probability} after context values"
+
+        # a short context would pack like a full one starting with state 0
+        if len(context) < self.order or any(v not in self._ids for v in context): return {}
+
+        entry = self.tables[0].get(pack(self._ids[v] for v in context[-self.order:]))
+        if not entry: return {}
+
+        nexts, cum = entry
+        total = cum[-1]
+        counts = [c - p for c, p in zip(cum, its.chain((0,), cum))]
+
+        return {self.states[i]: c / total for i, c in zip(nexts, counts)}
+
+    # Sampling
+
+    def sample(self, length: int, seed: Optional[int] = None, start: Optional[list] = None):
+        """
+        Sample a list of length values.
+
+        Starts from start values (at least order values), or an opening
+        context picked like those seen in training. Contexts never seen in
+        training restart from a random opening context.
+        """
+
+        tables, starts, start_cum = self.tables
+        if not starts: raise ValueError('Model is not trained')
+
+        r = random.Random(new_seed() if seed is None else seed)
+        n = self.order
+
+        # uniform draws for the whole sample at once
+        draws = [r.random() for _ in range(length)]
+
+        def opening(u):
+            return unpack(starts[bisect.bisect_right(start_cum, u * start_cum[-1])], n)
+
+        if start is None:
+            ids = opening(r.random())
+        else:
+            ids = [self._ids[v] for v in start]
+            if len(ids) < n: raise ValueError(f'Need at least {n} start values')
+
+        mask = (1 << (STATE_BITS * n)) - 1
+        context = pack(ids[-n:])
+        get = tables.get
+        right = bisect.bisect_right
+
+        for u in draws[:max(length - len(ids), 0)]:
+            entry = get(context)
+
+            if entry is None:
+                nxt = opening(u)
+                ids += nxt
+                context = pack(nxt)
+                continue
+
+            nexts, cum = entry
+            s = nexts[right(cum, u * cum[-1])]
+            ids.append(s)
+            context = ((context << STATE_BITS) | s) & mask
+
+        states = self.states
+
+        return [states[i] for i in ids[:length]]
+
+    def sample_many(self, n: int, length: int, seed: Optional[int] = None):
+        "Sample n lists, each from its own seed derived from seed and its row"
+
+        if seed is None: seed = new_seed()
+
+        return [self.sample(length, derive_seed(seed, i)) for i in range(n)]
+
+    # Storage
+
+    def to_bytes(self):
+        """
+        Compact binary form: header, then zlib compressed state values
+        (int64), opening contexts and transitions as rows of state ids
+        (uint16) with counts (uint32 or uint64).
+        """
+
+        if not all(type(v) == int for v in self.states): raise TypeError('Only int states can be saved')
+
+        n = self.order
+        starts, counts = sorted(self.starts.items()), sorted(self.counts.items())
+
+        wide = max(its.chain(self.starts.values(), self.counts.values()), default = 0) >= 1 << 32
+        ctype = 'Q' if wide else 'I'
+
+        body = b''.join([
+            array('q', self.states).tobytes(),
+            ctype.encode(),
+            array('H', its.chain.from_iterable(unpack(k, n) for k, _ in starts)).tobytes(),
+            array(ctype, [c for _, c in starts]).tobytes(),
+            array('H', its.chain.from_iterable(unpack(k, n + 1) for k, _ in counts)).tobytes(),
+            array(ctype, [c for _, c in counts]).tobytes(),
+        ])
+
+        return HEADER.pack(MAGIC, VERSION, n, len(self.states), len(starts), len(counts)) + zlib.compress(body)
+
+    @classmethod
+    def from_bytes(cls, data: bytes):
+        "Create model from to_bytes() data"
+
+        magic, version, order, nstates, nstarts, ncounts = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION: raise ValueError('Not a Markov model file')
+
+        body = memoryview(zlib.decompress(data[HEADER.size:]))
+
+        def take(typecode: str, count: int):
+            nonlocal body
+            a = array(typecode)
+            size = a.itemsize * count
+            a.frombytes(body[:size])
+            body = body[size:]
+            return a
+
+        m = cls(order)
+        m.states = take('q', nstates).tolist()
+        m._ids = {v: i for i, v in enumerate(m.states)}
+
+        ctype = bytes(body[:1]).decode()
+        body = body[1:]
+
+        ids = take('H', nstarts * order)
+        m.starts = Counter(dict(zip(ngram_keys(ids.tolist(), order)[::order], take(ctype, nstarts))))
+
+        ids = take('H', ncounts * (order + 1))
+        m.counts = Counter(dict(zip(ngram_keys(ids.tolist(), order + 1)[::order + 1], take(ctype, ncounts))))
+
+        return m
+
+    def save(self, path: str):
+        "Save model to file"
+
+        with open(path, 'wb') as f: f.write(self.to_bytes())
+
+        return self
+
+    @classmethod
+    def load(cls, path: str):
+        "Load model saved with save()"
+
+        with open(path, 'rb') as f: return cls.from_bytes(f.read())
+
+    def __repr__(self):
+        return f'{self.__class__}(order={self.order}, states={len(self.states)}, transitions={len(self.counts)})'
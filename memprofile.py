@@ -0,0 +1,259 @@
+""" memprofile.py
+-----------------
+tracemalloc based memory profiling of sequence, pitch, duration and note
+operations.
+
+    with profile_memory() as prof:
+        ...
+
+    print(prof.report())
+
+While the block runs, methods of the profiled classes are wrapped to record
+net and peak allocations of each outermost call, and undo registrations are
+counted with the size of what they hold on to. The originals are restored on
+exit.
+"""
+
+from __future__ import annotations
+from typing import Optional
+
+import functools
+import sys
+import threading
+import tracemalloc
+
+from contextlib import contextmanager
+
+from sequence import Sequence
+from sequence_group import SequenceGroup
+from sequence_defaults import DEFAULT_SEQUENCE_OPTS
+from pitch import Pitch
+from duration import Duration
+from note import Note
+from history import NullHistorian
+
+# Constants
+
+# methods profiled per class
+METHODS = {
+    Sequence: ('__init__', 'set', 'copy', 'insert', 'remove', 'append', 'prepend',
+               'replace', 'replace_value', 'replace_step', 'remove_step',
+               'shift', 'stretch_to', 'expand_to', 'reverse', 'loop', 'undo', 'redo'),
+    SequenceGroup: ('__init__', 'add'),
+    Pitch: ('__init__', 'set', 'copy', 'transpose_semi', 'transpose_octave'),
+    Duration: ('__init__', 'set', 'copy', '__add__', '__sub__', '__mul__', '__truediv__'),
+    Note: ('__init__', 'set', 'copy'),
+}
+
+# steps in the sequences used to estimate bytes per step
+ESTIMATE_STEPS = 4096
+
+_local = threading.local()
+
+# Helper functions
+
+def _config(seq):
+    "Sequence class name and options that differ from the defaults"
+
+    opts = getattr(seq, '_opts', None) or {}
+    changed = tuple(sorted((k, v) for k, v in opts.items() if DEFAULT_SEQUENCE_OPTS.get(k) != v))
+
+    return (type(seq).__name__, changed)
+
+def _traced():
+    "Currently traced bytes"
+
+    return tracemalloc.get_traced_memory()[0]
+
+def bytes_per_step(cls: type = Sequence, options: Optional[dict] = None, steps: int = ESTIMATE_STEPS):
+    """
+    Estimate memory held per step by a sequence class and options, as
+    (bytes per step, undo entry bytes per step). The undo entry is the extra
+    memory held after one full-list edit. Must be called while tracemalloc is
+    tracing.
+    """
+
+    kwargs = {} if options is None else {'options': options}
+
+    before = _traced()
+    seq = cls([(i % 7) + 1 if i % 4 == 0 else 0 for i in range(steps)], **kwargs)
+    held = _traced() - before
+
+    before = _traced()
+    seq.replace_value(1, 1)
+    undo = _traced() - before
+
+    del seq
+
+    return held / steps, undo / steps
+
+# Profile class
+
+class MemoryProfile:
+    "Memory statistics collected by profile_memory()"
+
+    def __init__(self):
+        # 'Class.method' -> [calls, net bytes, largest peak bytes]
+        self.ops = {}
+
+        # undo registrations as [entries, bytes held]
+        self.history = [0, 0]
+
+        # sequence configuration -> (bytes per step, undo bytes per step)
+        self.bytes_per_step = {}
+
+        self.peak = 0
+        self.net = 0
+
+        self._configs = set()
+        self._originals = []
+        self._start = 0
+
+    # Wrapping
+
+    def _wrap(self, name: str, func):
+        "Wrap method to record allocations of outermost calls"
+
+        ops = self.ops
+        configs = self._configs
+
+        @functools.wraps(func)
+        def wrapper(obj, *args, **kwargs):
+            if getattr(_local, 'active', False): return func(obj, *args, **kwargs)
+
+            _local.active = True
+            before, peak = tracemalloc.get_traced_memory()
+
+            # keep the peak since the last call before resetting it for this one
+            self.peak = max(self.peak, peak - self._start)
+            tracemalloc.reset_peak()
+
+            try:
+                return func(obj, *args, **kwargs)
+            finally:
+                after, peak = tracemalloc.get_traced_memory()
+                _local.active = False
+
+                key = f'{type(obj).__name__}.{name}'
+                op = ops.setdefault(key, [0, 0, 0])
+                op[0] += 1
+                op[1] += after - before
+                op[2] = max(op[2], peak - before)
+
+                self.peak = max(self.peak, peak - self._start)
+
+                if name == '__init__' and isinstance(obj, Sequence): configs.add(_config(obj))
+
+        return wrapper
+
+    def _wrap_register(self, func):
+        "Wrap undo manager register to count entries and what they hold"
+
+        history = self.history
+
+        @functools.wraps(func)
+        def wrapper(mgr, *args, **kwargs):
+            history[0] += 1
+            history[1] += sum(sys.getsizeof(a) for a in args)
+
+            return func(mgr, *args, **kwargs)
+
+        return wrapper
+
+    def _patch(self, cls: type, name: str, wrapper):
+        self._originals.append((cls, name, cls.__dict__.get(name)))
+        setattr(cls, name, wrapper)
+
+    def start(self):
+        "Start profiling"
+
+        self._start = _traced()
+        tracemalloc.reset_peak()
+
+        for cls, names in METHODS.items():
+            for name in names:
+                if hasattr(cls, name): self._patch(cls, name, self._wrap(name, getattr(cls, name)))
+
+        # undo manager class is only known from an instance; with history off
+        # there is nothing to count
+        mgr = type(Sequence()._undomgr)
+        if hasattr(mgr, 'register') and not issubclass(mgr, NullHistorian):
+            self._patch(mgr, 'register', self._wrap_register(mgr.register))
+
+        # construction above is not part of the profile
+        for op in self.ops.values(): op[:] = [0, 0, 0]
+        self.history[:] = [0, 0]
+        self._configs.clear()
+
+    def stop(self):
+        "Stop profiling and estimate bytes per step for each sequence configuration seen"
+
+        after, peak = tracemalloc.get_traced_memory()
+        self.net = after - self._start
+        self.peak = max(self.peak, peak - self._start)
+
+        for cls, name, func in reversed(self._originals):
+            if func is None:
+                delattr(cls, name)
+            else:
+                setattr(cls, name, func)
+
+        self._originals.clear()
+
+        classes = {c.__name__: c for c in _subclasses(Sequence)}
+        for config in sorted(self._configs):
+            name, options = config
+            if name in classes:
+                self.bytes_per_step[config] = bytes_per_step(classes[name], dict(options) or None)
+
+    # Reporting
+
+    def report(self):
+        "Text report of operations by largest peak, then history and bytes per step"
+
+        lines = [f'net {self.net} bytes, peak {self.peak} bytes', '',
+                 f'{"operation":28} {"calls":>8} {"net bytes":>12} {"peak bytes":>12}']
+
+        for name, (calls, net, peak) in sorted(self.ops.items(), key = lambda i: (-i[1][2], -i[1][1])):
+            if calls: lines.append(f'{name:28} {calls:>8} {net:>12} {peak:>12}')
+
+        lines += ['', f'undo entries: {self.history[0]}, holding {self.history[1]} bytes']
+
+        if self.bytes_per_step:
+            lines += ['', f'{"sequence configuration":48} {"bytes/step":>12} {"undo bytes/step":>16}']
+            for (name, options), (held, undo) in self.bytes_per_step.items():
+                config = name + (' ' + ', '.join(f'{k}={v}' for k, v in options) if options else '')
+                lines.append(f'{config:48} {held:>12.1f} {undo:>16.1f}')
+
+        return '\n'.join(lines)
+
+    def __str__(self):
+        return self.report()
+
+def _subclasses(cls: type):
+    "Class and all its subclasses"
+
+    r = [cls]
+    for c in cls.__subclasses__(): r += _subclasses(c)
+
+    return r
+
+@contextmanager
+def profile_memory(frames: int = 1):
+    """
+    Profile memory of operations in the block. Yields a MemoryProfile.
+
+    Starts tracemalloc if it is not already tracing (and stops it after).
+    """
+
+    started = not tracemalloc.is_tracing()
+    if started: tracemalloc.start(frames)
+
+    prof = MemoryProfile()
+    prof.start()
+
+    try:
+        yield prof
+    finally:
+        prof.stop()
+        if started: tracemalloc.stop()
@@ -0,0 +1,106 @@
+""" musicians
+-------------
+Package interface to the musicians modules.
+
+Nothing is imported up front: submodules and the main classes are loaded the
+first time they are accessed, so e.g. a worker that only uses Pitch never
+imports sequence, opts or historian.
+
+    import musicians
+
+    musicians.Pitch('C4')           # imports pitch only
+    musicians.sequence.Sequence()   # imports sequence
+"""
+
+import importlib
+import importlib.machinery
+import os
+import sys
+
+# the modules live next to this package and import each other as top level
+# modules
+_ROOT = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+
+class _ModuleFinder:
+    """
+    Finds the modules next to this package by file location. It runs after
+    every other finder and sys.path is left alone, so installed modules with
+    the same names are never shadowed.
+    """
+
+    def find_spec(self, name: str, path = None, target = None):
+        if path is not None: return None
+
+        spec = importlib.machinery.PathFinder.find_spec(name, [_ROOT])
+
+        # modules and packages only, not plain directories
+        return spec if spec is not None and spec.origin else None
+
+if not any(isinstance(f, _ModuleFinder) for f in sys.meta_path): sys.meta_path.append(_ModuleFinder())
+
+# Lazy attributes
+
+SUBMODULES = (
+    'batch', 'duration', 'helpers', 'history', 'instrument', 'markov', 'memprofile', 'necklace',
+    'note', 'pattern_index', 'pitch', 'render', 'render_trigger', 'sequence', 'sequence_automation',
+    'sequence_base', 'sequence_gate', 'sequence_generate', 'sequence_group', 'sequence_polymeter',
+    'sequence_profile', 'sequence_sparse', 'sequence_versioned', 'tempo',
+)
+
+# attribute -> module it is loaded from
+ATTRIBUTES = {
+    'Sequence': 'sequence',
+    'SequenceGroup': 'sequence_group',
+    'Polymeter': 'sequence_polymeter',
+    'SparseSequence': 'sequence_sparse',
+    'GateSequence': 'sequence_gate',
+    'AutomationLane': 'sequence_automation',
+    'OptionProfile': 'sequence_profile',
+    'VersionedSequence': 'sequence_versioned',
+    'Pitch': 'pitch',
+    'Duration': 'duration',
+    'FrozenDuration': 'duration',
+    'DurationArray': 'duration',
+    'Note': 'note',
+    'Rest': 'note',
+    'NoteArray': 'note',
+    'TempoMap': 'tempo',
+    'Timeline': 'render',
+    'Track': 'render',
+    'Batch': 'sequence_generate',
+    'MarkovModel': 'markov',
+    'PatternIndex': 'pattern_index',
+    'profile_memory': 'memprofile',
+    'set_history': 'history',
+    'bracelets': 'necklace',
+    'necklaces': 'necklace',
+}
+
+__all__ = list(SUBMODULES) + list(ATTRIBUTES)
+
+def _import(name: str):
+    "Import one of the modules, making sure it is not a same-named module from elsewhere"
+
+    module = importlib.import_module(name)
+    path = getattr(module, '__file__', None)
+
+    if path is None or os.path.dirname(os.path.realpath(path)) != _ROOT:
+        raise ImportError(f'{name!r} was imported from {path}, not {_ROOT}', name = name, path = path)
+
+    return module
+
+def __getattr__(name: str):
+    if name in SUBMODULES:
+        value = _import(name)
+    elif name in ATTRIBUTES:
+        value = getattr(_import(ATTRIBUTES[name]), name)
+    else:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+    # cache so later lookups skip __getattr__
+    globals()[name] = value
+
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
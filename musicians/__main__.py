@@ -0,0 +1,10 @@
+""" musicians.__main__
+----------------------
+Batch transform command line, see batch.py
+"""
+
+import sys
+
+import musicians
+
+sys.exit(musicians.batch.main())
@@ -0,0 +1,195 @@
+""" necklace.py
+---------------
+Enumeration of binary rhythms up to rotation (necklaces) and up to rotation
+and reflection (bracelets).
+
+Patterns are generated directly in canonical form with the
+Fredricksen-Kessler-Maiorana (FKM) algorithm, so no pattern is ever built and
+rotated only to be thrown away. The canonical form is the least rotation, as
+in pattern_index.canonical(): for any pattern with hits that means it starts
+with its longest run of rests and ends with a hit.
+
+Packed patterns follow sequence_gate: step n (counting from 1) is bit n - 1.
+"""
+
+from __future__ import annotations
+from typing import Optional
+
+import collections
+import itertools as its
+
+from concurrent.futures import ProcessPoolExecutor
+
+# Canonical forms
+
+from pattern_index import least_rotation
+
+# Defaults
+
+# steps fixed in the parent before the search is split across workers
+DEFAULT_PREFIX = 10
+
+# prefixes per worker task
+DEFAULT_CHUNK = 64
+
+# Helper functions
+
+def _reflection_ok(a: list, n: int):
+    "Whether necklace a[1:] is no greater than the least rotation of its reflection"
+
+    r = a[n:0:-1]
+    k = least_rotation(r)
+
+    return r[k:] + r[:k] >= a[1:]
+
+def _search(n: int, hits: Optional[int], max_gap: Optional[int], bracelets: bool, packed: bool,
+            start: tuple = ((), 1), depth: Optional[int] = None):
+    """
+    FKM search below a (prefix, period) start. Yields patterns, or the
+    (prefix, period) states at depth if depth is given.
+
+    Uses an explicit stack, so each pattern costs constant amortized work
+    rather than a chain of nested generators. Subtrees are pruned as soon as
+    the hit count can't be met or a run of rests is longer than max_gap.
+    """
+
+    prefix, p = start
+    t = len(prefix)
+
+    a = [0] * (n + 1)
+    a[1:t + 1] = prefix
+
+    ones = sum(prefix)
+    run = t - 1 - max((i for i, v in enumerate(prefix) if v), default = -1)
+    bits = sum(1 << i for i, v in enumerate(prefix) if v)
+
+    stop = n if depth is None else depth
+    k = n + 1 if hits is None else hits
+    gap = n if max_gap is None else max_gap
+
+    def leaf(p, ones, run):
+        "Whether a complete prenecklace is a wanted pattern"
+
+        if n % p: return False
+        if hits is not None and ones != hits: return False
+
+        # the run of rests at the end wraps round onto the one at the start
+        if ones and run + a.index(1) - 1 > gap: return False
+
+        return not bracelets or _reflection_ok(a, n)
+
+    if t == stop:
+        if depth is not None: yield tuple(prefix), p
+        elif leaf(p, ones, run): yield bits if packed else a[1:]
+        return
+
+    # each step either copies the step a period back, or raises it from 0 to 1
+    # and starts a new period; children are pushed largest first
+    stack = []
+    pop, push = stack.pop, stack.append
+
+    w = a[t + 1 - p]
+    if not w: push((t + 1, 1, t + 1, ones, run, bits))
+    push((t + 1, w, p, ones, run, bits))
+
+    while stack:
+        t, v, p, ones, run, bits = pop()
+
+        a[t] = v
+        if v:
+            ones += 1
+            if ones > k: continue
+            run = 0
+            bits |= 1 << (t - 1)
+        else:
+            run += 1
+            if run > gap: continue
+
+        if hits is not None and ones + n - t < k: continue
+
+        if t == stop:
+            if depth is not None: yield tuple(a[1:t + 1]), p
+            elif leaf(p, ones, run): yield bits if packed else a[1:]
+            continue
+
+        w = a[t + 1 - p]
+        if not w: push((t + 1, 1, t + 1, ones, run, bits))
+        push((t + 1, w, p, ones, run, bits))
+
+def _search_chunk(n: int, hits: Optional[int], max_gap: Optional[int], bracelets: bool, packed: bool,
+                  starts: list):
+    "Search below each of a list of prefixes (for worker processes)"
+
+    return [list(_search(n, hits, max_gap, bracelets, packed, start)) for start in starts]
+
+# Enumeration
+
+def necklaces(n: int, hits: Optional[int] = None,
+              *,
+              max_gap: Optional[int] = None,
+              bracelets: bool = False,
+              packed: bool = False,
+              workers: int = 1,
+              prefix: int = DEFAULT_PREFIX,
+              chunk: int = DEFAULT_CHUNK
+    ):
+    """
+    Lazily generate every binary pattern of n steps up to rotation, each once
+    in canonical (least rotation) form, in lexicographic order.
+
+    Parameters
+    ----------
+    hits
+        only patterns with this many hits
+    max_gap
+        only patterns with no more than this many rests in a row, counting
+        round the end of the pattern
+    bracelets
+        also count reflections as the same pattern, keeping the pattern whose
+        canonical form is the smaller of the two
+    packed
+        yield ints (step n is bit n - 1) instead of lists
+    workers
+        split the search by the first prefix steps and run the parts in a
+        process pool. The output and its order are the same as with one
+        worker
+    """
+
+    if n < 0: raise ValueError(f'Invalid number of steps: {n}')
+    if hits is not None and not 0 <= hits <= n: return iter(())
+    if n == 0: return iter([0 if packed else []])
+
+    if workers <= 1 or prefix >= n:
+        return _search(n, hits, max_gap, bracelets, packed)
+
+    return _parallel(n, hits, max_gap, bracelets, packed, workers, max(prefix, 1), chunk)
+
+def _parallel(n: int, hits: Optional[int], max_gap: Optional[int], bracelets: bool, packed: bool,
+              workers: int, prefix: int, chunk: int):
+    "Search prefixes in a process pool, yielding results in order"
+
+    starts = _search(n, hits, max_gap, False, False, depth = prefix)
+    parts = iter(lambda: list(its.islice(starts, chunk)), [])
+
+    with ProcessPoolExecutor(workers) as pool:
+        # keep a bounded number of parts in flight so memory stays flat
+        pending = collections.deque()
+
+        for part in parts:
+            pending.append(pool.submit(_search_chunk, n, hits, max_gap, bracelets, packed, part))
+
+            if len(pending) >= 2 * workers:
+                for results in pending.popleft().result(): yield from results
+
+        while pending:
+            for results in pending.popleft().result(): yield from results
+
+def bracelets(n: int, hits: Optional[int] = None, **kwargs):
+    "Lazily generate every binary pattern of n steps up to rotation and reflection"
+
+    return necklaces(n, hits, bracelets = True, **kwargs)
+
+def count(n: int, hits: Optional[int] = None, **kwargs):
+    "Count patterns without keeping them"
+
+    return sum(1 for _ in necklaces(n, hits, packed = True, **kwargs))
@@ -7,6 +7,10 @@ data
 from __future__ import annotations
 from typing import Optional
 
+from array import array
+
+import itertools as its
+
 # defaults
 
 from note_defaults import DEFAULT_PITCH, DEFAULT_VELOCITY, DEFAULT_DURATION
@@ -14,27 +18,87 @@ from note_defaults import DEFAULT_NOTE_OPTS
 
 # Supporting classes
 
-from pitch import Pitch
-from duration import Duration
+from pitch import Pitch, midirange
+from pitch_defaults import MIDI_MIN, MIDI_MAX
+from duration import Duration, FrozenDuration, to_ticks
+
+# Helper functions
+
+def _copy_value(v):
+    "Copy mutable values, share immutable ones"
+
+    return v if type(v) in (int, str, FrozenDuration) else v.copy()
+
+def _onsets(ticks, start: int = 0):
+    "Onsets of back to back notes from start"
+
+    return its.accumulate(ticks[:-1], initial = start) if len(ticks) else ()
 
 # Note class
 
 class Note():
     """
     Represents a musical note
+
+    Pitch is stored as given and only converted to a Pitch instance when the
+    pitch attribute is read, so notes made with from_values() or many() can
+    be created and passed around without parsing.
     """
 
+    __slots__ = ('_pitch', 'duration', 'velocity')
+
     def __init__(self,
                  pitch: Optional[int|str|Pitch|Note] = None,
                  duration: Optional[int|str|Duration] = None,
                  velocity: Optional[int] = None
     ):
-        self.pitch = None
+        self._pitch = None
         self.duration = None
         self.velocity = None
 
         self.set(pitch, duration, velocity)
 
+    @classmethod
+    def from_values(cls, pitch: int, ticks: int, velocity: int = DEFAULT_VELOCITY):
+        """
+        Create Note from a midi pitch value, duration in ticks and velocity
+        without parsing or validation. The duration is an interned
+        FrozenDuration shared with other notes.
+        """
+
+        n = cls.__new__(cls)
+        n._pitch = pitch
+        n.duration = FrozenDuration.from_ticks(ticks)
+        n.velocity = velocity
+
+        return n
+
+    @classmethod
+    def many(cls, pitches, ticks, velocities = DEFAULT_VELOCITY):
+        """
+        Create a list of Notes from iterables of midi pitch values, durations in
+        ticks and velocities (see from_values()). Velocities can be a single
+        int for all notes.
+        """
+
+        if type(velocities) == int: velocities = its.repeat(velocities)
+
+        new = cls.__new__
+        durs = {}
+
+        r = []
+        for p, t, v in zip(pitches, ticks, velocities):
+            d = durs.get(t)
+            if d is None: d = durs[t] = FrozenDuration.from_ticks(t)
+
+            n = new(cls)
+            n._pitch = p
+            n.duration = d
+            n.velocity = v
+            r.append(n)
+
+        return r
+
     def set(self,
             pitch: Optional[int|str|Pitch|Note] = None,
             duration: Optional[int|str|Duration] = None,
@@ -44,16 +108,16 @@ class Note():
 
         match pitch:
             case int() | str() | Pitch():
-                self.pitch = Pitch(pitch)
+                self._pitch = Pitch(pitch)
             case Note():
-                self.pitch = pitch.pitch.copy()
-                self.velocity = pitch.velocity
-                self.duration = pitch.duration.copy()
+                self._pitch = _copy_value(pitch._pitch)
+                if duration is None: duration = _copy_value(pitch.duration)
+                if velocity is None: velocity = pitch.velocity
             case _:
-                self.pitch = DEFAULT_PITCH
+                self._pitch = DEFAULT_PITCH
 
         match duration:
-            case int():
+            case int() | str() | Duration():
                 self.duration = duration
             case _:
                 self.duration = DEFAULT_DURATION
@@ -67,9 +131,36 @@ class Note():
         return self
 
     def copy(self):
-        "Make a copy of Note"
+        "Make a copy of Note, sharing immutable values"
+
+        n = self.__class__.__new__(self.__class__)
+        n._pitch = _copy_value(self._pitch)
+        n.duration = _copy_value(self.duration)
+        n.velocity = self.velocity
+
+        return n
+
+    # Attributes
+
+    @property
+    def pitch(self):
+        "Pitch instance"
+
+        if type(self._pitch) != Pitch: self._pitch = Pitch(self._pitch)
+
+        return self._pitch
 
-        return Note(self)
+    @pitch.setter
+    def pitch(self, pitch: int|str|Pitch):
+        self._pitch = pitch
+
+    @property
+    def pitch_value(self):
+        "Midi pitch value"
+
+        p = self._pitch
+
+        return p if type(p) == int else self.pitch.value
 
     # String representation
 
@@ -86,5 +177,181 @@ class Note():
 class Rest(Note):
     "Represents a rest (a note with velocity 0)"
 
+    __slots__ = ()
+
     def __init__(self, duration: Optional[int|str|Duration] = None):
         Note.__init__(self, 0, duration, 0)
+
+# Note array class
+
+class NoteArray:
+    """
+    Compact columnar storage for many notes.
+
+    Each note is a row across four parallel arrays: pitch (midi value),
+    duration (ticks), velocity and onset (ticks). Rests are rows with velocity
+    0. Operations work on whole columns at once and return self for chaining.
+
+    Slicing returns a view: the sliced NoteArray shares the parent's columns,
+    so changes to one show in the other. Parent arrays can not grow while views
+    of them exist.
+    """
+
+    def __init__(self, notes: Optional[list[Note]] = None, onsets: Optional[list[int]] = None):
+        self.pitch = array('B')
+        self.ticks = array('q')
+        self.velocity = array('B')
+        self.onset = array('q')
+
+        if notes: self.extend(notes, onsets)
+
+    @classmethod
+    def from_columns(cls, pitch, ticks, velocity, onset: Optional[list[int]] = None):
+        "Create NoteArray from column values. Onsets default to back to back notes"
+
+        na = cls()
+        na.pitch = array('B', pitch)
+        na.ticks = array('q', ticks)
+        na.velocity = array('B', velocity)
+        na.onset = array('q', onset if onset is not None else _onsets(na.ticks))
+
+        return na
+
+    @classmethod
+    def _view(cls, pitch, ticks, velocity, onset):
+        "Create NoteArray sharing columns"
+
+        na = cls.__new__(cls)
+        na.pitch, na.ticks, na.velocity, na.onset = pitch, ticks, velocity, onset
+
+        return na
+
+    def copy(self):
+        "Make a copy of NoteArray with its own columns"
+
+        return NoteArray.from_columns(self.pitch, self.ticks, self.velocity, self.onset)
+
+    # Conversion
+
+    def append(self, note: Note, onset: Optional[int] = None):
+        "Append a note. Onset defaults to the end of the last note"
+
+        return self.extend([note], None if onset is None else [onset])
+
+    def extend(self, notes: list[Note], onsets: Optional[list[int]] = None):
+        "Append notes. Onsets default to back to back notes after the last note"
+
+        pitch, ticks, velocity = [], [], []
+        for n in notes:
+            pitch.append(n.pitch_value)
+            ticks.append(to_ticks(n.duration))
+            velocity.append(n.velocity)
+
+        if onsets is None:
+            start = self.onset[-1] + self.ticks[-1] if len(self) else 0
+            onsets = _onsets(ticks, start)
+
+        self.pitch.extend(pitch)
+        self.ticks.extend(ticks)
+        self.velocity.extend(velocity)
+        self.onset.extend(onsets)
+
+        return self
+
+    def as_list(self):
+        "Get notes as a list of Note and Rest instances"
+
+        notes = Note.many(self.pitch, self.ticks, self.velocity)
+
+        # rests are rows with velocity 0
+        for ix, v in enumerate(self.velocity):
+            if not v: notes[ix] = Rest.from_values(0, self.ticks[ix], 0)
+
+        return notes
+
+    def _note(self, ix: int):
+        "Note or Rest at row"
+
+        cls = Note if self.velocity[ix] else Rest
+
+        return cls.from_values(self.pitch[ix], self.ticks[ix], self.velocity[ix])
+
+    # Manipulation
+
+    def transpose(self, semi: int, wrap: int = 0):
+        "Transpose all pitches (not rests) by semitones, limiting or wrapping to midi range"
+
+        if wrap:
+            r = [midirange(p + semi, wrap) if v else p for p, v in zip(self.pitch, self.velocity)]
+        else:
+            r = [p if not v else MIDI_MIN if p + semi < MIDI_MIN else MIDI_MAX if p + semi > MIDI_MAX else p + semi
+                 for p, v in zip(self.pitch, self.velocity)]
+
+        self.pitch[:] = array('B', r)
+
+        return self
+
+    def scale_velocity(self, mult: int|float):
+        "Multiply all velocities, rounding and limiting to midi range"
+
+        self.velocity[:] = array('B', [max(min(int(v * mult + 0.5), MIDI_MAX), 0) for v in self.velocity])
+
+        return self
+
+    def shift(self, ticks: int):
+        "Move all onsets by ticks"
+
+        self.onset[:] = array('q', [o + ticks for o in self.onset])
+
+        return self
+
+    def filter(self, mask):
+        """
+        Get new NoteArray of the rows selected by mask.
+
+        Mask can be an iterable of truthy values, one per row, or a function
+        called with (pitch, ticks, velocity, onset) for each row.
+        """
+
+        if callable(mask): mask = map(mask, self.pitch, self.ticks, self.velocity, self.onset)
+
+        mask = list(mask)
+
+        return NoteArray.from_columns(its.compress(self.pitch, mask),
+                                      its.compress(self.ticks, mask),
+                                      its.compress(self.velocity, mask),
+                                      its.compress(self.onset, mask))
+
+    def without_rests(self):
+        "Get new NoteArray without rests"
+
+        return self.filter(self.velocity)
+
+    # Querying
+
+    def total_ticks(self):
+        "End of the last sounding row in ticks"
+
+        return max(map(sum, zip(self.onset, self.ticks)), default = 0)
+
+    def __len__(self):
+        return len(self.pitch)
+
+    def __getitem__(self, ix: int|slice):
+        "Index gets a Note, slice gets a NoteArray view"
+
+        if isinstance(ix, slice):
+            return NoteArray._view(*[memoryview(c)[ix] for c in (self.pitch, self.ticks, self.velocity, self.onset)])
+
+        return self._note(ix)
+
+    def __iter__(self):
+        return (self._note(i) for i in range(len(self)))
+
+    # String representation
+
+    def __repr__(self):
+        return f'{self.__class__}({len(self)})'
+
+    def __str__(self):
+        return '\n'.join(f'{o}: {n}' for o, n in zip(self.onset, self))
@@ -0,0 +1,212 @@
+""" pattern_index.py
+--------------------
+Rotation invariant canonical forms of sequences, and an index for finding
+patterns that are rotations of each other with a single lookup.
+
+Rotations follow Sequence.shift(): shifting by a positive amount moves values
+later (to the right). The canonical form of a sequence is its least rotation,
+and a sequence's offset is the shift that turns its canonical form back into
+the sequence:
+
+    seq == shift_seq(canonical(seq)[0], canonical(seq)[1])
+"""
+
+from __future__ import annotations
+from typing import Optional
+
+import hashlib
+
+from array import array
+
+# Sequence classes
+
+from sequence_base import SequenceBase
+
+# Helper functions
+
+def _values(seq):
+    "Get list of values from a sequence or iterable"
+
+    return seq.seq if isinstance(seq, SequenceBase) else list(seq)
+
+def least_rotation(seq: list):
+    """
+    Index where the lexicographically least rotation of seq starts, using
+    Booth's algorithm (linear time). The first such index if there are
+    several.
+    """
+
+    n = len(seq)
+    if n < 2: return 0
+
+    s = seq + seq
+    f = [-1] * (2 * n)
+    k = 0
+
+    for j in range(1, 2 * n):
+        sj = s[j]
+        i = f[j - k - 1]
+
+        while i != -1 and sj != s[k + i + 1]:
+            if sj < s[k + i + 1]: k = j - i - 1
+            i = f[i]
+
+        if sj != s[k + i + 1]:
+            # i == -1 here
+            if sj < s[k]: k = j
+            f[j - k] = -1
+        else:
+            f[j - k] = i + 1
+
+    return k % n
+
+def canonical(seq):
+    """
+    Get (canonical form, offset) of a sequence or list. The canonical form is
+    the least rotation as a tuple, and shifting it by offset gives seq back.
+    """
+
+    values = _values(seq)
+    k = least_rotation(values)
+
+    return tuple(values[k:] + values[:k]), k
+
+def content_hash(values: tuple):
+    "Stable 64 bit hash of sequence values"
+
+    try:
+        data = array('q', values).tobytes()
+    except (TypeError, OverflowError):
+        data = repr(values).encode()
+
+    return int.from_bytes(hashlib.blake2b(data, digest_size = 8, person = b'pattern').digest(), 'little')
+
+def canonical_hash(seq):
+    "Hash that is the same for all rotations of a sequence"
+
+    return content_hash(canonical(seq)[0])
+
+def is_rotation(a, b):
+    "Whether b is a rotation of a"
+
+    return canonical(a)[0] == canonical(b)[0]
+
+# Index class
+
+class PatternIndex:
+    """
+    Index of patterns by canonical form.
+
+    Each distinct pattern (up to rotation) has one entry holding its
+    canonical form and the keys and offsets of every sequence added as a
+    rotation of it. Looking up a sequence is one hash and one dict lookup
+    after finding its canonical form.
+
+    Public Attributes
+    -----------------
+    entries: dict
+        canonical hash -> list of PatternEntry (more than one only on hash
+        collisions)
+    """
+
+    def __init__(self, seqs: Optional[list] = None):
+        self.entries = {}
+        self._count = 0
+        self._added = 0
+
+        if seqs:
+            for key, seq in (seqs.items() if isinstance(seqs, dict) else enumerate(seqs)):
+                self.add(seq, key)
+
+    def _entry(self, canon: tuple, h: int, create: bool = False):
+        "Find entry for canonical form, creating it if create"
+
+        bucket = self.entries.get(h)
+        if bucket:
+            for e in bucket:
+                if e.canonical == canon: return e
+
+        if not create: return None
+
+        e = PatternEntry(canon, h)
+        self.entries.setdefault(h, []).append(e)
+        self._count += 1
+
+        return e
+
+    def add(self, seq, key = None):
+        """
+        Add sequence under key (default: the next free number). Returns
+        (entry, is_new) where is_new is False if the pattern was already in the
+        index as a rotation of something.
+        """
+
+        canon, offset = canonical(seq)
+        h = content_hash(canon)
+
+        existing = self._entry(canon, h)
+        entry = existing or self._entry(canon, h, True)
+        entry.members.append((self._added if key is None else key, offset))
+        self._added += 1
+
+        return entry, existing is None
+
+    def find(self, seq):
+        """
+        Get [(key, shift)] for added sequences that seq is a rotation of,
+        where shifting the added sequence by shift gives seq
+        """
+
+        canon, offset = canonical(seq)
+        entry = self._entry(canon, content_hash(canon))
+        if entry is None: return []
+
+        n = len(canon) or 1
+
+        return [(key, (offset - o) % n) for key, o in entry.members]
+
+    def dedupe(self, seqs):
+        "Get the sequences that are not rotations of earlier ones or of anything in the index"
+
+        r = []
+        for seq in seqs:
+            if self.add(seq)[1]: r.append(seq)
+
+        return r
+
+    def __contains__(self, seq):
+        canon, _ = canonical(seq)
+
+        return self._entry(canon, content_hash(canon)) is not None
+
+    def __len__(self):
+        "Number of distinct patterns"
+        return self._count
+
+    def __iter__(self):
+        return (e for bucket in self.entries.values() for e in bucket)
+
+class PatternEntry:
+    """
+    A distinct pattern in a PatternIndex.
+
+    Public Attributes
+    -----------------
+    canonical: tuple
+        least rotation of the pattern
+    hash: int
+        content hash of canonical
+    members: list
+        (key, offset) of each sequence added as this pattern, where shifting
+        canonical by offset gives the sequence
+    """
+
+    __slots__ = ('canonical', 'hash', 'members')
+
+    def __init__(self, canonical: tuple, hash: int):
+        self.canonical = canonical
+        self.hash = hash
+        self.members = []
+
+    def __repr__(self):
+        return f'{self.__class__}({list(self.canonical)}, {len(self.members)} members)'
@@ -51,12 +51,29 @@ OFFSET = {
 }
 
 # Regex
+# compiled on first use; RE_* module attributes are still available
 
-RE_NOTE = re.compile(r'([a-gA-G])([#sb]*)', re.A)
-RE_ACCIDENTAL = re.compile(r'()([#sb])()', re.A)
-RE_PITCH = re.compile(r'^\s*([a-gA-G])([#sb]*)\s*(-?\d{1,2})?\s*$', re.A)
+REGEX = {
+    'RE_NOTE': (r'([a-gA-G])([#sb]*)', re.A),
+    'RE_ACCIDENTAL': (r'()([#sb])()', re.A),
+    'RE_PITCH': (r'^\s*([a-gA-G])([#sb]*)\s*(-?\d{1,2})?\s*$', re.A),
+    'RE_WRAP': (WRAP_RE, 0),
+}
+
+_compiled = {}
+
+def _regex(name: str):
+    "Get compiled regex by name"
+
+    r = _compiled.get(name)
+    if r is None: r = _compiled[name] = re.compile(*REGEX[name])
+
+    return r
+
+def __getattr__(name: str):
+    if name in REGEX: return _regex(name)
 
-RE_WRAP = re.compile(WRAP_RE)
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
 
 # Helper functions
 
@@ -66,7 +83,7 @@ def format_accidental(note: str, style: str = 'letter'):
     n = a = o = ''
 
     # match pitch or accidental
-    for m in [RE_PITCH.match(note), RE_ACCIDENTAL.search(note), re.match('()()()', '')]:
+    for m in [_regex('RE_PITCH').match(note), _regex('RE_ACCIDENTAL').search(note), re.match('()()()', '')]:
         if m:
             n, a, o = m.groups()
 
@@ -140,7 +157,7 @@ def parse_pitch(p: str|int):
 
     if type(p) == int: return p
 
-    r = RE_PITCH.match(p)
+    r = _regex('RE_PITCH').match(p)
 
     if not r: raise ValueError(f'Invalid pitch: {p}')
 
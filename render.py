@@ -0,0 +1,518 @@
+""" render.py
+-------------
+Offline rendering of sequences and notes to stereo audio.
+
+Notes are compiled into a Timeline of events in samples, each Track plays a
+Timeline on an instrument (an oscillator, a wavetable or a one-shot sample),
+and tracks are rendered a fixed size block at a time, summed and written to a
+16 bit stereo WAV file one window at a time, so memory use doesn't grow with
+the length of the render.
+
+Audio is float32 arrays from the standard library, with samples from -1 to 1.
+"""
+
+from __future__ import annotations
+from typing import Optional
+
+import collections
+import math
+import operator
+import sys
+import wave
+
+from array import array
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor
+
+# Sequence classes
+
+from sequence_base import SequenceBase
+
+# Notes and durations
+
+from note import Note, NoteArray
+from duration import to_ticks
+from tempo import TempoMap
+
+# Defaults
+
+SAMPLE_RATE = 44100
+
+# samples per render block
+DEFAULT_BLOCK = 1024
+
+# blocks per window written to the file (and per worker task)
+DEFAULT_WINDOW = 64
+
+# samples per wavetable cycle (a power of 2)
+TABLE_SIZE = 2048
+
+# seconds
+DEFAULT_ATTACK = 0.005
+DEFAULT_RELEASE = 0.05
+
+# Helper functions
+
+def midi_to_freq(pitch: int|float):
+    "Frequency in Hz of a midi pitch value"
+
+    return 440.0 * 2 ** ((pitch - 69) / 12)
+
+def _zeros(n: int):
+    "Float32 array of n zeros"
+
+    return array('f', bytes(4 * n))
+
+def _mix(buf: array, offset: int, values):
+    "Add values into buf starting at offset"
+
+    end = offset + len(values)
+    buf[offset:end] = array('f', map(operator.add, buf[offset:end], values))
+
+def make_table(shape: str, size: int = TABLE_SIZE):
+    "One cycle of a basic waveform: 'sine', 'saw', 'square' or 'triangle'"
+
+    match shape:
+        case 'sine':
+            return array('f', [math.sin(2 * math.pi * i / size) for i in range(size)])
+        case 'saw':
+            return array('f', [2 * i / size - 1 for i in range(size)])
+        case 'square':
+            return array('f', [1.0 if i < size // 2 else -1.0 for i in range(size)])
+        case 'triangle':
+            return array('f', [1 - 4 * abs(i / size - 0.5) for i in range(size)])
+
+    raise ValueError(f'Invalid waveform: {shape}')
+
+def to_pcm16(samples: array):
+    "Convert float samples to little endian 16 bit PCM bytes, clipping at -1 and 1"
+
+    pcm = array('h', [32767 if v >= 1 else -32767 if v <= -1 else int(v * 32767) for v in samples])
+    if sys.byteorder == 'big': pcm.byteswap()
+
+    return pcm.tobytes()
+
+def read_wav(path: str):
+    "Read a 16 bit PCM WAV file as (mono float32 samples, sample rate)"
+
+    with wave.open(path, 'rb') as f:
+        if f.getsampwidth() != 2: raise ValueError('Only 16 bit WAV files are supported')
+
+        channels, rate = f.getnchannels(), f.getframerate()
+        pcm = array('h', f.readframes(f.getnframes()))
+
+    if sys.byteorder == 'big': pcm.byteswap()
+
+    if channels == 1: return array('f', [v / 32768 for v in pcm]), rate
+
+    # mix down to mono
+    frames = [pcm[c::channels] for c in range(channels)]
+
+    return array('f', [sum(vs) / (32768 * channels) for vs in zip(*frames)]), rate
+
+# Timeline class
+
+class Timeline:
+    """
+    Events in samples, sorted by start, in parallel arrays.
+
+    Public Attributes
+    -----------------
+    start, length: array
+        start and length of each event in samples
+    freq: array
+        frequency of each event in Hz
+    gain: array
+        gain of each event (velocity / 127)
+    rate: int
+        sample rate
+    """
+
+    def __init__(self, rate: int = SAMPLE_RATE):
+        self.start = array('q')
+        self.length = array('q')
+        self.freq = array('d')
+        self.gain = array('f')
+        self.rate = rate
+
+        self._longest = 0
+
+    def add(self, start: int, length: int, freq: float, gain: float = 1.0):
+        "Add an event, keeping events sorted by start"
+
+        ix = bisect_left(self.start, start + 1)
+        self.start.insert(ix, start)
+        self.length.insert(ix, length)
+        self.freq.insert(ix, freq)
+        self.gain.insert(ix, gain)
+
+        self._longest = max(self._longest, length)
+
+        return self
+
+    @classmethod
+    def from_columns(cls, start, length, freq, gain, rate: int = SAMPLE_RATE):
+        "Create Timeline from columns of event values, sorting by start"
+
+        tl = cls(rate)
+        order = sorted(range(len(start)), key = start.__getitem__)
+
+        tl.start = array('q', [start[i] for i in order])
+        tl.length = array('q', [length[i] for i in order])
+        tl.freq = array('d', [freq[i] for i in order])
+        tl.gain = array('f', [gain[i] for i in order])
+        tl._longest = max(tl.length, default = 0)
+
+        return tl
+
+    @classmethod
+    def from_notes(cls, notes: NoteArray|list[Note], tempo: Optional[TempoMap] = None, rate: int = SAMPLE_RATE):
+        "Compile notes (back to back, or at NoteArray onsets) into a Timeline, leaving out rests"
+
+        if not isinstance(notes, NoteArray): notes = NoteArray(notes)
+        notes = notes.without_rests()
+
+        tempo = tempo or TempoMap()
+        starts = tempo.ticks_to_seconds_array(notes.onset)
+        ends = tempo.ticks_to_seconds_array([o + t for o, t in zip(notes.onset, notes.ticks)])
+
+        start = [round(s * rate) for s in starts]
+        length = [max(round(e * rate) - s, 1) for s, e in zip(start, ends)]
+
+        return cls.from_columns(start, length,
+                                [midi_to_freq(p) for p in notes.pitch],
+                                [v / 127 for v in notes.velocity],
+                                rate)
+
+    @classmethod
+    def from_sequence(cls, pitches: SequenceBase|list,
+                      step: int|str = '16n',
+                      velocities: Optional[SequenceBase|list] = None,
+                      *,
+                      gate: float = 1.0,
+                      tempo: Optional[TempoMap] = None,
+                      rate: int = SAMPLE_RATE
+    ):
+        """
+        Compile a pitch lane into a Timeline, one step every step duration.
+        Steps with pitch 0 are rests. Velocities (default 127) can be a lane
+        of their own, looped to the pitch lane's length; gate is the fraction
+        of a step each note lasts.
+        """
+
+        pitches = list(pitches)
+        velocities = list(velocities) if velocities is not None else [127]
+        step_ticks = to_ticks(step)
+        length = max(round(step_ticks * gate), 1)
+
+        notes = NoteArray.from_columns(
+            [p for p in pitches if p > 0],
+            [length for p in pitches if p > 0],
+            [max(min(int(velocities[ix % len(velocities)]), 127), 0) for ix, p in enumerate(pitches) if p > 0],
+            [ix * step_ticks for ix, p in enumerate(pitches) if p > 0],
+        )
+
+        return cls.from_notes(notes, tempo, rate)
+
+    def between(self, a: int, b: int):
+        "Indices of events that overlap samples a to b"
+
+        lo = bisect_left(self.start, a - self._longest)
+        hi = bisect_left(self.start, b)
+
+        start, length = self.start, self.length
+
+        return [i for i in range(lo, hi) if start[i] + length[i] > a]
+
+    def __len__(self):
+        return len(self.start)
+
+    def __repr__(self):
+        return f'{self.__class__}({len(self)} events, rate={self.rate})'
+
+# Instruments
+# each renders one event's samples from offset (into the event) for n samples
+
+class Wavetable:
+    """
+    Instrument playing a single cycle table at each event's frequency, with a
+    linear attack and release.
+
+    Public Attributes
+    -----------------
+    table: array
+        one cycle, resampled to TABLE_SIZE
+    attack, release: float
+        envelope times in seconds
+    """
+
+    def __init__(self, table, attack: float = DEFAULT_ATTACK, release: float = DEFAULT_RELEASE):
+        table = array('f', table)
+        n = len(table)
+        if n != TABLE_SIZE: table = array('f', [table[i * n // TABLE_SIZE] for i in range(TABLE_SIZE)])
+
+        self.table = table
+        self.attack = attack
+        self.release = release
+
+    def tail(self, length: int, freq: float, rate: int):
+        "Samples rendered for an event of length samples"
+
+        return length + int(self.release * rate)
+
+    def render(self, offset: int, n: int, length: int, freq: float, gain: float, rate: int):
+        "Render n samples of an event from offset samples into it"
+
+        table, mask = self.table, TABLE_SIZE - 1
+        inc = freq * TABLE_SIZE / rate
+        p0 = offset * inc
+
+        values = [table[int(p0 + i * inc) & mask] for i in range(n)]
+
+        attack, release = int(self.attack * rate), int(self.release * rate)
+
+        if offset >= attack and offset + n <= length:
+            # all sustain
+            return [v * gain for v in values]
+
+        def env(i):
+            if i >= length: return max(1 - (i - length) / release, 0) if release else 0
+            return min(i / attack, 1) if attack else 1
+
+        return [v * gain * env(offset + i) for i, v in enumerate(values)]
+
+class Oscillator(Wavetable):
+    """
+    Instrument playing a basic waveform: 'sine', 'saw', 'square' or 'triangle'
+    """
+
+    def __init__(self, shape: str = 'sine', attack: float = DEFAULT_ATTACK, release: float = DEFAULT_RELEASE):
+        self.shape = shape
+
+        Wavetable.__init__(self, make_table(shape), attack, release)
+
+class OneShot:
+    """
+    Instrument playing a sample from the start to its end at every event.
+
+    Public Attributes
+    -----------------
+    data: array
+        mono float32 samples
+    root: float|None
+        frequency the sample plays back unchanged at. If None, every event
+        plays the sample unchanged
+    """
+
+    def __init__(self, data, root: Optional[float] = None):
+        self.data = array('f', data)
+        self.root = root
+
+    @classmethod
+    def from_wav(cls, path: str, root: Optional[float] = None, rate: Optional[int] = None):
+        "Load a 16 bit WAV file, resampling to rate if given"
+
+        data, file_rate = read_wav(path)
+
+        if rate and rate != file_rate:
+            n = len(data) * rate // file_rate
+            data = array('f', [data[i * file_rate // rate] for i in range(n)])
+
+        return cls(data, root)
+
+    def _speed(self, freq: float):
+        return freq / self.root if self.root else 1.0
+
+    def tail(self, length: int, freq: float, rate: int):
+        "Samples rendered for an event (the sample length, whatever the event length)"
+
+        return math.ceil(len(self.data) / self._speed(freq))
+
+    def render(self, offset: int, n: int, length: int, freq: float, gain: float, rate: int):
+        "Render n samples of an event from offset samples into it"
+
+        data = self.data
+        speed = self._speed(freq)
+
+        if speed == 1.0: return [v * gain for v in data[offset:offset + n]]
+
+        end = len(data)
+
+        return [data[j] * gain for j in (int((offset + i) * speed) for i in range(n)) if j < end]
+
+# Track class
+
+class Track:
+    """
+    A Timeline played on an instrument.
+
+    Public Attributes
+    -----------------
+    timeline: Timeline
+    instrument: Wavetable|Oscillator|OneShot
+    gain: float
+    pan: float
+        -1 (left) to 1 (right)
+    """
+
+    def __init__(self, timeline: Timeline, instrument = None, gain: float = 1.0, pan: float = 0.0):
+        self.timeline = timeline
+        self.instrument = instrument or Oscillator()
+        self.gain = gain
+        self.pan = pan
+
+        self._tails = None
+
+    def tails(self):
+        """
+        Samples rendered for each event, including the instrument's release,
+        worked out on first use
+        """
+
+        tl = self.timeline
+
+        if self._tails is None or len(self._tails) != len(tl):
+            tail = self.instrument.tail
+            self._tails = array('q', [tail(l, f, tl.rate) for l, f in zip(tl.length, tl.freq)])
+
+        return self._tails
+
+    @property
+    def end(self):
+        "Sample after the last rendered sample"
+
+        return max(map(operator.add, self.timeline.start, self.tails()), default = 0)
+
+    def render(self, a: int, b: int, block: int = DEFAULT_BLOCK):
+        "Render samples a to b as (left, right) float32 arrays, a block at a time"
+
+        tl = self.timeline
+        inst, rate = self.instrument, tl.rate
+
+        # constant power pan
+        angle = (self.pan + 1) * math.pi / 4
+        gl, gr = math.cos(angle) * self.gain, math.sin(angle) * self.gain
+
+        mono = _zeros(b - a)
+
+        start, tails = tl.start, self.tails()
+        reach = max(tails, default = 0)
+
+        for b0 in range(a, b, block):
+            b1 = min(b0 + block, b)
+
+            # events starting in the block, or earlier and still sounding
+            for i in range(bisect_left(start, b0 - reach), bisect_left(start, b1)):
+                s = start[i]
+                offset = max(b0 - s, 0)
+                n = min(b1, s + tails[i]) - s - offset
+                if n <= 0: continue
+
+                _mix(mono, s + offset - a, inst.render(offset, n, tl.length[i], tl.freq[i], tl.gain[i], rate))
+
+        return array('f', [v * gl for v in mono]), array('f', [v * gr for v in mono])
+
+    def __repr__(self):
+        return f'{self.__class__}({self.timeline!r}, {self.instrument.__class__.__name__})'
+
+# Rendering
+
+# tracks in a worker process, sent once when the worker starts
+_tracks = []
+
+def _init_worker(tracks: list[Track]):
+    global _tracks
+    _tracks = tracks
+
+def _render_window(ix: int, a: int, b: int, block: int):
+    "Render window of one track in a worker"
+
+    return _tracks[ix].render(a, b, block)
+
+def _interleave(left: array, right: array):
+    "Interleave left and right channels"
+
+    out = _zeros(2 * len(left))
+    out[0::2] = left
+    out[1::2] = right
+
+    return out
+
+def _sum(parts: list):
+    "Sum (left, right) renders of the same window"
+
+    left, right = parts[0]
+    for l, r in parts[1:]:
+        left = array('f', map(operator.add, left, l))
+        right = array('f', map(operator.add, right, r))
+
+    return _interleave(left, right)
+
+def render_windows(tracks: list[Track],
+                   *,
+                   seconds: Optional[float] = None,
+                   block: int = DEFAULT_BLOCK,
+                   window: int = DEFAULT_WINDOW,
+                   workers: int = 1
+    ):
+    """
+    Lazily render tracks summed into interleaved stereo float32 windows of
+    window blocks. Renders to the end of the last track unless seconds is
+    given.
+
+    With more than one worker, each track's windows are rendered in a
+    process pool, a few windows ahead of the one being consumed.
+    """
+
+    if not tracks: return
+
+    rate = tracks[0].timeline.rate
+    if any(t.timeline.rate != rate for t in tracks): raise ValueError('Tracks must have the same sample rate')
+
+    total = round(seconds * rate) if seconds is not None else max(t.end for t in tracks)
+    size = block * window
+    spans = [(a, min(a + size, total)) for a in range(0, total, size)]
+
+    if workers <= 1:
+        for a, b in spans:
+            yield _sum([t.render(a, b, block) for t in tracks])
+        return
+
+    with ProcessPoolExecutor(workers, initializer = _init_worker, initargs = (tracks,)) as pool:
+        pending = collections.deque()
+
+        for a, b in spans:
+            pending.append([pool.submit(_render_window, ix, a, b, block) for ix in range(len(tracks))])
+
+            if len(pending) > workers:
+                yield _sum([f.result() for f in pending.popleft()])
+
+        while pending:
+            yield _sum([f.result() for f in pending.popleft()])
+
+def render(tracks: list[Track]|Track, path: str,
+           *,
+           seconds: Optional[float] = None,
+           block: int = DEFAULT_BLOCK,
+           window: int = DEFAULT_WINDOW,
+           workers: int = 1
+    ):
+    """
+    Render tracks to a 16 bit stereo WAV file, a window at a time. Returns
+    the number of frames written.
+    """
+
+    if isinstance(tracks, Track): tracks = [tracks]
+
+    frames = 0
+
+    with wave.open(path, 'wb') as f:
+        f.setnchannels(2)
+        f.setsampwidth(2)
+        f.setframerate(tracks[0].timeline.rate if tracks else SAMPLE_RATE)
+
+        for w in render_windows(tracks, seconds = seconds, block = block, window = window, workers = workers):
+            f.writeframes(to_pcm16(w))
+            frames += len(w) // 2
+
+    return frames
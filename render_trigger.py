@@ -0,0 +1,160 @@
+""" render_trigger.py
+---------------------
+Sample accurate rendering of one-shot samples at the hits of gate sequences,
+e.g. for drum stems.
+
+Hit positions are read from the gate bits in one pass, converted to sample
+offsets with a single tempo map lookup over all of them, and the sample is
+mixed in at each offset with one slice operation per hit.
+"""
+
+from __future__ import annotations
+from typing import Optional
+
+import operator
+
+from array import array
+
+# Sequence classes
+
+from sequence_base import SequenceBase
+from sequence_gate import GateSequence, pack_gates, gate_positions, loop_gates
+
+# Timing
+
+from duration import PPQ
+from tempo import TempoMap
+
+# Rendering
+
+from render import SAMPLE_RATE, Timeline, Track, OneShot
+
+# Defaults
+
+DEFAULT_STEPS_PER_BEAT = 4
+
+# Helper functions
+
+def _gate_bits(gates: GateSequence|SequenceBase|list):
+    "Get (bits, steps) of gates"
+
+    if isinstance(gates, GateSequence): return gates.bits, gates.steps
+
+    values = gates.seq if isinstance(gates, SequenceBase) else list(gates)
+
+    return pack_gates(values), len(values)
+
+def trigger_offsets(gates: GateSequence|SequenceBase|list,
+                    velocities: Optional[SequenceBase|list] = None,
+                    *,
+                    steps_per_beat: int = DEFAULT_STEPS_PER_BEAT,
+                    swing: float = 0.0,
+                    tempo: Optional[TempoMap] = None,
+                    rate: int = SAMPLE_RATE,
+                    loops: int = 1
+    ):
+    """
+    Get (offsets, gains) arrays: the sample offset and gain of every hit of
+    gates played loops times.
+
+    Parameters
+    ----------
+    velocities
+        velocity lane (0 - 127) read at the same steps as gates and looped
+        if shorter. Hits with velocity 0 are left out
+    steps_per_beat
+        gate steps per quarter note beat
+    swing
+        delay of every second step, as a fraction of a step (0 is straight,
+        1/3 is a triplet feel)
+    """
+
+    bits, steps = _gate_bits(gates)
+    positions = gate_positions(loop_gates(bits, steps, loops))
+
+    step_ticks = PPQ / steps_per_beat
+    delay = swing * step_ticks
+
+    ticks = [p * step_ticks + delay if p & 1 else p * step_ticks for p in positions]
+    seconds = (tempo or TempoMap()).ticks_to_seconds_array(ticks)
+
+    offsets = array('q', [round(s * rate) for s in seconds])
+
+    if velocities is None: return offsets, array('f', [1.0]) * len(offsets)
+
+    vel = list(velocities)
+    n = len(vel)
+    gains = [vel[p % n] / 127 for p in positions]
+
+    keep = [ix for ix, g in enumerate(gains) if g > 0]
+    if len(keep) == len(gains): return offsets, array('f', gains)
+
+    return array('q', [offsets[i] for i in keep]), array('f', [gains[i] for i in keep])
+
+def mix_triggers(sample, offsets, gains = None, length: Optional[int] = None, out: Optional[array] = None):
+    """
+    Mix sample into out (a new float32 buffer of length samples by default)
+    at each offset, scaled by its gain. Hits past the end are cut off.
+
+    Scaled copies of the sample are made once per distinct gain, so mixing a
+    hit is a single slice add.
+    """
+
+    sample = sample if isinstance(sample, array) else array('f', sample)
+    n = len(sample)
+
+    if out is None:
+        if length is None: length = max(offsets, default = -n) + n
+        out = array('f', bytes(4 * max(length, 0)))
+
+    length = len(out)
+    if gains is None: gains = array('f', [1.0]) * len(offsets)
+
+    scaled = {}
+    add = operator.add
+
+    for o, g in zip(offsets, gains):
+        if o >= length or o + n <= 0: continue
+
+        s = scaled.get(g)
+        if s is None: s = scaled[g] = sample if g == 1 else array('f', [v * g for v in sample])
+
+        # clip the hit to the buffer
+        a, b = max(o, 0), min(o + n, length)
+        out[a:b] = array('f', map(add, out[a:b], s[a - o:b - o]))
+
+    return out
+
+def render_triggers(gates: GateSequence|SequenceBase|list, sample,
+                    velocities: Optional[SequenceBase|list] = None,
+                    *,
+                    length: Optional[int] = None,
+                    **kwargs
+    ):
+    """
+    Render sample at every hit of gates into a mono float32 buffer (long
+    enough for the last hit to ring out by default). Keyword arguments are
+    as trigger_offsets().
+    """
+
+    offsets, gains = trigger_offsets(gates, velocities, **kwargs)
+
+    return mix_triggers(sample, offsets, gains, length)
+
+def trigger_track(gates: GateSequence|SequenceBase|list, sample,
+                  velocities: Optional[SequenceBase|list] = None,
+                  *,
+                  gain: float = 1.0,
+                  pan: float = 0.0,
+                  **kwargs
+    ):
+    "Get a render Track playing sample at every hit of gates, to render along with other tracks"
+
+    offsets, gains = trigger_offsets(gates, velocities, **kwargs)
+    instrument = sample if isinstance(sample, OneShot) else OneShot(sample)
+    n = len(offsets)
+
+    timeline = Timeline.from_columns(offsets, [len(instrument.data)] * n, [0.0] * n, gains,
+                                     kwargs.get('rate', SAMPLE_RATE))
+
+    return Track(timeline, instrument, gain, pan)
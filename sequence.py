@@ -10,6 +10,7 @@ All things Sequencing
 from __future__ import annotations
 from typing import Optional
 
+import contextlib
 import itertools as its
 
 # Global defaults
@@ -26,7 +27,7 @@ from sequence_base import SequenceBase
 
 # Sequence manipulation functions
 
-from sequence_base import shift_seq, stretch_seq, expand_seq, reverse_seq, loop_seq
+from sequence_base import shift_seq, reverse_seq, loop_seq
 
 # Generator functions
 
@@ -35,11 +36,12 @@ from sequence_base import generate_euclidean
 # Class support
 
 from opts import OptsMixin # options support
-from historian import HistorianMixin
+from sequence_profile import ProfileMixin, delete_strategy # compiled options
+from history import LazyHistorianMixin, NullHistorian # undo support, historian loaded on first use
 
 # Class code
 
-class Sequence(SequenceBase, OptsMixin, HistorianMixin):
+class Sequence(SequenceBase, ProfileMixin, OptsMixin, LazyHistorianMixin):
     """
     Class representing a single musical sequence. For purposes of this class,
     all indices are represented as beats, and therefore counting starts at 1.
@@ -60,6 +62,9 @@ class Sequence(SequenceBase, OptsMixin, HistorianMixin):
         the sequence as a list
     """
 
+    # whether a transaction() is open
+    _transaction = False
+
     def __init__(self, sequence: Optional[list] = None,
                  *,
                  options: Optional[dict] = None
@@ -80,7 +85,7 @@ class Sequence(SequenceBase, OptsMixin, HistorianMixin):
         self.setopts(options)
 
         # init undo manager
-        HistorianMixin.__init__(self)
+        LazyHistorianMixin.__init__(self)
 
         self.set(sequence)
 
@@ -90,6 +95,9 @@ class Sequence(SequenceBase, OptsMixin, HistorianMixin):
         # setopts()
         # getopts()
 
+    # From ProfileMixin class
+        # profile
+
     # Sequence creation
 
     def set(self, sequence: Optional[list|int|SequenceBase] = None):
@@ -108,7 +116,9 @@ class Sequence(SequenceBase, OptsMixin, HistorianMixin):
         else:
             self.seq = sequence
             self.steps = len(self.seq)
-            self.hits = sum([1 if item > 0 else 0 for item in self.seq])
+
+            # counted once at the end of a transaction
+            if not self._transaction: self.hits = sum([1 if item > 0 else 0 for item in self.seq])
 
         return self
 
@@ -201,10 +211,10 @@ class Sequence(SequenceBase, OptsMixin, HistorianMixin):
     def replace(self, sequence, step: int = 1, style: Optional[str] = None):
         """Replace portion of sequence"""
 
-        style = style or self.getopts('replace-style')
+        style = style or self.profile.replace_style
 
         # register original with undo manager
-        self._undomgr.register(self.set, self.seq[:])
+        self._register_set()
 
         # new sequence replaces from start and exceeds old seq length
         if len(sequence) > self.steps and step == 1:
@@ -240,7 +250,7 @@ class Sequence(SequenceBase, OptsMixin, HistorianMixin):
         # register original with undo manager
         self._undomgr.register(self.shift, -amount, "relative")
 
-        style = style or self.getopts('shift-style')
+        style = style or self.profile.shift_style
 
         # shift sequence
         if style == 'absolute':
@@ -270,14 +280,10 @@ class Sequence(SequenceBase, OptsMixin, HistorianMixin):
 
         if not size: return self
 
-        style = self.getopts('stretch-with') if style is None or (type(style) == int and style < 0) else style
-        istyle = interpolate_style or self.getopts('interpolate-style')
-        iround = interpolate_rounding or self.getopts('interpolate-rounding')
-
-        result = stretch_seq(self.seq, size, style, istyle, iround)
+        result = self.profile.stretch(self.seq, size, style, interpolate_style, interpolate_rounding)
 
         # register original with Historian
-        self._undomgr.register(self.set, self.seq[:])
+        self._register_set()
 
         # adjust offset and save result
         self.offset = rounder(self.offset * (size / self.steps))
@@ -293,8 +299,7 @@ class Sequence(SequenceBase, OptsMixin, HistorianMixin):
     ):
         """Stretch sequence by multiplier, creating/removing intermediate values"""
 
-        roundmethod = mult_rounding or self.getopts('global-rounding')
-        size = rounder(self.steps * mult, roundmethod)
+        size = rounder(self.steps * mult, mult_rounding) if mult_rounding else self.profile.round(self.steps * mult)
 
         return self.stretch_to(size, style,
                                interpolate_style = interpolate_style,
@@ -319,32 +324,10 @@ class Sequence(SequenceBase, OptsMixin, HistorianMixin):
     ):
         """Expand sequence to size, adding/removing values at end"""
 
-        # get options
-        if style is None or (type(style) == int and style < 0):
-            # get default if not set
-            style = self.getopts('expand-with')
-
-        # get loop options if style is loop
-        if type(style) == str and 'loop' in style:
-
-            if loop_length is None:
-                if 'loop-' in style:
-                    loop_length = int(style.split('-')[1])
-                else:
-                    loop_length = self.getopts('loop-length')
-
-            elif loop_length == 0:
-                # set loop to entire sequence
-                loop_length = self.steps
-
-            style = 'loop'
-
-        interpolate_rounding = interpolate_rounding or self.getopts('interpolate-rounding')
-
-        seq = expand_seq(self.seq, size, style, loop_length, interpolate_rounding)
+        seq = self.profile.expand(self.seq, size, style, loop_length, interpolate_rounding)
 
         # register original with undo manager
-        self._undomgr.register(self.set, self.seq[:])
+        self._register_set()
 
         # save result (no offset adjust)
         self.set(seq)
@@ -358,8 +341,7 @@ class Sequence(SequenceBase, OptsMixin, HistorianMixin):
     ):
         """Expand sequence by multiplier, adding/removing values at end"""
 
-        roundmethod = mult_rounding or self.getopts('global-rounding')
-        size = rounder(self.steps * mult, roundmethod)
+        size = rounder(self.steps * mult, mult_rounding) if mult_rounding else self.profile.round(self.steps * mult)
 
         return self.expand_to(size, style, **kwargs)
 
@@ -394,7 +376,7 @@ class Sequence(SequenceBase, OptsMixin, HistorianMixin):
         seq = loop_seq(self.seq, n)
 
         # register original with Historian
-        self._undomgr.register(self.set, self.seq[:])
+        self._register_set()
 
         # save result
         self.set(seq)
@@ -403,7 +385,7 @@ class Sequence(SequenceBase, OptsMixin, HistorianMixin):
 
     # Undo history
 
-    ### defined by HistorianMixin
+    ### defined by LazyHistorianMixin
     # undo()
     # redo()
 
@@ -414,13 +396,73 @@ class Sequence(SequenceBase, OptsMixin, HistorianMixin):
 
         return self
 
+    def _register_set(self):
+        "Register current state with undo manager"
+
+        # a transaction registers nothing until it ends, so skip the copy
+        if not self._transaction: self._undomgr.register(self.set, self.seq[:])
+
+    def _restore(self, sequence: list, offset: int):
+        """Restore sequence and offset, registering the current state with Historian"""
+
+        # register current state with Historian, so restoring can be redone
+        self._undomgr.register(self._restore, self.seq[:], self.offset)
+
+        self.set(sequence[:])
+        self.offset = offset
+
+        return self
+
+    @contextlib.contextmanager
+    def transaction(self):
+        """
+        Batch edits into one change:
+
+            with seq.transaction():
+                for step in range(1, 65): seq.replace_step(step, 0)
+
+        Edits inside the block register nothing with Historian and don't
+        recount hits. On exit hits are counted once, cached data is dropped
+        and a single undo entry is registered that restores the sequence as it
+        was before the block. If an exception escapes the block, the sequence
+        is rolled back and nothing is registered. Nested transactions are part
+        of the outermost one.
+        """
+
+        if self._transaction:
+            yield self
+            return
+
+        saved = (self.seq[:], self.offset)
+        undomgr = self._undomgr
+
+        self._undomgr = NullHistorian()
+        self._transaction = True
+
+        try:
+            yield self
+        except BaseException:
+            # roll back
+            self.seq, self.offset = saved[0][:], saved[1]
+            raise
+        finally:
+            self._transaction = False
+            self._undomgr = undomgr
+            self._cache = None
+
+            # consolidated bookkeeping
+            self.steps = len(self.seq)
+            self.hits = sum([1 if item > 0 else 0 for item in self.seq])
+
+        if self.seq != saved[0] or self.offset != saved[1]: undomgr.register(self._restore, *saved)
+
     ## Step/value manipulation
 
     def replace_value(self, value, rvalue, limit: int = 0):
         """Replace specified value in sequence with another value"""
 
         # register with Historian
-        self._undomgr.register(self.set, self.seq[:])
+        self._register_set()
 
         # save result
         count = 0
@@ -432,16 +474,22 @@ class Sequence(SequenceBase, OptsMixin, HistorianMixin):
 
             if limit != 0 and count == limit: break
 
+        # counted once at the end of a transaction
+        if count and not self._transaction: self.hits = sum([1 if item > 0 else 0 for item in self.seq])
+
         return self
 
     def replace_step(self, step, value):
         """Replace value at step with specified value"""
 
+        old = self.seq[step - 1]
+
         # register with Historian
-        self._undomgr.register(self.replace_step, step, self.seq[step - 1])
+        self._undomgr.register(self.replace_step, step, old)
 
         # set step to value
         self.seq[step - 1] = value
+        self.hits += (1 if value > 0 else 0) - (1 if old > 0 else 0)
 
         return self
 
@@ -449,15 +497,12 @@ class Sequence(SequenceBase, OptsMixin, HistorianMixin):
         "Remove item at step"
 
         # register with Historian
-        self._undomgr.register(self.set, self.seq[:])
+        self._register_set()
 
-        if style is None: style = self.getopts("delete-style")
-
-        match style:
-            case int():
-                self.seq[step - 1] = 0 if style < 0 else style
-            case "cut":
-                SequenceBase.remove_step(self, step)
+        if style is None:
+            self.profile.delete(self, step)
+        else:
+            delete_strategy(style)(self, step)
 
         return self
 
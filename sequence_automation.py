@@ -0,0 +1,470 @@
+""" sequence_automation.py
+--------------------------
+High resolution automation lanes stored as float32 buffers
+"""
+
+from __future__ import annotations
+from typing import Optional
+
+import functools
+import itertools as its
+import math
+import operator
+
+from array import array
+
+# Global defaults
+
+from sequence_defaults import *
+
+# Helper functions
+
+from helpers import rounder, interpolate
+
+# Sequence classes
+
+from sequence_base import SequenceBase
+from sequence import Sequence
+
+# Sequence manipulation functions
+
+from sequence_base import stretch_positions, generate_euclidean
+
+# Defaults
+
+# values per block when streaming
+DEFAULT_BLOCK = 4096
+
+# zero crossings of the polyphase filter kernel on each side
+DEFAULT_QUALITY = 8
+
+# most filter phases to precompute for polyphase resampling
+MAX_PHASES = 4096
+
+# Buffer functions
+
+def to_buffer(values):
+    "Get float32 array of values"
+
+    if isinstance(values, array) and values.typecode == 'f': return values[:]
+    if isinstance(values, SequenceBase): values = values.seq
+
+    return array('f', values)
+
+def _fill(value: float, n: int):
+    "Float32 array of n copies of value"
+
+    return array('f', [value]) * max(n, 0)
+
+def _rounded(values: list, iround: str):
+    "Round values with interpolate rounding style"
+
+    return values if iround not in ('auto', 'up', 'down') else [rounder(v, iround) for v in values]
+
+def stretch_buffer(data: array,
+                   size: int,
+                   style: Optional[int|str] = "repeat",
+                   istyle: Optional[str] = "loop",
+                   iround: Optional[str] = "none"
+):
+    """
+    Stretch (or shrink) a float32 array. Same results as stretch_seq(), but
+    the original values are placed with stretch_positions() and the gaps are
+    filled a segment at a time, so it works for negative values and doesn't
+    build a list per step.
+    """
+
+    if not size or not data: return array('f')
+
+    if type(style) != int and style not in ("repeat", "interpolate"): style = "repeat"
+    if istyle not in ("loop", "repeat"): istyle = "loop"
+
+    steps = len(data)
+
+    if size < steps:
+        # keep items picked by euclidean model
+        return array('f', its.compress(data, generate_euclidean(steps, size)))
+
+    if size == steps: return data[:]
+
+    positions = stretch_positions(steps, size)
+    ends = positions[1:] + [size]
+
+    if type(style) == int:
+        result = _fill(style, size)
+        for p, v in zip(positions, data): result[p] = v
+
+        return result
+
+    result = array('f', bytes(4 * size))
+
+    for ix, (p, q, v) in enumerate(zip(positions, ends, data)):
+        n = q - p - 1
+
+        if style == "repeat" or (q == size and istyle == "repeat"):
+            result[p:q] = _fill(v, q - p)
+            continue
+
+        result[p] = v
+
+        if n:
+            # interpolate to next value, or round to the first at the end
+            nxt = data[ix + 1] if q < size else data[0]
+            result[p + 1:q] = array('f', interpolate(v, nxt, n, rounding_style = iround))
+
+    return result
+
+def expand_buffer(data: array, size: int, style: int|str = 0, looplen = 0, iround = "none"):
+    "Expand a float32 array by adding values at end, as expand_seq()"
+
+    if type(style) != int and style not in ("repeat", "loop", "interpolate"): style = 0
+
+    steps = len(data)
+
+    if size <= steps: return data[:size]
+
+    n = size - steps
+
+    match style:
+        case int():
+            return data + _fill(style, n)
+
+        case "repeat":
+            return data + _fill(data[-1], n)
+
+        case "loop":
+            loop = data[-(looplen or steps):]
+            return data + (loop * -(-n // len(loop)))[:n]
+
+        case "interpolate":
+            return data + array('f', interpolate(data[-1], data[0], n, rounding_style = iround))
+
+# Resampling
+
+def _padded(data: array, pad: int, istyle: str):
+    "Copy of data with pad values either side, looped or holding the end values"
+
+    n = len(data)
+
+    if istyle == "repeat":
+        return _fill(data[0], pad) + data + _fill(data[-1], pad + 1)
+
+    # padded[k] is data[(k - pad) % n]
+    total = n + 2 * pad + 1
+    start = -pad % n
+
+    return (data * -(-(start + total) // n))[start:start + total]
+
+def _kernel(u: float, fc: float, half: float):
+    "Blackman windowed sinc low pass at cutoff fc (1 is the input Nyquist)"
+
+    if abs(u) >= half: return 0.0
+
+    x = fc * u
+    sinc = 1.0 if not x else math.sin(math.pi * x) / (math.pi * x)
+    w = 0.42 + 0.5 * math.cos(math.pi * u / half) + 0.08 * math.cos(2 * math.pi * u / half)
+
+    return fc * sinc * w
+
+def resampler(data: array, size: int, method: str = "linear", istyle: str = "loop", iround: str = "none",
+              quality: int = DEFAULT_QUALITY):
+    """
+    Get function render(start, stop) giving float32 values start to stop of
+    data resampled to size values, evenly spaced.
+
+    Methods
+    -------
+    linear
+        straight lines between neighbouring values
+    polyphase
+        windowed sinc filter, low pass filtered when shrinking so detail that
+        can't be kept is smoothed out rather than aliased. Filter taps are
+        computed once per phase of the size / len(data) ratio
+
+    istyle "loop" treats the data as a loop (the value after the last is the
+    first); "repeat" holds the end values.
+    """
+
+    n = len(data)
+    if not n or size <= 0: return lambda start, stop: array('f')
+
+    # output i sits at input position i * n / size = i * down / up
+    g = math.gcd(n, size)
+    up, down = size // g, n // g
+
+    if method == "linear":
+        padded = _padded(data, 1, istyle)
+
+        def render(start: int, stop: int):
+            out = []
+            for i in range(start, stop):
+                j, ph = divmod(i * down, up)
+                a = padded[j + 1]
+                out.append(a + (padded[j + 2] - a) * ph / up)
+
+            return array('f', _rounded(out, iround))
+
+        return render
+
+    if method != "polyphase": raise ValueError(f'Invalid resample method: {method}')
+
+    fc = min(1.0, size / n)
+    half = quality / fc
+    width = math.ceil(half)
+    padded = _padded(data, width, istyle)
+    offsets = range(1 - width, width + 1)
+
+    @functools.lru_cache(maxsize = MAX_PHASES)
+    def taps(ph: int):
+        frac = ph / up
+        t = [_kernel(k - frac, fc, half) for k in offsets]
+        total = sum(t)
+
+        return [v / total for v in t]
+
+    mul = operator.mul
+
+    def render(start: int, stop: int):
+        out = []
+        for i in range(start, stop):
+            j, ph = divmod(i * down, up)
+            out.append(sum(map(mul, taps(ph), padded[j + 1:j + 1 + 2 * width])))
+
+        return array('f', _rounded(out, iround))
+
+    return render
+
+def resample(data: array, size: int, method: str = "linear", istyle: str = "loop", iround: str = "none",
+             quality: int = DEFAULT_QUALITY):
+    "Resample float32 array to size evenly spaced values (see resampler())"
+
+    return resampler(data, size, method, istyle, iround, quality)(0, size)
+
+def envelope(data: array, buckets: int):
+    """
+    Decimate to buckets (mins, maxs) float32 arrays, e.g. to draw a long lane
+    at screen resolution without missing peaks
+    """
+
+    n = len(data)
+    if not n or buckets <= 0: return array('f'), array('f')
+
+    buckets = min(buckets, n)
+    bounds = [i * n // buckets for i in range(buckets + 1)]
+
+    mins, maxs = array('f'), array('f')
+    for a, b in zip(bounds, bounds[1:]):
+        part = data[a:b]
+        mins.append(min(part))
+        maxs.append(max(part))
+
+    return mins, maxs
+
+# Class code
+
+class AutomationLane(Sequence):
+    """
+    Sequence of control values stored as a float32 array, for lanes with
+    thousands of values such as CC automation at control rate.
+
+    Works anywhere a Sequence does, with seq being the array. Stretching and
+    expanding follow the Sequence options but work on the array directly.
+    Lanes can also be resampled evenly (linear or polyphase), decimated to
+    min/max envelopes and rendered a block at a time.
+    """
+
+    def __init__(self, sequence: Optional[list|int|SequenceBase|array] = None,
+                 *,
+                 options: Optional[dict] = None
+    ):
+        Sequence.__init__(self, sequence, options = options)
+
+    # Sequence creation
+
+    def set(self, sequence: Optional[list|int|SequenceBase|array] = None):
+        """
+        Set sequence, including getting number of steps and hits, and zeroing offset
+        """
+
+        if not sequence:
+            return self.set(_fill(0, DEFAULT_STEPS))
+        elif type(sequence) == int:
+            return self.set(_fill(0, sequence))
+
+        self.seq = sequence if type(sequence) == array and sequence.typecode == 'f' else to_buffer(sequence)
+        self.steps = len(self.seq)
+
+        # counted once at the end of a transaction
+        if not self._transaction: self.hits = sum(map((0.0).__lt__, self.seq))
+
+        return self
+
+    def copy(self):
+        """
+        Create copy of sequence.
+        """
+
+        return AutomationLane(self.seq[:], options = self._opts)
+
+    # Sequence manipulation
+
+    def insert(self, sequence: SequenceBase|list, step: int = 1):
+        """
+        Insert sequence at step, shifting current sequence.
+        Step 1 is start.
+        """
+
+        return Sequence.insert(self, to_buffer(sequence), step)
+
+    def append(self, sequence):
+        """Append sequence to end"""
+
+        return Sequence.append(self, to_buffer(sequence))
+
+    def replace(self, sequence, step: int = 1, style: Optional[str] = None):
+        """Replace portion of sequence"""
+
+        return Sequence.replace(self, to_buffer(sequence), step, style)
+
+    def stretch_to(self, size: Optional[int] = None, style: Optional[int|str] = -1,
+        *,
+        interpolate_style: Optional[str] = None,
+        interpolate_rounding: Optional[str] = None
+    ):
+        """
+        Stretch sequence to size, creating/removing intermediate values, as
+        Sequence.stretch_to()
+        """
+
+        if not size: return self
+
+        result = self.profile.stretch(self.seq, size, style, interpolate_style, interpolate_rounding,
+                                      func = stretch_buffer)
+
+        # register original with Historian
+        self._register_set()
+
+        # adjust offset and save result
+        self.offset = rounder(self.offset * (size / self.steps))
+        self.set(result)
+
+        return self
+
+    def expand_to(self, size: Optional[int], style: Optional[int|str] = -1,
+                  *,
+                  loop_length: Optional[int] = None,
+                  interpolate_rounding: Optional[str] = None
+    ):
+        """Expand sequence to size, adding/removing values at end"""
+
+        seq = self.profile.expand(self.seq, size, style, loop_length, interpolate_rounding, func = expand_buffer)
+
+        # register original with undo manager
+        self._register_set()
+
+        # save result (no offset adjust)
+        self.set(seq)
+
+        return self
+
+    def loop(self, n: int = 2):
+        """Copy sequence n times"""
+
+        # register original with Historian
+        self._register_set()
+
+        seq = self.seq * abs(n)
+        if n < 0: seq.reverse()
+
+        # save result
+        self.set(seq)
+
+        return self
+
+    def resample_to(self, size: int, method: str = "linear",
+                    *,
+                    interpolate_style: Optional[str] = None,
+                    interpolate_rounding: Optional[str] = None,
+                    quality: int = DEFAULT_QUALITY
+    ):
+        """
+        Resample to size evenly spaced values. Unlike stretch_to(), original
+        values don't have to land on steps; see resampler() for methods.
+        """
+
+        if not size: return self
+
+        result = resample(self.seq, size, method,
+                          interpolate_style or self.profile.interpolate_style,
+                          interpolate_rounding or self.profile.interpolate_rounding,
+                          quality)
+
+        # register original with Historian
+        self._register_set()
+
+        # adjust offset and save result
+        self.offset = rounder(self.offset * (size / self.steps))
+        self.set(result)
+
+        return self
+
+    # Sequence querying
+
+    def as_list(self):
+        """Get sequence as list"""
+        return self.seq.tolist()
+
+    def value_at(self, position: float):
+        "Value at fractional step (counting from 1), interpolating linearly between steps"
+
+        j = math.floor(position - 1)
+        frac = position - 1 - j
+
+        a = self.seq[j % self.steps]
+        if not frac: return a
+
+        if j + 1 >= self.steps and self.profile.interpolate_style == "repeat": return self.seq[-1]
+
+        return a + (self.seq[(j + 1) % self.steps] - a) * frac
+
+    def envelope(self, buckets: int):
+        "Get (mins, maxs) arrays of buckets values each, e.g. for display"
+
+        return envelope(self.seq, buckets)
+
+    def blocks(self, size: Optional[int] = None, block: int = DEFAULT_BLOCK, method: str = "linear",
+               *,
+               quality: int = DEFAULT_QUALITY
+    ):
+        """
+        Lazily render the lane resampled to size values (default: as is) as
+        float32 arrays of up to block values, e.g. to stream a long lane
+        without building it all at once
+        """
+
+        if size is None or size == self.steps:
+            data = self.seq[:]
+            return (data[i:i + block] for i in range(0, len(data), block))
+
+        render = resampler(self.seq, size, method, self.profile.interpolate_style,
+                           self.profile.interpolate_rounding, quality)
+
+        return (render(i, min(i + block, size)) for i in range(0, size, block))
+
+    def __eq__(self, other: SequenceBase|list):
+        "Test if sequences are the same"
+        return self.seq.tolist() == (other if type(other) == list else list(other.seq))
+
+    def __add__(self, other: SequenceBase|list):
+        """
+        Return new sequence consisting of second sequence appended to first.
+        """
+        return self.copy().append(other)
+
+    # String representation
+
+    def __repr__(self):
+        return f'{self.__class__}({self.seq.tolist()})'
+
+    def __str__(self):
+        return f'{self.steps}:{self.hits} {self.seq.tolist()}'
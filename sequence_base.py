@@ -153,6 +153,44 @@ def stretch_seq(seq: list,
 
         return result
 
+def stretch_positions(steps: int, size: int) -> list:
+    """
+    Get the new index of each item when stretching (or shrinking) a list of
+    length steps to size with stretch_seq(). Items removed when shrinking are
+    None.
+    """
+
+    if not size or not steps: return [None for _ in range(steps)]
+
+    if size > steps:
+        num, extra = divmod(size, steps)
+
+        if not extra: return [i * num for i in range(steps)]
+
+        # same euclidean model as stretch_seq: hits are items followed by
+        # fill, misses are single fill values
+        result = []
+        ix = 0
+        for hit in generate_euclidean(steps + extra, steps):
+            if hit:
+                result.append(ix)
+                ix += num
+            else:
+                ix += 1
+
+        return result
+
+    elif size < steps:
+        result = []
+        ix = 0
+        for hit in generate_euclidean(steps, size):
+            result.append(ix if hit else None)
+            ix += hit
+
+        return result
+
+    return list(range(steps))
+
 def shrink_seq(seq: list, size: int, style: int|str = "repeat", istyle: str = "loop", iround: str = "none"):
     "Alias for stretch_seq()"
     return stretch_seq(seq, size, style, istyle, iround)
@@ -0,0 +1,512 @@
+""" sequence_gate.py
+--------------------
+Binary gate sequences packed into the bits of an int
+"""
+
+from __future__ import annotations
+from typing import Optional
+
+# Global defaults
+
+from sequence_defaults import *
+
+# Sequence classes
+
+from sequence_base import SequenceBase
+from sequence import Sequence
+
+# Sequence manipulation functions
+
+from sequence_base import stretch_seq, stretch_positions, generate_euclidean
+
+# Helper functions
+
+from helpers import mod, rounder
+
+# Bit reversal table for a single byte
+
+REVERSE_BYTE = bytes(int(f'{i:08b}'[::-1], 2) for i in range(256))
+
+# Gate functions
+#
+# Step n (counting from 1) is bit n - 1 of the packed int.
+
+def pack_gates(seq: list):
+    "Pack list into int with a bit set for each value above 0"
+
+    bits = 0
+    for ix, v in enumerate(seq):
+        if v > 0: bits |= 1 << ix
+
+    return bits
+
+def unpack_gates(bits: int, steps: int):
+    "Unpack int into list of steps 0s and 1s"
+
+    return [(bits >> ix) & 1 for ix in range(steps)]
+
+def gate_positions(bits: int):
+    "Indices of set bits, lowest first"
+
+    r = []
+    while bits:
+        low = bits & -bits
+        r.append(low.bit_length() - 1)
+        bits ^= low
+
+    return r
+
+def mask_gates(steps: int):
+    "Int with the lowest steps bits set"
+
+    return (1 << steps) - 1
+
+def rotate_gates(bits: int, steps: int, amt: int = 0):
+    "Rotate gates towards later steps by amt, same as shift_seq()"
+
+    if not steps: return bits
+
+    amt %= steps
+    if not amt: return bits
+
+    return ((bits << amt) | (bits >> (steps - amt))) & mask_gates(steps)
+
+def reverse_gates(bits: int, steps: int):
+    "Reverse order of gates using a byte lookup table"
+
+    if not steps: return bits
+
+    nbytes = (steps + 7) // 8
+    rev = bits.to_bytes(nbytes, 'little').translate(REVERSE_BYTE)[::-1]
+
+    return int.from_bytes(rev, 'little') >> (nbytes * 8 - steps)
+
+def loop_gates(bits: int, steps: int, n: int = 2):
+    "Repeat gates n times"
+
+    if not n or not steps: return 0
+
+    # multiplying by 1 + 2^steps + 2^(2*steps) ... lays copies end to end
+    return bits * (mask_gates(steps * n) // mask_gates(steps))
+
+def stretch_gates(bits: int, steps: int, size: int):
+    "Stretch (or shrink) gates to size, leaving new steps empty, same as stretch_seq() with 0 fill"
+
+    remap = stretch_positions(steps, size)
+
+    r = 0
+    for ix in gate_positions(bits):
+        if remap[ix] is not None: r |= 1 << remap[ix]
+
+    return r
+
+def euclidean_gates(steps: int = DEFAULT_STEPS, hits: int = DEFAULT_HITS, shift: int = DEFAULT_SHIFT):
+    "Generate a euclidean rhythm as packed gates"
+
+    return pack_gates(generate_euclidean(steps, hits, shift))
+
+# Class code
+
+class GateSequence(SequenceBase):
+    """
+    Sequence of 0/1 gates packed into the bits of an int.
+
+    Shifting is a rotate, hit counting is a popcount and gate sequences can be
+    combined with |, &, ^ and ~. There is no undo history or options; methods
+    that depend on a style take it as an argument, defaulting to the Sequence
+    default.
+
+    Any value above 0 is stored as a 1.
+
+    Public Attributes
+    -----------------
+    bits: int
+        the gates, step 1 in the lowest bit
+    steps: int
+        number of steps in sequence
+    hits: int
+        number of set gates
+    offset: int
+        shift offset of sequence
+    """
+
+    def __init__(self, sequence: Optional[list|int|SequenceBase] = None):
+        SequenceBase.__init__(self)
+
+        self.bits = 0
+
+        self.set(sequence)
+
+    @classmethod
+    def from_bits(cls, bits: int, steps: int):
+        "Create gate sequence from packed gates"
+
+        return cls().set_bits(bits, steps)
+
+    @classmethod
+    def euclidean(cls, steps: int = DEFAULT_STEPS, hits: int = DEFAULT_HITS, shift: int = DEFAULT_SHIFT):
+        "Create euclidean rhythm"
+
+        return cls.from_bits(euclidean_gates(steps, hits, shift), steps)
+
+    # Storage
+
+    @property
+    def seq(self):
+        "Sequence as a list of 0s and 1s"
+
+        return unpack_gates(self.bits, self.steps)
+
+    @seq.setter
+    def seq(self, sequence: list):
+        self.set_bits(pack_gates(sequence), len(sequence))
+
+    # Sequence creation
+
+    def set(self, sequence: Optional[list|int|SequenceBase] = None):
+        """
+        Set sequence, including getting number of steps and hits, and zeroing offset
+        """
+
+        if not sequence:
+            self.set_bits(0, DEFAULT_STEPS)
+        elif type(sequence) == int:
+            self.set_bits(0, sequence)
+        elif isinstance(sequence, GateSequence):
+            self.set_bits(sequence.bits, sequence.steps)
+        elif isinstance(sequence, SequenceBase):
+            self.seq = sequence.seq
+        else:
+            self.seq = sequence
+
+        self.offset = 0
+
+        return self
+
+    def set_bits(self, bits: int, steps: int):
+        "Set sequence from packed gates"
+
+        self.bits = bits & mask_gates(steps)
+        self.steps = steps
+        self.hits = self.bits.bit_count()
+
+        return self
+
+    def copy(self):
+        """ Copy sequence """
+
+        seq = GateSequence.from_bits(self.bits, self.steps)
+        seq.offset = self.offset
+
+        return seq
+
+    def to_sequence(self, options: Optional[dict] = None):
+        "Convert to Sequence"
+
+        return Sequence(self.seq, options = options)
+
+    # Sequence manipulation
+
+    def _splice(self, start: int, end: int, bits: int = 0, size: int = 0):
+        "Replace steps from index start to end with size gates"
+
+        low = self.bits & mask_gates(start)
+        high = self.bits >> end
+
+        return self.set_bits(low | (bits << start) | (high << (start + size)), self.steps - (end - start) + size)
+
+    def _gates(self, sequence: GateSequence|SequenceBase|list):
+        "Get (bits, steps) of any sequence"
+
+        if isinstance(sequence, GateSequence): return sequence.bits, sequence.steps
+        if isinstance(sequence, SequenceBase): sequence = sequence.seq
+
+        return pack_gates(sequence), len(sequence)
+
+    def insert(self, sequence: GateSequence|SequenceBase|list, step: int = 1):
+        """
+        Insert sequence at step, shifting current sequence.
+        Step 1 is start.
+        """
+
+        # allow for negative steps
+        if step < 0: step = self.steps + step + 1
+
+        bits, size = self._gates(sequence)
+
+        return self._splice(step - 1, step - 1, bits, size)
+
+    def remove(self, *args: int):
+        """
+        Remove part of sequence
+        1 arg: remove length from start/end
+        2 args: remove length starting at beat
+        """
+        start = 1
+        length = 4
+
+        if len(args) == 1:
+            length = args[0]
+
+            if length < 0:
+                start = self.steps + length + 1
+                length = -length
+
+        elif len(args) > 1:
+            start = args[0]
+            length = args[1]
+
+        start -= 1
+
+        return self._splice(start, min(start + length, self.steps))
+
+    def append(self, sequence: GateSequence|SequenceBase|list):
+        """Append sequence to end"""
+
+        return self.insert(sequence, self.steps + 1)
+
+    def prepend(self, sequence: GateSequence|SequenceBase|list):
+        """Prepend sequence to start"""
+
+        return self.insert(sequence)
+
+    def replace(self, sequence: GateSequence|SequenceBase|list, step: int = 1, style: Optional[str] = None):
+        """Replace portion of sequence"""
+
+        style = style or DEFAULT_SEQUENCE_OPTS['replace-style']
+
+        bits, size = self._gates(sequence)
+
+        start = step - 1
+        end = start + size
+
+        if end > self.steps and style == 'trim':
+            size = self.steps - start
+            bits &= mask_gates(size)
+            end = self.steps
+
+        return self._splice(start, min(end, self.steps), bits, size)
+
+    def shift(self, amount: int = DEFAULT_SHIFT, style: Optional[str] = None):
+        """Shift sequence"""
+
+        style = style or DEFAULT_SEQUENCE_OPTS['shift-style']
+
+        if style == 'absolute':
+            amount -= self.offset
+            self.offset = amount
+        else: # relative
+            self.offset += amount
+
+        self.offset = mod(self.offset, self.steps or 1)
+
+        self.bits = rotate_gates(self.bits, self.steps, amount)
+
+        return self
+
+    def stretch_to(self, size: Optional[int] = None, style: Optional[int|str] = -1,
+        *,
+        interpolate_style: Optional[str] = None,
+        interpolate_rounding: Optional[str] = None
+    ):
+        """
+        Stretch sequence to size, creating/removing intermediate values.
+        Stretching with the default fill of 0 works on the bits directly;
+        other styles go through stretch_seq().
+        """
+
+        if not size or size == self.steps: return self
+
+        if style is None or (type(style) == int and style < 0): style = DEFAULT_SEQUENCE_OPTS['stretch-with']
+
+        self.offset = rounder(self.offset * (size / self.steps))
+
+        if style == 0 and type(style) == int:
+            return self.set_bits(stretch_gates(self.bits, self.steps, size), size)
+
+        istyle = interpolate_style or DEFAULT_SEQUENCE_OPTS['interpolate-style']
+        iround = interpolate_rounding or DEFAULT_SEQUENCE_OPTS['interpolate-rounding']
+
+        self.seq = stretch_seq(self.seq, size, style, istyle, iround)
+
+        return self
+
+    def stretch_by(self, mult: Optional[int|float] = 2, style: Optional[int|str] = -1,
+        *,
+        interpolate_style: Optional[str] = None,
+        interpolate_rounding: Optional[str] = None,
+        mult_rounding: Optional[str] = None
+    ):
+        """Stretch sequence by multiplier, creating/removing intermediate values"""
+
+        size = rounder(self.steps * mult, mult_rounding or DEFAULT_SEQUENCE_OPTS['global-rounding'])
+
+        return self.stretch_to(size, style,
+                               interpolate_style = interpolate_style,
+                               interpolate_rounding = interpolate_rounding)
+
+    def shrink_to(self, *args, **kwargs):
+        """Alias for stretch_to()"""
+
+        return self.stretch_to(*args, **kwargs)
+
+    def shrink_by(self, div: Optional[int|float] = 2, *args, **kwargs):
+        """Reverse of stretch_by() (as in will divide instead of multiply)"""
+
+        return self.stretch_by(1 / div, *args, **kwargs)
+
+    def expand_to(self, size: Optional[int], style: Optional[int|str] = -1,
+                  *,
+                  loop_length: Optional[int] = None,
+                  interpolate_rounding: Optional[str] = None
+    ):
+        """Expand sequence to size, adding/removing values at end"""
+
+        if style is None or (type(style) == int and style < 0): style = DEFAULT_SEQUENCE_OPTS['expand-with']
+
+        if size <= self.steps:
+            return self.set_bits(self.bits, size)
+
+        extra = size - self.steps
+
+        match style:
+            case int():
+                fill = mask_gates(extra) if style > 0 else 0
+            case "repeat":
+                fill = mask_gates(extra) if self.steps and self.bits >> (self.steps - 1) else 0
+            case str() if 'loop' in style and not self.steps:
+                # nothing to loop
+                fill = 0
+            case str() if 'loop' in style:
+                if loop_length is None:
+                    loop_length = int(style.split('-')[1]) if 'loop-' in style else DEFAULT_SEQUENCE_OPTS['loop-length']
+
+                # loop the whole sequence at most, as expand_seq() does
+                if not loop_length or loop_length > self.steps: loop_length = self.steps
+
+                loop = self.bits >> (self.steps - loop_length)
+                fill = loop_gates(loop, loop_length, -(-extra // loop_length)) & mask_gates(extra)
+            case _:
+                # interpolating between 0s and 1s has no use; fill with 0
+                fill = 0
+
+        return self.set_bits(self.bits | (fill << self.steps), size)
+
+    def expand_by(self, mult: Optional[int|float] = 2, style: Optional[int|str] = -1,
+                  *,
+                  mult_rounding: Optional[str] = None,
+                  **kwargs
+    ):
+        """Expand sequence by multiplier, adding/removing values at end"""
+
+        size = rounder(self.steps * mult, mult_rounding or DEFAULT_SEQUENCE_OPTS['global-rounding'])
+
+        return self.expand_to(size, style, **kwargs)
+
+    def contract_to(self, *args, **kwargs):
+        """Alias for expand_to()"""
+
+        return self.expand_to(*args, **kwargs)
+
+    def contract_by(self, div: Optional[int|float] = 2, *args, **kwargs):
+        """Reverse of expand_by() (as in will divide instead of multiply)"""
+
+        return self.expand_by(1 / div, *args, **kwargs)
+
+    def reverse(self):
+        """Reverse sequence"""
+
+        self.bits = reverse_gates(self.bits, self.steps)
+
+        return self
+
+    def loop(self, n: int = 2):
+        """Copy sequence n times"""
+
+        self.set_bits(loop_gates(self.bits, self.steps, abs(n)), self.steps * abs(n))
+
+        if n < 0: self.reverse()
+
+        return self
+
+    ## Step/value manipulation
+
+    def _step_index(self, step: int):
+        "Bit index of step, checked like list indexing in Sequence"
+
+        ix = step - 1
+        if not -self.steps <= ix < self.steps: raise IndexError('sequence index out of range')
+
+        return ix % self.steps
+
+    def replace_value(self, value: int, rvalue: int, limit: int = 0):
+        """Replace specified value in sequence with another value"""
+
+        value, rvalue = int(value > 0), int(rvalue > 0)
+
+        if value == rvalue: return self
+
+        # gates to change are the set bits, or the unset bits when replacing 0
+        change = self.bits if value else ~self.bits & mask_gates(self.steps)
+
+        if limit:
+            change &= sum(1 << ix for ix in gate_positions(change)[:limit])
+
+        return self.set_bits(self.bits ^ change, self.steps)
+
+    def replace_step(self, step: int, value: int = 0):
+        """Replace value at step with specified value"""
+
+        bit = 1 << self._step_index(step)
+
+        return self.set_bits(self.bits | bit if value > 0 else self.bits & ~bit, self.steps)
+
+    def remove_step(self, step: int):
+        "Remove step from sequence"
+
+        ix = self._step_index(step)
+
+        return self._splice(ix, ix + 1)
+
+    ## Gate logic
+
+    def _combine(self, other: GateSequence|SequenceBase|list, op):
+        bits, steps = self._gates(other)
+
+        return GateSequence.from_bits(op(self.bits, bits), max(self.steps, steps))
+
+    def __or__(self, other: GateSequence|SequenceBase|list):
+        "Union of gates"
+        return self._combine(other, int.__or__)
+
+    def __and__(self, other: GateSequence|SequenceBase|list):
+        "Intersection of gates"
+        return self._combine(other, int.__and__)
+
+    def __xor__(self, other: GateSequence|SequenceBase|list):
+        "Gates set in only one sequence"
+        return self._combine(other, int.__xor__)
+
+    def __invert__(self):
+        "Flip all gates"
+        return GateSequence.from_bits(~self.bits, self.steps)
+
+    # Sequence querying
+
+    def get_step(self, step: int):
+        "Get value at step"
+
+        return (self.bits >> self._step_index(step)) & 1
+
+    def __iter__(self):
+        """Iterate over steps"""
+
+        bits = self.bits
+        return ((bits >> ix) & 1 for ix in range(self.steps))
+
+    def __eq__(self, other: GateSequence|SequenceBase|list):
+        "Test if sequences are the same"
+
+        if isinstance(other, GateSequence): return (self.bits, self.steps) == (other.bits, other.steps)
+
+        return self.seq == (other if type(other) == list else other.seq)
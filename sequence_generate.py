@@ -0,0 +1,311 @@
+""" sequence_generate.py
+------------------------
+Seeded generation of sequence batches: euclidean rhythms, probability masks,
+random walks and humanized velocities.
+
+Every row of a batch gets its own random generator seeded from the batch seed
+and the row number, so a batch is the same for a given seed whether it is made
+in one process or split across any number of workers.
+"""
+
+from __future__ import annotations
+from typing import Optional
+
+import functools
+import hashlib
+import itertools as its
+import os
+import random
+
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+# Global defaults
+
+from sequence_defaults import DEFAULT_STEPS, DEFAULT_HITS
+
+# Helper functions
+
+from helpers import interpolate
+
+# Sequence classes
+
+from sequence import Sequence
+
+# Sequence manipulation functions
+
+from sequence_base import shift_seq, generate_euclidean
+
+# Defaults
+
+# rows per worker task when generating in parallel
+DEFAULT_CHUNK = 1024
+
+# Seeds
+
+def derive_seed(seed: int, *path: int):
+    "Derive an independent 64 bit seed from seed and a path of ints, e.g. a row number"
+
+    key = ':'.join(str(i) for i in (seed,) + path).encode()
+
+    return int.from_bytes(hashlib.blake2b(key, digest_size = 8).digest(), 'little')
+
+def spawn(seed: int, n: int):
+    "Derive n child seeds, e.g. one per worker or batch"
+
+    return [derive_seed(seed, i) for i in range(n)]
+
+def new_seed():
+    "Random seed for when none is given"
+
+    return int.from_bytes(os.urandom(8), 'little')
+
+# Batch class
+
+class Batch:
+    """
+    Rows of equal length sequences stored in one flat array.
+
+    Public Attributes
+    -----------------
+    data: array
+        row values, row after row
+    rows: int
+        number of rows
+    steps: int
+        steps per row
+    seed: int
+        seed the batch was generated from
+    """
+
+    def __init__(self, data, rows: int, steps: int, seed: Optional[int] = None):
+        self.data = data if isinstance(data, array) else array('q', data)
+        self.rows = rows
+        self.steps = steps
+        self.seed = seed
+
+    @classmethod
+    def from_rows(cls, rows: list[list], seed: Optional[int] = None):
+        "Create Batch from list of equal length rows"
+
+        return cls(array('q', its.chain.from_iterable(rows)), len(rows), len(rows[0]) if rows else 0, seed)
+
+    def row(self, ix: int):
+        "Get row as a list"
+
+        if ix < 0: ix += self.rows
+        if not 0 <= ix < self.rows: raise IndexError('batch index out of range')
+
+        return self.data[ix * self.steps:(ix + 1) * self.steps].tolist()
+
+    def as_list(self):
+        "Get rows as a list of lists"
+
+        return [self.row(i) for i in range(self.rows)]
+
+    def to_sequences(self, cls: type = Sequence, options: Optional[dict] = None):
+        "Get rows as a list of sequences"
+
+        return [cls(self.row(i), options = options) for i in range(self.rows)]
+
+    def as_dict(self, labels: Optional[list] = None, cls: type = Sequence, options: Optional[dict] = None):
+        "Get rows as a dict of label-sequence pairs (labels default to row numbers)"
+
+        return dict(zip(labels or range(self.rows), self.to_sequences(cls, options)))
+
+    def __len__(self):
+        return self.rows
+
+    def __getitem__(self, ix: int):
+        return self.row(ix)
+
+    def __iter__(self):
+        return (self.row(i) for i in range(self.rows))
+
+    def __repr__(self):
+        return f'{self.__class__}({self.rows}x{self.steps}, seed={self.seed})'
+
+# Row generators
+# each takes a Random and the keyword arguments of its batch function
+
+@functools.lru_cache(maxsize = 1024)
+def _euclidean(steps: int, hits: int):
+    return tuple(generate_euclidean(steps, hits))
+
+def _euclidean_row(r: random.Random, steps: int, hits: int|tuple, shift: int|bool|None, value: int):
+    if type(hits) != int: hits = r.randint(*hits)
+    if shift is True: shift = r.randrange(steps) if steps else 0
+
+    row = list(_euclidean(steps, hits))
+    if shift: row = shift_seq(row, shift)
+
+    return [value if v else 0 for v in row] if value != 1 else row
+
+def _probability_row(r: random.Random, steps: int, probs: tuple, value: int):
+    rand = r.random
+
+    return [value if rand() < p else 0 for p in its.islice(its.cycle(probs), steps)]
+
+def _walk_row(r: random.Random, steps: int, start: int|tuple, moves: tuple, low: int, high: int,
+              every: int, rounding: str):
+    if not steps: return []
+    if type(start) != int: start = r.randint(*start)
+
+    # anchors walk by random moves, reflecting off the bounds
+    count = -(-steps // every) + (1 if every > 1 else 0)
+
+    def step(v, move):
+        v += move
+        if v < low: v = min(2 * low - v, high)
+        elif v > high: v = max(2 * high - v, low)
+        return v
+
+    anchors = list(its.accumulate(r.choices(moves, k = count - 1), step, initial = start))
+
+    if every == 1: return anchors
+
+    row = []
+    for a, b in zip(anchors, anchors[1:]):
+        row.append(a)
+        row += interpolate(a, b, every - 1, rounding_style = rounding)
+
+    return row[:steps]
+
+def _humanize_row(r: random.Random, row: list, amount: int, low: int, high: int):
+    offsets = r.choices(range(-amount, amount + 1), k = len(row))
+
+    return [min(max(v + o, low), high) if v else 0 for v, o in zip(row, offsets)]
+
+def _mask_row(r: random.Random, row: list, probs: tuple):
+    rand = r.random
+
+    return [v if v and rand() < p else 0 for v, p in zip(row, its.cycle(probs))]
+
+# Batch generation
+
+def _rows(func, seed: int, start: int, stop: int, kwargs: dict, inputs: Optional[list] = None):
+    "Generate rows start to stop, each from its own derived seed"
+
+    if inputs is None:
+        return [func(random.Random(derive_seed(seed, i)), **kwargs) for i in range(start, stop)]
+
+    return [func(random.Random(derive_seed(seed, i)), row, **kwargs) for i, row in zip(range(start, stop), inputs)]
+
+def generate(func, n: int, seed: Optional[int] = None, workers: int = 1, chunk: int = DEFAULT_CHUNK,
+             inputs: Optional[Batch] = None, **kwargs):
+    """
+    Generate a Batch of n rows with row generator func(Random, [row,] **kwargs).
+
+    With more than one worker, rows are generated in chunks in a process pool.
+    The result only depends on the seed, not on workers or chunk.
+    """
+
+    if seed is None: seed = new_seed()
+
+    if inputs is not None:
+        n = inputs.rows
+        rows_in = inputs.as_list()
+
+    def part(start):
+        stop = min(start + chunk, n)
+        return (func, seed, start, stop, kwargs, None if inputs is None else rows_in[start:stop])
+
+    if workers <= 1 or n <= chunk:
+        rows = _rows(func, seed, 0, n, kwargs, None if inputs is None else rows_in)
+    else:
+        with ProcessPoolExecutor(workers) as pool:
+            rows = list(its.chain.from_iterable(pool.map(_rows, *zip(*[part(s) for s in range(0, n, chunk)]))))
+
+    return Batch.from_rows(rows, seed)
+
+def euclidean(n: int, steps: int = DEFAULT_STEPS, hits: int|tuple = DEFAULT_HITS,
+              *,
+              shift: int|bool = False,
+              value: int = 1,
+              seed: Optional[int] = None,
+              workers: int = 1
+    ):
+    """
+    Batch of euclidean rhythms.
+
+    Parameters
+    ----------
+    hits
+        hits per row, or a (min, max) tuple to pick a random number per row
+    shift
+        shift for every row, or True for a random shift per row
+    value
+        value of hits
+    """
+
+    return generate(_euclidean_row, n, seed, workers, steps = steps, hits = hits, shift = shift, value = value)
+
+def probability(n: int, steps: int = DEFAULT_STEPS, probs: float|list = 0.5,
+                *,
+                value: int = 1,
+                seed: Optional[int] = None,
+                workers: int = 1
+    ):
+    """
+    Batch of random hits, each step a hit with a probability. probs can be a
+    single probability or a list repeated along the row.
+    """
+
+    probs = (probs,) if type(probs) in (int, float) else tuple(probs)
+
+    return generate(_probability_row, n, seed, workers, steps = steps, probs = probs, value = value)
+
+def random_walk(n: int, steps: int = DEFAULT_STEPS, start: int|tuple = 60,
+                *,
+                moves: tuple = (-2, -1, 0, 1, 2),
+                low: int = 0,
+                high: int = 127,
+                every: int = 1,
+                rounding: str = 'auto',
+                seed: Optional[int] = None,
+                workers: int = 1
+    ):
+    """
+    Batch of random walks, e.g. for pitch lanes.
+
+    Parameters
+    ----------
+    start
+        start value, or a (min, max) tuple to pick one per row
+    moves
+        possible moves per step, picked with equal probability
+    low, high
+        bounds; moves past them reflect back
+    every
+        walk every n steps and interpolate in between
+    rounding
+        rounding of interpolated values: "auto", "up" or "down" (batches
+        hold ints, so there is no "none")
+    """
+
+    if rounding not in ('auto', 'up', 'down'): raise ValueError(f'Invalid rounding: {rounding}')
+
+    return generate(_walk_row, n, seed, workers, steps = steps, start = start, moves = tuple(moves),
+                    low = low, high = high, every = max(every, 1), rounding = rounding)
+
+def humanize(batch: Batch, amount: int = 8,
+             *,
+             low: int = 1,
+             high: int = 127,
+             seed: Optional[int] = None,
+             workers: int = 1
+    ):
+    "Batch with random offsets of up to amount added to non-zero values, e.g. velocities"
+
+    return generate(_humanize_row, 0, seed, workers, inputs = batch, amount = amount, low = low, high = high)
+
+def mask(batch: Batch, probs: float|list = 0.5,
+         *,
+         seed: Optional[int] = None,
+         workers: int = 1
+    ):
+    "Batch keeping each non-zero value with a probability. probs can be a list repeated along the row"
+
+    probs = (probs,) if type(probs) in (int, float) else tuple(probs)
+
+    return generate(_mask_row, 0, seed, workers, inputs = batch, probs = probs)
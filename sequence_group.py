@@ -6,8 +6,12 @@ Functions and classes for managing collections of sequences
 from __future__ import annotations
 from typing import Optional
 
+import contextlib
+
+from sequence_base import SequenceBase
 from sequence import Sequence
 from opts import OptsMixin
+from sequence_profile import ProfileMixin
 
 # Defaults
 
@@ -31,7 +35,7 @@ def list_type(l: list):
 
 # Class definition
 
-class SequenceGroup(OptsMixin):
+class SequenceGroup(ProfileMixin, OptsMixin):
     """
     A group of sequences that works as a unit
     """
@@ -47,7 +51,7 @@ class SequenceGroup(OptsMixin):
         self.labels = {}
 
         # self._opts pulled in by OptsMixin
-        OptsMixin.__init__(DEFAULT_SEQUENCEGROUP_OPTS | DEFAULT_SEQUENCE_OPTS)
+        OptsMixin.__init__(self, DEFAULT_SEQUENCEGROUP_OPTS | DEFAULT_SEQUENCE_OPTS)
 
         self.setopts(options)
 
@@ -63,45 +67,105 @@ class SequenceGroup(OptsMixin):
             If dict, a dictionary of label-sequence pairs to add
             If list, a sequence or list of sequences to add.
             If Sequence, a sequence to add
-        labels: [list|str]
+        labels: [list|str|int]
             If seqs is passed a list, this allows labels to be passed as well.
-            If seqs is passed a single sequence, this is the sequence label
+            If seqs is passed a single sequence, this is the sequence label,
+            replacing any sequence with the same label (as with group[label] = seq).
             By default labels will just be increasing numbers.
         """
 
-        if type(seqs) is Sequence:
-            if not labels or type(labels) != str:
+        if isinstance(seqs, SequenceBase):
+            if labels is None or type(labels) == list:
+                # next number not already used as a label
                 labels = len(self.seqs)
+                while labels in self.labels: labels += 1
+
+            self._set(labels, seqs)
+
+        elif type(seqs) == dict:
+            # get labels and seqs from dict
+            return self.add(list(seqs.values()), list(seqs))
+
+        elif type(seqs) == list and seqs:
+            if list_has_type((SequenceBase, list), seqs):
+                # list of Sequences or lists
+                labels = labels if type(labels) == list else []
+
+                for ix, seq in enumerate(seqs):
+                    self.add(seq, labels[ix] if ix < len(labels) else None)
+
+            elif list_has_type(int, seqs):
+                # a single sequence as a list
+                self.add(self._sequence(seqs), labels)
+
+            else:
+                raise TypeError('Can only add a list of Sequences, lists or ints')
+
+        self._update()
+
+        return self
+
+    def _sequence(self, seq: list):
+        "Create Sequence with the group's sequence options"
+
+        return Sequence(seq, options = {k: self._opts[k] for k in DEFAULT_SEQUENCE_OPTS if k in self._opts})
+
+    def _set(self, label, seq: SequenceBase|list):
+        "Add sequence with label, replacing any sequence with the same label"
+
+        if type(seq) == list: seq = self._sequence(seq)
+
+        if label in self.labels:
+            self.seqs[self.labels[label]] = seq
         else:
-            if type(seqs) == dict:
-                # get labels and seqs from dict
-                l, s = list(zip(*seqs.items()))
-
-                # add labels and seqs as lists
-                return self.add(list(s), list(l))
-
-            elif type(seqs) == list:
-                match list_type(seqs):
-                    # Unfortunately we need to namespace these or it won't work.
-                    # Not the end of the world, but doesn't look nice
-                    case __main__.Sequence:
-                        # list of Sequences
-                        pass
-                    case __builtins__.list:
-                        # list of lists
-                        pass
-                    case __builtins__.int:
-                        # a single sequence as a list: convert to Sequence
-                        pass
+            self.labels[label] = len(self.seqs)
+            self.seqs.append(seq)
+
+    def _update(self):
+        "Update steps and hits after sequences change"
+
+        self.steps = max((len(s) for s in self.seqs), default = 0)
+        self.hits = sum(s.hits for s in self.seqs)
+
+    @contextlib.contextmanager
+    def transaction(self):
+        """
+        Transaction across the whole group: every sequence gets its own
+        transaction (see Sequence.transaction()), so each records one undo
+        entry. If an exception escapes, every sequence is rolled back, along
+        with sequences added or replaced in the group.
+        """
+
+        seqs, labels = self.seqs[:], dict(self.labels)
+
+        # sequence types without transactions are rolled back from a copy
+        saved = [(s, s.seq[:]) for s in seqs if not hasattr(s, 'transaction')]
+
+        try:
+            with contextlib.ExitStack() as stack:
+                for s in seqs:
+                    if hasattr(s, 'transaction'): stack.enter_context(s.transaction())
+
+                yield self
+        except BaseException:
+            self.seqs, self.labels = seqs, labels
+            for s, seq in saved: s.set(seq)
+            raise
+        finally:
+            self._update()
 
     def __getitem__(self, label):
         """
         Bracket notation gets sequence with label
         """
-        pass
+        return self.seqs[self.labels[label]]
 
-    def __setitem(self, label, seq):
+    def __setitem__(self, label, seq: SequenceBase|list):
         """
         Bracket notation for setting sequence at label
         """
-        pass
+        self._set(label, seq)
+        self._update()
+
+    def __contains__(self, label):
+        return label in self.labels
@@ -0,0 +1,138 @@
+""" sequence_polymeter.py
+-------------------------
+Lazy views over sequences of different lengths played together
+"""
+
+from __future__ import annotations
+from typing import Optional
+
+import itertools as its
+import math
+
+# Sequence classes
+
+from sequence import Sequence
+from sequence_group import SequenceGroup
+
+# Class code
+
+class Polymeter(SequenceGroup):
+    """
+    Group of sequences of different lengths, each looping on its own.
+
+    Nothing is looped out to the combined length: the value of a lane at any
+    global step is found by indexing the lane modulo its length, and combined
+    steps are built as they are iterated. Lanes are held by reference, so
+    edits to a lane show up in the view.
+
+    Steps count from 1 and continue past the period, so step period + 1 is
+    step 1 again.
+
+    Public Attributes
+    -----------------
+    seqs: list
+        the lanes, in order added
+    labels: dict
+        label -> lane index
+    steps: int
+        period (least common multiple of lane lengths) when lanes were last
+        added; see period for the current value
+    """
+
+    @property
+    def period(self):
+        "Global steps before every lane lines up again"
+
+        return math.lcm(*(len(s) for s in self.seqs)) if self.seqs else 0
+
+    def _update(self):
+        "Update steps and hits after lanes change"
+
+        self.steps = self.period
+        self.hits = sum(s.hits for s in self.seqs)
+
+    def _lane(self, lane):
+        "Get lane by label"
+
+        return self.seqs[self.labels[lane]]
+
+    # Lookup
+
+    def value(self, lane, step: int):
+        "Value of lane (by label) at global step"
+
+        s = self._lane(lane)
+
+        return s.get_step((step - 1) % len(s) + 1)
+
+    def get_step(self, step: int):
+        "Tuple of every lane's value at global step"
+
+        return tuple(s.get_step((step - 1) % len(s) + 1) for s in self.seqs)
+
+    def __call__(self, step: int):
+        """
+        Alias for get_step()
+        """
+        return self.get_step(step)
+
+    # Windows
+
+    def lane_window(self, lane, start: int = 1, length: Optional[int] = None):
+        "Values of lane (by label) for length global steps from start, as a list (default: one period)"
+
+        s = self._lane(lane).as_list()
+        if length is None: length = self.period
+        if not s or length <= 0: return []
+
+        n = len(s)
+        ix = (start - 1) % n
+
+        # rotate to start, then repeat to cover length
+        r = s[ix:] + s[:ix]
+
+        return (r * -(-length // n))[:length]
+
+    def lanes(self, start: int = 1, length: Optional[int] = None):
+        "Dict of label-list pairs for length global steps from start (default: one period)"
+
+        return {label: self.lane_window(label, start, length) for label in self.labels}
+
+    def window(self, start: int = 1, length: Optional[int] = None):
+        "List of combined step tuples for length global steps from start (default: one period)"
+
+        return list(zip(*self.lanes(start, length).values()))
+
+    def to_sequences(self, start: int = 1, length: Optional[int] = None, cls: type = Sequence):
+        "Dict of label-Sequence pairs for a window, e.g. to render it"
+
+        return {label: cls(l) for label, l in self.lanes(start, length).items()}
+
+    # Iteration
+
+    def iter_steps(self, start: int = 1, length: Optional[int] = None):
+        "Lazily iterate over combined step tuples from start (default: one period; 0 or less: forever)"
+
+        if length is None: length = self.period
+        if not self.seqs: return iter(())
+
+        cycles = []
+        for s in self.seqs:
+            l = s.as_list()
+            ix = (start - 1) % len(l) if l else 0
+            cycles.append(its.cycle(l[ix:] + l[:ix]))
+
+        steps = zip(*cycles)
+
+        return steps if length <= 0 else its.islice(steps, length)
+
+    def __iter__(self):
+        """Iterate over combined step tuples for one period"""
+        return self.iter_steps()
+
+    def __len__(self):
+        """Period"""
+        return self.period
+
+    def __repr__(self):
+        return f'{self.__class__}({ {label: len(self._lane(label)) for label in self.labels} })'
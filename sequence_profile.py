@@ -0,0 +1,214 @@
+""" sequence_profile.py
+-----------------------
+Compiled option profiles for sequences.
+
+A profile is an immutable object holding a set of options already parsed into
+the values and strategy functions sequence methods need, so methods don't have
+to look up and parse options on every call. Profiles are cached by option set,
+so sequences with the same options share a single profile (up to
+PROFILE_CACHE_SIZE option sets are kept).
+"""
+
+from __future__ import annotations
+from typing import Optional
+
+import functools
+
+from types import MappingProxyType
+
+# Global defaults
+
+from sequence_defaults import *
+
+# Helper functions
+
+from helpers import rounder, interpolate
+
+# Sequence manipulation functions
+
+from sequence_base import SequenceBase, stretch_seq, expand_seq
+
+# Most option sets kept compiled at once
+PROFILE_CACHE_SIZE = 256
+
+# Helper functions
+
+def parse_expand_style(style: int|str, loop_length: Optional[int] = None, default_length: int = 0):
+    """
+    Parse expand style to (style, loop length) for expand_seq().
+
+    'loop-N' styles loop the last N values. Plain 'loop' uses loop_length,
+    or default_length if loop_length is None.
+    """
+
+    if type(style) == str and 'loop' in style:
+        if loop_length is None:
+            loop_length = int(style.split('-')[1]) if 'loop-' in style else default_length
+
+        return 'loop', loop_length
+
+    return style, loop_length
+
+def _delete_fill(value: int):
+    "Delete strategy replacing the step with a value"
+
+    def delete(seq, step: int):
+        old = seq.seq[step - 1]
+        seq.seq[step - 1] = value
+        seq.hits += (1 if value > 0 else 0) - (1 if old > 0 else 0)
+
+        return seq
+
+    return delete
+
+def _delete_cut(seq, step: int):
+    "Delete strategy removing the step"
+
+    return SequenceBase.remove_step(seq, step)
+
+def delete_strategy(style: int|str):
+    "Get delete function (seq, step) for delete style"
+
+    match style:
+        case int():
+            return _delete_fill(0 if style < 0 else style)
+        case "cut":
+            return _delete_cut
+        case _:
+            return lambda seq, step: seq
+
+def compile_options(options: dict):
+    """
+    Get the shared OptionProfile for options, compiling it on first use.
+    Options with unhashable values get a profile of their own.
+    """
+
+    try:
+        key = tuple(sorted(options.items()))
+        hash(key)
+    except TypeError:
+        return OptionProfile(options)
+
+    return _cached_profile(key)
+
+@functools.lru_cache(maxsize = PROFILE_CACHE_SIZE)
+def _cached_profile(key: tuple):
+    "Compile option items, keeping the PROFILE_CACHE_SIZE most recent"
+
+    return OptionProfile(dict(key))
+
+# Profile class
+
+class OptionProfile:
+    """
+    Immutable compiled set of sequence options.
+
+    Public Attributes
+    -----------------
+    options: mapping
+        read-only view of all options
+    shift_style, stretch_with, expand_with, loop_length, replace_style,
+    interpolate_style, interpolate_rounding, global_rounding, delete_style:
+        option values
+    expand_style: tuple
+        (style, loop length) parsed from expand-with
+    delete: function
+        delete(seq, step) removes a step according to delete-style
+    """
+
+    __slots__ = ('options', 'shift_style', 'stretch_with', 'expand_with', 'expand_style', 'loop_length',
+                 'replace_style', 'interpolate_style', 'interpolate_rounding', 'global_rounding',
+                 'delete_style', 'delete', 'round', 'interpolate')
+
+    def __init__(self, options: dict):
+        o = DEFAULT_SEQUENCE_OPTS | dict(options)
+
+        setattr_ = object.__setattr__
+        setattr_(self, 'options', MappingProxyType(o))
+
+        setattr_(self, 'shift_style', o['shift-style'])
+        setattr_(self, 'stretch_with', o['stretch-with'])
+        setattr_(self, 'expand_with', o['expand-with'])
+        setattr_(self, 'loop_length', o['loop-length'])
+        setattr_(self, 'replace_style', o['replace-style'])
+        setattr_(self, 'interpolate_style', o['interpolate-style'])
+        setattr_(self, 'interpolate_rounding', o['interpolate-rounding'])
+        setattr_(self, 'global_rounding', o['global-rounding'])
+        setattr_(self, 'delete_style', o['delete-style'])
+
+        setattr_(self, 'expand_style', parse_expand_style(o['expand-with'], None, o['loop-length']))
+        setattr_(self, 'delete', delete_strategy(o['delete-style']))
+        setattr_(self, 'round', functools.partial(rounder, style = o['global-rounding']))
+        setattr_(self, 'interpolate', functools.partial(interpolate, rounding_style = o['interpolate-rounding']))
+
+    def __setattr__(self, name, value):
+        raise AttributeError('OptionProfile is immutable')
+
+    def __delattr__(self, name):
+        raise AttributeError('OptionProfile is immutable')
+
+    # Strategies
+
+    def stretch(self, seq: list, size: int, style: Optional[int|str] = None,
+                istyle: Optional[str] = None, iround: Optional[str] = None, func = stretch_seq):
+        """
+        Stretch list with profile options, unless given (a negative int style
+        means the option). func is the stretch function, for storage other
+        than lists.
+        """
+
+        if style is None or (type(style) == int and style < 0): style = self.stretch_with
+
+        return func(seq, size, style, istyle or self.interpolate_style, iround or self.interpolate_rounding)
+
+    def expand(self, seq: list, size: int, style: Optional[int|str] = None,
+               loop_length: Optional[int] = None, iround: Optional[str] = None, func = expand_seq):
+        """
+        Expand list with profile options, unless given (a negative int style
+        means the option). func is the expand function, for storage other
+        than lists.
+        """
+
+        if style is None or (type(style) == int and style < 0):
+            style, looplen = self.expand_style
+            if loop_length is not None: looplen = loop_length
+        else:
+            style, looplen = parse_expand_style(style, loop_length, self.loop_length)
+
+        # an explicit loop length of 0 loops the entire sequence
+        if style == 'loop' and loop_length == 0: looplen = len(seq)
+
+        return func(seq, size, style, looplen, iround or self.interpolate_rounding)
+
+    # Querying
+
+    def __getitem__(self, name: str):
+        return self.options[name]
+
+    def __repr__(self):
+        return f'{self.__class__}({dict(self.options)})'
+
+# Mixin
+
+class ProfileMixin:
+    """
+    Gives an OptsMixin class a compiled profile of its options. The profile is
+    compiled when first needed and dropped whenever setopts() is called, so
+    options should only be changed through setopts().
+    """
+
+    _profile = None
+
+    @property
+    def profile(self):
+        "Shared compiled OptionProfile for current options"
+
+        p = self._profile
+        if p is None: p = self._profile = compile_options(self._opts)
+
+        return p
+
+    def setopts(self, *args, **kwargs):
+        self._profile = None
+
+        return super().setopts(*args, **kwargs)
@@ -0,0 +1,345 @@
+""" sequence_sparse.py
+----------------------
+Sequences stored as sorted hit positions for long, mostly empty lanes
+"""
+
+from __future__ import annotations
+from typing import Optional
+
+from array import array
+from bisect import bisect_left
+
+# Global defaults
+
+from sequence_defaults import *
+
+# Helper functions
+
+from helpers import mod, rounder
+
+# Sequence classes
+
+from sequence_base import SequenceBase
+from sequence import Sequence
+
+# Sequence manipulation functions
+
+from sequence_base import stretch_positions, generate_euclidean
+
+# Helper functions
+
+def sparsify(seq: list):
+    "Get (positions, values) of non-zero items in list, positions counting from 0"
+
+    positions = array('q')
+    values = []
+    for ix, v in enumerate(seq):
+        if v:
+            positions.append(ix)
+            values.append(v)
+
+    return positions, values
+
+def densify(steps: int, positions, values: list):
+    "Get list of length steps with values at positions and 0 elsewhere"
+
+    seq = [0 for _ in range(steps)]
+    for ix, v in zip(positions, values): seq[ix] = v
+
+    return seq
+
+# Class code
+
+class SparseSequence(Sequence):
+    """
+    Sequence that only stores its non-zero steps, as a sorted array of
+    positions (counting from 0) and a matching list of values.
+
+    Works anywhere a Sequence does. Shifting, stretching with an int fill of 0,
+    and step access work on the stored hits only. Other operations build the
+    full list through the seq attribute, which is cached until the next
+    change.
+
+    Public Attributes
+    -----------------
+    positions: array
+        indices of non-zero steps (counting from 0)
+    values: list
+        values at positions
+    """
+
+    def __init__(self, sequence: Optional[list|int|SequenceBase] = None,
+                 *,
+                 options: Optional[dict] = None
+    ):
+        self.positions = array('q')
+        self.values = []
+        self._dense = None
+
+        Sequence.__init__(self, sequence, options = options)
+
+    @classmethod
+    def euclidean(cls, steps: int = DEFAULT_STEPS, hits: int = DEFAULT_HITS, shift: int = DEFAULT_SHIFT,
+                  *,
+                  options: Optional[dict] = None
+    ):
+        "Create sparse euclidean rhythm"
+
+        seq = cls(options = options)
+
+        positions = array('q', [ix for ix, hit in enumerate(generate_euclidean(steps, hits, shift)) if hit])
+
+        return seq.set_sparse(steps, positions, [1 for _ in positions])
+
+    # Storage
+
+    @property
+    def seq(self):
+        "Sequence as a list, built on demand"
+
+        if self._dense is None: self._dense = densify(self.steps, self.positions, self.values)
+
+        return self._dense
+
+    @seq.setter
+    def seq(self, sequence: list):
+        self.positions, self.values = sparsify(sequence)
+        self.steps = len(sequence)
+        self.hits = sum([1 if v > 0 else 0 for v in self.values])
+        self._dense = None
+
+    # Sequence creation
+
+    def set(self, sequence: Optional[list|int|SequenceBase] = None):
+        """
+        Set sequence, including getting number of steps and hits, and zeroing offset
+        """
+
+        if not sequence:
+            # blank sequences need no storage
+            return self.set_sparse(DEFAULT_STEPS, [], [])
+        elif type(sequence) == int:
+            return self.set_sparse(sequence, [], [])
+        elif isinstance(sequence, SparseSequence):
+            return self.set_sparse(sequence.steps, sequence.positions, sequence.values)
+        elif isinstance(sequence, SequenceBase):
+            self.seq = sequence.seq
+        else:
+            self.seq = sequence
+
+        return self
+
+    def set_sparse(self, steps: int, positions, values: list):
+        """
+        Set sequence from length and sorted positions (counting from 0) and
+        values of non-zero steps
+        """
+
+        self.positions = array('q', positions)
+        self.values = list(values)
+        self.steps = steps
+        self.hits = sum([1 if v > 0 else 0 for v in self.values])
+        self._dense = None
+
+        return self
+
+    def _index(self, step: int):
+        "Convert step to position, allowing negative steps like list indices"
+
+        ix = step - 1
+
+        if not -self.steps <= ix < self.steps: raise IndexError('sequence index out of range')
+
+        return ix % self.steps
+
+    def _register_set(self):
+        "Register current state with undo manager"
+
+        if not self._transaction: self._undomgr.register(self.set_sparse, self.steps, self.positions[:], self.values[:])
+
+    def copy(self):
+        """
+        Create copy of sequence.
+        """
+
+        return SparseSequence(self, options = self._opts)
+
+    # Sequence manipulation
+
+    def shift(self, amount: int = DEFAULT_SHIFT, style: Optional[str] = None):
+        """Shift sequence"""
+
+        # register original with undo manager
+        self._undomgr.register(self.shift, -amount, "relative")
+
+        style = style or self.profile.shift_style
+
+        if style == 'absolute':
+            amount -= self.offset
+            self.offset = amount
+        else: # relative
+            self.offset += amount
+
+        # wrap offset
+        self.offset = mod(self.offset, self.steps)
+
+        if self.positions and amount % self.steps:
+            # offset positions; they stay sorted apart from a single wrap point
+            positions = [(p + amount) % self.steps for p in self.positions]
+            split = positions.index(min(positions))
+
+            self.positions = array('q', positions[split:] + positions[:split])
+            self.values = self.values[split:] + self.values[:split]
+            self._dense = None
+
+        return self
+
+    def stretch_to(self, size: Optional[int] = None, style: Optional[int|str] = -1,
+        *,
+        interpolate_style: Optional[str] = None,
+        interpolate_rounding: Optional[str] = None
+    ):
+        """
+        Stretch sequence to size, creating/removing intermediate values.
+
+        Stretching with a fill value of 0 moves the stored hits only. Other
+        styles stretch the full list.
+        """
+
+        if not size: return self
+
+        fill = self.profile.stretch_with if style is None or (type(style) == int and style < 0) else style
+
+        if fill != 0 or type(fill) != int or size == self.steps:
+            return Sequence.stretch_to(self, size, style,
+                                       interpolate_style = interpolate_style,
+                                       interpolate_rounding = interpolate_rounding)
+
+        remap = stretch_positions(self.steps, size)
+
+        positions, values = array('q'), []
+        for p, v in zip(self.positions, self.values):
+            if remap[p] is not None:
+                positions.append(remap[p])
+                values.append(v)
+
+        # register original with Historian
+        self._register_set()
+
+        # adjust offset and save result
+        self.offset = rounder(self.offset * (size / self.steps))
+        self.set_sparse(size, positions, values)
+
+        return self
+
+    ## Step/value manipulation
+
+    def replace_value(self, value, rvalue, limit: int = 0):
+        """Replace specified value in sequence with another value"""
+
+        if not value:
+            # zeros are not stored so replace in full list
+            self._register_set()
+            seq = self.seq[:]
+            count = 0
+            for ix in range(self.steps):
+                if seq[ix] == 0:
+                    seq[ix] = rvalue
+                    count += 1
+
+                if limit != 0 and count == limit: break
+
+            self.seq = seq
+
+            return self
+
+        # register with Historian
+        self._register_set()
+
+        count = 0
+        positions, values = array('q'), []
+        for p, v in zip(self.positions, self.values):
+            if v == value and not (limit != 0 and count == limit):
+                v = rvalue
+                count += 1
+
+            if v:
+                positions.append(p)
+                values.append(v)
+
+        self.set_sparse(self.steps, positions, values)
+
+        return self
+
+    def replace_step(self, step, value):
+        """Replace value at step with specified value"""
+
+        ix = self._index(step)
+        i = bisect_left(self.positions, ix)
+        found = i < len(self.positions) and self.positions[i] == ix
+        old = self.values[i] if found else 0
+
+        # register with Historian
+        self._undomgr.register(self.replace_step, step, old)
+
+        if found:
+            if value:
+                self.values[i] = value
+            else:
+                del self.positions[i]
+                del self.values[i]
+        elif value:
+            self.positions.insert(i, ix)
+            self.values.insert(i, value)
+
+        self.hits += (1 if value > 0 else 0) - (1 if old > 0 else 0)
+        self._dense = None
+
+        return self
+
+    def remove_step(self, step: int = 1, style: Optional[int|str] = None):
+        "Remove item at step"
+
+        if style is None: style = self.profile.delete_style
+
+        match style:
+            case int():
+                # replace_step registers with Historian
+                return self.replace_step(step, 0 if style < 0 else style)
+            case "cut":
+                self._register_set()
+
+                ix = self._index(step)
+                i = bisect_left(self.positions, ix)
+
+                positions = self.positions[:i]
+                values = self.values[:i]
+                for p, v in zip(self.positions[i:], self.values[i:]):
+                    if p != ix:
+                        positions.append(p - 1)
+                        values.append(v)
+
+                self.set_sparse(self.steps - 1, positions, values)
+
+        return self
+
+    # Sequence querying
+
+    def get_step(self, step: int):
+        "Get value at step"
+
+        ix = self._index(step)
+        i = bisect_left(self.positions, ix)
+
+        return self.values[i] if i < len(self.positions) and self.positions[i] == ix else 0
+
+    def __iter__(self):
+        """Iterate over steps without building the full list"""
+
+        last = 0
+        for p, v in zip(self.positions, self.values):
+            yield from (0 for _ in range(p - last))
+            yield v
+            last = p + 1
+
+        yield from (0 for _ in range(self.steps - last))
@@ -0,0 +1,189 @@
+""" sequence_versioned.py
+-------------------------
+Sequences that can be read from one thread while being edited in another
+"""
+
+from __future__ import annotations
+from typing import Optional
+
+import contextlib
+import functools
+import threading
+
+# Sequence classes
+
+from sequence_base import SequenceBase
+from sequence import Sequence
+
+# Snapshot class
+
+class SequenceSnapshot:
+    """
+    Immutable view of a sequence at one version.
+
+    Public Attributes
+    -----------------
+    version: int
+        version number, increasing with every published change
+    seq: tuple
+        the sequence values
+    steps, hits, offset: int
+        as on the sequence when the snapshot was published
+    """
+
+    __slots__ = ('version', 'seq', 'steps', 'hits', 'offset', '__weakref__')
+
+    def __init__(self, version: int, seq: tuple, steps: int, hits: int, offset: int):
+        setattr_ = object.__setattr__
+        setattr_(self, 'version', version)
+        setattr_(self, 'seq', seq)
+        setattr_(self, 'steps', steps)
+        setattr_(self, 'hits', hits)
+        setattr_(self, 'offset', offset)
+
+    def __setattr__(self, name, value):
+        raise AttributeError('SequenceSnapshot is immutable')
+
+    def as_list(self):
+        "Get sequence as a new list"
+        return list(self.seq)
+
+    def get_step(self, step: int):
+        "Get value at step"
+        return self.seq[step - 1]
+
+    def __getitem__(self, step: int):
+        return self.get_step(step)
+
+    def __len__(self):
+        return self.steps
+
+    def __iter__(self):
+        return iter(self.seq)
+
+    def __repr__(self):
+        return f'{self.__class__}({self.version}, {list(self.seq)})'
+
+# Helper functions
+
+def _writer(func):
+    """
+    Make method a writer: writers hold the sequence's write lock and the
+    outermost writer publishes a new snapshot when it finishes
+    """
+
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            self._depth += 1
+
+            try:
+                return func(self, *args, **kwargs)
+            finally:
+                self._depth -= 1
+                if not self._depth: self._publish()
+
+    return wrapper
+
+# Class code
+
+class VersionedSequence(Sequence):
+    """
+    Sequence with copy-on-write snapshots for concurrent reading and editing.
+
+    Every change publishes a new immutable SequenceSnapshot by replacing a
+    single reference, so readers never see a half finished edit and never
+    wait for a writer. Iterating, indexing and len() read the current
+    snapshot. To read several values consistently, take one snapshot() and
+    read from it.
+
+    Writers are serialized with a lock. Each edit copies the sequence once to
+    publish it. Old snapshots are freed as soon as no reader holds them.
+    """
+
+    def __init__(self, sequence: Optional[list|int|SequenceBase] = None,
+                 *,
+                 options: Optional[dict] = None
+    ):
+        self._lock = threading.RLock()
+        self._depth = 0
+        self._version = 0
+        self._snapshot = SequenceSnapshot(0, (), 0, 0, 0)
+
+        Sequence.__init__(self, sequence, options = options)
+
+    def _publish(self):
+        "Publish current state as a new snapshot"
+
+        self._version += 1
+        self._snapshot = SequenceSnapshot(self._version, tuple(self.seq), self.steps, self.hits, self.offset)
+
+    def snapshot(self):
+        "Get current snapshot, without blocking"
+        return self._snapshot
+
+    @property
+    def version(self):
+        "Version of current snapshot"
+        return self._snapshot.version
+
+    def copy(self):
+        """
+        Create copy of sequence from the current snapshot
+        """
+        return VersionedSequence(list(self._snapshot.seq), options = self._opts)
+
+    @contextlib.contextmanager
+    def transaction(self):
+        """
+        Sequence.transaction() holding the write lock throughout, so readers
+        see the whole transaction as a single new snapshot (or none if it is
+        rolled back)
+        """
+
+        with self._lock:
+            self._depth += 1
+
+            try:
+                with Sequence.transaction(self): yield self
+            finally:
+                self._depth -= 1
+                if not self._depth: self._publish()
+
+    # Writers
+
+    set = _writer(Sequence.set)
+    insert = _writer(Sequence.insert)
+    remove = _writer(Sequence.remove)
+    append = _writer(Sequence.append)
+    prepend = _writer(Sequence.prepend)
+    replace = _writer(Sequence.replace)
+    shift = _writer(Sequence.shift)
+    stretch_to = _writer(Sequence.stretch_to)
+    stretch_by = _writer(Sequence.stretch_by)
+    expand_to = _writer(Sequence.expand_to)
+    expand_by = _writer(Sequence.expand_by)
+    reverse = _writer(Sequence.reverse)
+    loop = _writer(Sequence.loop)
+    undo = _writer(Sequence.undo)
+    redo = _writer(Sequence.redo)
+    _restore = _writer(Sequence._restore)
+    replace_value = _writer(Sequence.replace_value)
+    replace_step = _writer(Sequence.replace_step)
+    remove_step = _writer(Sequence.remove_step)
+
+    # Readers
+
+    def get_step(self, step: int):
+        "Get value at step from current snapshot"
+        return self._snapshot.seq[step - 1]
+
+    def __len__(self):
+        return self._snapshot.steps
+
+    def __iter__(self):
+        """Iterate over current snapshot; later edits don't affect the iteration"""
+        return iter(self._snapshot.seq)
+
+    def __eq__(self, other: SequenceBase|list):
+        return list(self._snapshot.seq) == list(other)
@@ -0,0 +1,253 @@
+""" tempo.py
+------------
+Tempo and meter maps for converting between ticks, wall-clock time and
+bar:beat positions.
+
+Tempo is in quarter note beats per minute. Positions are in ticks (see
+duration.PPQ).
+"""
+
+from __future__ import annotations
+from typing import Optional
+
+from array import array
+from bisect import bisect_left, bisect_right
+
+import duration as dmod
+from duration import Duration, DurationArray, to_ticks
+
+# Constants
+
+DEFAULT_TEMPO = 120
+DEFAULT_BEATS = 4
+DEFAULT_BEAT = '4n'
+
+# Helper functions
+
+def _index(points: list, value):
+    "Index of the last change point at or before value (0 if before the first)"
+
+    return max(bisect_right(points, value) - 1, 0)
+
+def _insert(points: list, value):
+    "Insert value into sorted change points if new, returning (index, whether new)"
+
+    i = bisect_left(points, value)
+    new = i == len(points) or points[i] != value
+    if new: points.insert(i, value)
+
+    return i, new
+
+# TempoMap class
+
+class TempoMap:
+    """
+    Tempo and meter changes over a piece.
+
+    Cumulative seconds at each tempo change and cumulative bars at each meter
+    change are precomputed whenever a change is added, so conversions are a
+    binary search plus some arithmetic. Adding a change only recomputes the
+    changes after it.
+
+    A meter change that falls partway through a bar starts a new bar.
+    """
+
+    def __init__(self, bpm: int|float = DEFAULT_TEMPO,
+                 beats: int = DEFAULT_BEATS,
+                 beat: int|str|Duration = DEFAULT_BEAT
+    ):
+        self.tempos = {}
+        self.meters = {}
+
+        # precomputed change point tables
+        self._tempo_ticks = []
+        self._tempo_seconds = []
+        self._tempo_spt = []
+
+        self._meter_ticks = []
+        self._meter_bars = []
+        self._meter_bar_len = []
+        self._meter_beat_len = []
+
+        self.set_tempo(bpm)
+        self.set_meter(beats, beat)
+
+    # Building
+
+    def _build_tempos(self, start: int = 0):
+        "Precompute cumulative seconds at each tempo change from index start on"
+
+        ticks, spt, seconds = self._tempo_ticks, self._tempo_spt, self._tempo_seconds
+
+        # earlier changes are unaffected
+        del seconds[max(start, 1):]
+        if not seconds: seconds.append(0.0)
+
+        for i in range(len(seconds), len(ticks)):
+            seconds.append(seconds[-1] + (ticks[i] - ticks[i - 1]) * spt[i - 1])
+
+    def _build_meters(self, start: int = 0):
+        "Precompute bars elapsed at each meter change from index start on"
+
+        ticks, bar_len, bars = self._meter_ticks, self._meter_bar_len, self._meter_bars
+
+        # earlier changes are unaffected
+        del bars[max(start, 1):]
+        if not bars: bars.append(0)
+
+        for i in range(len(bars), len(ticks)):
+            bars.append(bars[-1] + -(-(ticks[i] - ticks[i - 1]) // bar_len[i - 1]))
+
+    # Changes
+
+    def set_tempo(self, bpm: int|float, at: int = 0):
+        "Set tempo in quarter note beats per minute from tick position at"
+
+        if bpm <= 0: raise ValueError(f'Invalid tempo: {bpm}')
+
+        self.tempos[at] = bpm
+
+        i, new = _insert(self._tempo_ticks, at)
+        spt = 60 / (bpm * dmod.PPQ)
+
+        if new: self._tempo_spt.insert(i, spt)
+        else: self._tempo_spt[i] = spt
+
+        self._build_tempos(i)
+
+        return self
+
+    def set_meter(self, beats: int, beat: int|str|Duration = DEFAULT_BEAT, at: int = 0):
+        "Set meter (beats per bar and beat duration) from tick position at"
+
+        if beats <= 0: raise ValueError(f'Invalid meter: {beats}')
+
+        beat = to_ticks(beat)
+        self.meters[at] = (beats, beat)
+
+        i, new = _insert(self._meter_ticks, at)
+
+        if new:
+            self._meter_beat_len.insert(i, beat)
+            self._meter_bar_len.insert(i, beats * beat)
+        else:
+            self._meter_beat_len[i] = beat
+            self._meter_bar_len[i] = beats * beat
+
+        self._build_meters(i)
+
+        return self
+
+    def tempo_at(self, ticks: int):
+        "Tempo at tick position"
+
+        return self.tempos[self._tempo_ticks[_index(self._tempo_ticks, ticks)]]
+
+    def meter_at(self, ticks: int):
+        "Meter at tick position as (beats, beat ticks)"
+
+        return self.meters[self._meter_ticks[_index(self._meter_ticks, ticks)]]
+
+    # Time conversion
+
+    def ticks_to_seconds(self, ticks: int|float):
+        "Convert tick position to seconds"
+
+        i = _index(self._tempo_ticks, ticks)
+
+        return self._tempo_seconds[i] + (ticks - self._tempo_ticks[i]) * self._tempo_spt[i]
+
+    def seconds_to_ticks(self, seconds: float):
+        "Convert seconds to tick position (not rounded)"
+
+        i = _index(self._tempo_seconds, seconds)
+
+        return self._tempo_ticks[i] + (seconds - self._tempo_seconds[i]) / self._tempo_spt[i]
+
+    def _convert_array(self, values, points: list, convert):
+        "Convert many values, walking change points forward for sorted input"
+
+        r = array('d')
+        last = len(points) - 1
+        i = 0
+        for v in values:
+            if v < points[i]:
+                i = _index(points, v)
+            else:
+                while i < last and points[i + 1] <= v: i += 1
+
+            r.append(convert(v, i))
+
+        return r
+
+    def ticks_to_seconds_array(self, ticks):
+        "Convert many tick positions to seconds"
+
+        tt, ts, spt = self._tempo_ticks, self._tempo_seconds, self._tempo_spt
+
+        return self._convert_array(ticks, tt, lambda v, i: ts[i] + (v - tt[i]) * spt[i])
+
+    def seconds_to_ticks_array(self, seconds):
+        "Convert many times in seconds to tick positions (not rounded)"
+
+        tt, ts, spt = self._tempo_ticks, self._tempo_seconds, self._tempo_spt
+
+        return self._convert_array(seconds, ts, lambda v, i: tt[i] + (v - ts[i]) / spt[i])
+
+    # Position conversion
+
+    def ticks_to_position(self, ticks: int|float):
+        """
+        Convert tick position to a (bar, beat, ticks) tuple, where bar and beat
+        count from 1 and ticks is the offset into the beat
+        """
+
+        i = _index(self._meter_ticks, ticks)
+
+        bar, t = divmod(ticks - self._meter_ticks[i], self._meter_bar_len[i])
+        beat, t = divmod(t, self._meter_beat_len[i])
+
+        return (int(self._meter_bars[i] + bar) + 1, int(beat) + 1, t)
+
+    def position_to_ticks(self, bar: int, beat: int = 1, ticks: int|float = 0):
+        "Convert bar and beat (counting from 1) plus tick offset to tick position"
+
+        i = _index(self._meter_bars, bar - 1)
+
+        return self._meter_ticks[i] + (bar - 1 - self._meter_bars[i]) * self._meter_bar_len[i] + \
+            (beat - 1) * self._meter_beat_len[i] + ticks
+
+    def position_at(self, seconds: float):
+        "Bar:beat position at time in seconds as a (bar, beat, ticks) tuple"
+
+        return self.ticks_to_position(self.seconds_to_ticks(seconds))
+
+    def seconds_at(self, bar: int, beat: int = 1, ticks: int|float = 0):
+        "Time in seconds at bar and beat (counting from 1) plus tick offset"
+
+        return self.ticks_to_seconds(self.position_to_ticks(bar, beat, ticks))
+
+    # Duration support
+
+    def duration_to_seconds(self, dur: int|str|Duration, at: int = 0):
+        "Length in seconds of a duration starting at tick position at"
+
+        return self.ticks_to_seconds(at + to_ticks(dur)) - self.ticks_to_seconds(at)
+
+    def onset_seconds(self, durs: DurationArray|list, at: int = 0):
+        "Start time in seconds of each of a run of durations starting at tick position at"
+
+        if not isinstance(durs, DurationArray): durs = DurationArray(durs)
+
+        onsets = durs.onsets()
+        if at: onsets = [at + t for t in onsets]
+
+        return self.ticks_to_seconds_array(onsets)
+
+    # String representation
+
+    def __repr__(self):
+        return f'{self.__class__}({self.tempos}, {self.meters})'
+
+    def __str__(self):
+        return f'tempos: {self.tempos} meters: {self.meters}'
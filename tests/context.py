@@ -12,6 +12,24 @@ import helpers
 import sequence_base
 import sequence
 import sequence_group
+import sequence_profile
+import sequence_sparse
+import sequence_versioned
+import sequence_generate
+import markov
+import pattern_index
+import necklace
+import sequence_gate
+import sequence_polymeter
+import sequence_automation
+import render
+import render_trigger
+import instrument
+import memprofile
+import history
+import musicians
+import batch
 import note
 import pitch
 import duration
+import tempo
@@ -0,0 +1,70 @@
+#!python
+
+from context import batch
+
+import io
+import json
+import unittest
+
+class TestBatch(unittest.TestCase):
+    def setUp(self):
+        self.chain = batch.parse_chain('stretch 8; shift 1')
+        self.lines = ['1 0 0 0', '1,0,1,0', '', '[1, 2, 0]', '{"seq": [1, 0], "name": "a"}', 'x y']
+
+    def test_parse_chain(self):
+        with self.subTest("Should map names to methods and parse arguments"):
+            self.assertListEqual(batch.parse_chain('stretch 16\nreplace_value 1 2.5; reverse'),
+                                 [('stretch_to', (16,)), ('replace_value', (1, 2.5)), ('reverse', ())])
+
+        with self.subTest("Should reject unknown transforms"):
+            with self.assertRaises(ValueError):
+                batch.parse_chain('explode 2')
+
+    def test_records(self):
+        for line in ('1 0 2', '1,0,2', '1, 0, 2', '[1, 0, 2]', '{"seq": [1, 0, 2], "x": 1}'):
+            with self.subTest("Should format records like their input", line = line):
+                form, data, values = batch.parse_record(line)
+                self.assertListEqual(values, [1, 0, 2])
+                self.assertEqual(batch.format_record(form, data, values), line)
+
+    def test_process_chunk(self):
+        out, steps, errors = batch.process_chunk(1, self.lines, self.chain)
+
+        with self.subTest("Should transform records and skip blank lines"):
+            self.assertListEqual(out[:2], ['0 1 0 0 0 0 0 0', '0,1,0,0,0,1,0,0'])
+            self.assertListEqual(json.loads(out[3])['seq'], [0, 1, 0, 0, 0, 0, 0, 0])
+            self.assertEqual(steps, 13)
+
+        with self.subTest("Should report bad records with line numbers"):
+            self.assertEqual(len(errors), 1)
+            self.assertEqual(errors[0][0], 6)
+
+        with self.subTest("Should skip records that fail to transform without counting their steps"):
+            out, steps, errors = batch.process_chunk(1, self.lines[:2], batch.parse_chain('shrink_by 0'))
+            self.assertEqual((out, steps), ([], 0))
+            self.assertListEqual([n for n, msg in errors], [1, 2])
+            self.assertIn('ZeroDivisionError', errors[0][1])
+
+        with self.subTest("Should skip records that are not lists of numbers"):
+            out, steps, errors = batch.process_chunk(1, ['{"seq": null}', '{"seq": 8}', '[1, "a"]', '1 0'], self.chain)
+            self.assertEqual((len(out), steps), (1, 2))
+            self.assertListEqual([n for n, msg in errors], [1, 2, 3])
+
+        with self.subTest("Stretching to the same size should change nothing"):
+            self.assertListEqual(batch.apply_chain([1, 0, 1, 0], batch.parse_chain('stretch 4; stretch_by 1')), [1, 0, 1, 0])
+
+    def test_run(self):
+        lines = [' '.join(str((i + j) % 3) for j in range(4)) for i in range(50)]
+        expected = [batch.format_record(' ', None, batch.apply_chain(batch.parse_record(l)[2], self.chain))
+                    for l in lines]
+
+        for workers in (1, 2):
+            with self.subTest("Should keep input order", workers = workers):
+                out = io.StringIO()
+                stats = batch.run(lines, self.chain, out, workers = workers, chunk = 7)
+                self.assertListEqual(out.getvalue().splitlines(), expected)
+                self.assertEqual(stats['records'], 50)
+                self.assertEqual(stats['steps'], 200)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -24,6 +24,71 @@ class Test_helpers(unittest.TestCase):
         with self.subTest("Should return tuple if note is complex"):
             self.assertSequenceEqual(d.frac_to_dur(Fraction(7, 8)), ('2n', '4d'))
 
+    def test_triplet_to_frac(self):
+        self.assertEqual(d.dur_to_frac('4t'), Fraction(1, 6))
+
+    def test_dur_to_ticks(self):
+        with self.subTest("Quarter note should be PPQ ticks"):
+            self.assertEqual(d.dur_to_ticks('4n'), d.PPQ)
+
+        with self.subTest("Dotted and triplet values should be exact"):
+            self.assertEqual(d.dur_to_ticks('8d'), d.PPQ * 3 // 4)
+            self.assertEqual(d.dur_to_ticks('8t'), d.PPQ // 3)
+            self.assertEqual(d.dur_to_ticks('64t') * 96, d.TICKS_PER_WHOLE)
+
+    def test_ticks_to_dur(self):
+        with self.subTest("Should return string if note is simple"):
+            self.assertEqual(d.ticks_to_dur(d.PPQ * 3 // 2), '4d')
+
+        with self.subTest("Should match frac_to_dur for complex notes"):
+            for f in [Fraction(7, 8), Fraction(5, 4), Fraction(13, 64)]:
+                self.assertSequenceEqual(d.ticks_to_dur(d.frac_to_ticks(f)), d.frac_to_dur(f))
+
+    def test_tie_strategies(self):
+        f = Fraction(7, 8)
+
+        with self.subTest("Greedy should take longest plain note first"):
+            self.assertSequenceEqual(d.frac_to_dur(f, 'greedy'), ('2n', '4d'))
+
+        with self.subTest("Fewest should use fewest notes"):
+            self.assertSequenceEqual(d.frac_to_dur(Fraction(13, 64), 'fewest'), ('8d', '64n'))
+
+        with self.subTest("Dotted should prefer dotted notes"):
+            self.assertSequenceEqual(d.frac_to_dur(f, 'dotted'), ('2d', '8n'))
+
+        with self.subTest("Beats should split at beat boundaries"):
+            self.assertSequenceEqual(d.frac_to_dur(f, 'beats'), ('4n', '4n', '4n', '8n'))
+
+        with self.subTest("Beats should split at beat boundaries from onset"):
+            self.assertSequenceEqual(d.frac_to_dur(f, 'beats', Fraction(1, 8)), ('8n', '4n', '4n', '4n'))
+            self.assertSequenceEqual(d.ticks_to_dur(d.PPQ * 2, 'beats', d.PPQ // 2), ('8n', '4n', '8n'))
+
+        with self.subTest("Invalid strategy should raise"):
+            self.assertRaises(ValueError, d.frac_to_dur, f, 'nope')
+
+    def test_tie_tables(self):
+        try:
+            d.set_tie_table_bars(1)
+            ticks = d.frac_to_ticks(Fraction(9, 8))
+
+            with self.subTest("Table should cover configured bars"):
+                d.ticks_to_dur(d.PPQ * 5)
+                self.assertNotIn(ticks, d.TIE_TABLES['greedy'])
+
+            with self.subTest("Values outside table should match table values"):
+                self.assertSequenceEqual(d.ticks_to_dur(ticks), ('1n', '8n'))
+        finally:
+            d.set_tie_table_bars(4)
+
+    def test_set_ppq(self):
+        self.assertRaises(ValueError, d.set_ppq, 100)
+
+        try:
+            d.set_ppq(960)
+            self.assertEqual(d.dur_to_ticks('4n'), 960)
+        finally:
+            d.set_ppq(480)
+
     def add_durs(self):
         self.assertEqual(d.add_durs('4n', '4n'), '2n')
 
@@ -44,6 +109,23 @@ class Test_Duration(unittest.TestCase):
         self.D.set('8d')
         self.assertEqual(self.D.duration, '8d')
 
+    def test_ticks(self):
+        self.D.set('2d')
+
+        with self.subTest("Ticks should track duration"):
+            self.assertEqual(self.D.ticks, d.PPQ * 3)
+
+        with self.subTest("from_ticks should round trip"):
+            self.assertEqual(d.Duration.from_ticks(self.D.ticks), '2d')
+
+        with self.subTest("from_ticks should reject tied values"):
+            self.assertRaises(ValueError, d.Duration.from_ticks, d.PPQ * 5)
+
+    def test_triplet_addition(self):
+        self.D.set('8t')
+
+        self.assertEqual(self.D + '8t', d.Duration('4t'))
+
     def test_equality(self):
         od = d.Duration('8d')
         self.D.set('4d')
@@ -147,5 +229,75 @@ class Test_Duration(unittest.TestCase):
 
         self.assertEqual(ceil(self.D), 1)
 
+class Test_FrozenDuration(unittest.TestCase):
+    def test_interning(self):
+        with self.subTest("Equal values should be the same object"):
+            self.assertIs(d.FrozenDuration('4n'), d.FrozenDuration(4))
+            self.assertIs(d.Duration('8d').freeze(), d.FrozenDuration('8d'))
+
+        with self.subTest("Arithmetic should return interned values"):
+            self.assertIs(d.FrozenDuration('4n') + '4n', d.FrozenDuration('2n'))
+
+    def test_immutable(self):
+        D = d.FrozenDuration('4n')
+
+        with self.subTest("Should not allow setting"):
+            self.assertRaises(TypeError, D.set, '8n')
+            with self.assertRaises(TypeError):
+                D.ticks = 0
+
+        with self.subTest("In-place operations should rebind"):
+            E = D
+            E += '4n'
+            self.assertEqual(D, '4n')
+            self.assertEqual(E, '2n')
+
+    def test_hashable(self):
+        counts = {d.FrozenDuration('4n'): 1}
+
+        self.assertIn(d.FrozenDuration('4n'), counts)
+
+        with self.subTest("Other keys with the same hash should not raise"):
+            self.assertNotIn(2 * d.PPQ, {d.FrozenDuration('2n'): 1})
+
+    def test_mutable_equality(self):
+        self.assertEqual(d.FrozenDuration('4d'), d.Duration('4d'))
+        self.assertEqual(d.FrozenDuration('4d').to_fraction(), Fraction(3, 8))
+
+class Test_DurationArray(unittest.TestCase):
+    def setUp(self):
+        self.A = d.DurationArray(['4n', '8n', 8, d.Duration('2n'), '4d'])
+
+    def test_init(self):
+        with self.subTest("Should convert to ticks"):
+            self.assertEqual(list(self.A.ticks), [480, 240, 240, 960, 720])
+
+        with self.subTest("Should compare with lists"):
+            self.assertEqual(self.A, ['4n', '8n', '8n', '2n', '4d'])
+
+    def test_onsets(self):
+        self.assertEqual(list(self.A.onsets()), [0, 480, 720, 960, 1920])
+
+    def test_total(self):
+        with self.subTest("Total ticks"):
+            self.assertEqual(self.A.total_ticks(), 2640)
+
+        with self.subTest("Total duration"):
+            self.assertSequenceEqual(self.A.total(), (d.Duration('1n'), d.Duration('4d')))
+
+    def test_positions(self):
+        with self.subTest("Should default to 4/4"):
+            self.assertEqual(self.A.positions()[1:], [(1, 2, 0), (1, 2, 240), (1, 3, 0), (2, 1, 0)])
+
+        with self.subTest("Should handle other meters"):
+            self.assertEqual(self.A.positions(3, '8n')[-1], (3, 3, 0))
+
+    def test_indexing(self):
+        with self.subTest("Index should return Duration"):
+            self.assertEqual(self.A[1], '8n')
+
+        with self.subTest("Slice should return DurationArray"):
+            self.assertEqual(self.A[1:3], ['8n', '8n'])
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,65 @@
+#!python
+
+from context import instrument
+from context import sequence
+
+import unittest
+
+class TestInstrument(unittest.TestCase):
+    def setUp(self):
+        self.original = sequence.Sequence.stretch_to
+        instrument.reset()
+        instrument.enable()
+        self.seq = sequence.Sequence([1, 0, 2, 0])
+
+    def tearDown(self):
+        instrument.disable()
+        instrument.reset()
+
+    def test_enable(self):
+        with self.subTest("Should replace methods"):
+            self.assertIsNot(sequence.Sequence.stretch_to, self.original)
+            self.assertTrue(instrument.is_enabled(sequence.Sequence))
+
+        with self.subTest("Disable should restore methods"):
+            instrument.disable()
+            self.assertIs(sequence.Sequence.stretch_to, self.original)
+            self.assertFalse(instrument.is_enabled())
+
+    def test_snapshot(self):
+        self.seq.stretch_to(8)
+        self.seq.stretch_to(16)
+        self.seq.shift(1)
+
+        stats = instrument.snapshot()
+
+        with self.subTest("Should count calls"):
+            self.assertEqual(stats['Sequence.stretch_to']['calls'], 2)
+            self.assertEqual(stats['Sequence.shift']['calls'], 1)
+
+        with self.subTest("Should not count nested calls"):
+            # only the set() from the constructor
+            self.assertEqual(stats['Sequence.set']['calls'], 1)
+
+        with self.subTest("Should record sizes"):
+            self.assertEqual(stats['Sequence.stretch_to']['mean_steps_in'], 6)
+            self.assertEqual(stats['Sequence.stretch_to']['mean_steps_out'], 12)
+            self.assertGreater(stats['Sequence.stretch_to']['bytes_copied'], 0)
+
+        with self.subTest("Should record latency"):
+            self.assertGreater(stats['Sequence.stretch_to']['total'], 0)
+            self.assertLessEqual(stats['Sequence.stretch_to']['p50'], stats['Sequence.stretch_to']['max'])
+
+    def test_reset(self):
+        self.seq.reverse()
+        instrument.reset()
+
+        self.assertEqual(instrument.snapshot(), {})
+
+    def test_export_text(self):
+        self.seq.loop(2)
+
+        self.assertIn('Sequence.loop', instrument.export_text())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+#!python
+
+from context import markov
+from context import sequence
+
+import os
+import tempfile
+import unittest
+
+class TestMarkov(unittest.TestCase):
+    def setUp(self):
+        self.lanes = [[60, 62, 64, 62, 60, 62, 64, 62], sequence.Sequence([60, 62, 64, 65, 64, 62, 60, 62])]
+        self.model = markov.MarkovModel(2).train(self.lanes)
+
+    def test_keys(self):
+        with self.subTest("Should pack and unpack n-grams"):
+            key = markov.pack([3, 1, 2])
+            self.assertListEqual(markov.unpack(key, 3), [3, 1, 2])
+
+        with self.subTest("Should key every n-gram"):
+            self.assertListEqual(markov.ngram_keys([1, 2, 3, 4], 2), [markov.pack(p) for p in ([1, 2], [2, 3], [3, 4])])
+
+    def test_train(self):
+        with self.subTest("Should count transitions"):
+            self.assertEqual(sum(self.model.counts.values()), 12)
+            self.assertEqual(sum(self.model.starts.values()), 2)
+
+        with self.subTest("Should give transition probabilities"):
+            self.assertDictEqual(self.model.probabilities([62, 64]), {62: 2 / 3, 65: 1 / 3})
+            self.assertDictEqual(self.model.probabilities([64, 60]), {})
+
+        with self.subTest("Contexts shorter than the order should give nothing"):
+            self.assertNotEqual(self.model.probabilities([60, 62]), {})
+            self.assertDictEqual(self.model.probabilities([62]), {})
+
+    def test_sample(self):
+        s = self.model.sample(50, seed = 1)
+
+        with self.subTest("Should be reproducible"):
+            self.assertListEqual(s, self.model.sample(50, seed = 1))
+            self.assertEqual(len(s), 50)
+
+        with self.subTest("Should only make transitions seen in training"):
+            # every context in the training lanes has a successor, so no restarts
+            for i in range(2, 50):
+                self.assertIn(markov.pack(self.model._ids[v] for v in s[i - 2:i + 1]), self.model.counts)
+
+        with self.subTest("Should start from given values"):
+            self.assertListEqual(self.model.sample(4, seed = 1, start = [62, 64])[:2], [62, 64])
+
+        with self.subTest("Should sample many"):
+            rows = self.model.sample_many(3, 10, seed = 2)
+            self.assertEqual(len(rows), 3)
+            self.assertListEqual(rows, self.model.sample_many(3, 10, seed = 2))
+
+    def test_save_load(self):
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, 'model.mrkv')
+            loaded = markov.MarkovModel.load(self.model.save(path) and path)
+
+        with self.subTest("Should keep model"):
+            self.assertEqual(loaded.order, 2)
+            self.assertListEqual(loaded.states, self.model.states)
+            self.assertEqual(loaded.counts, self.model.counts)
+            self.assertEqual(loaded.starts, self.model.starts)
+            self.assertListEqual(loaded.sample(20, seed = 5), self.model.sample(20, seed = 5))
+
+        with self.subTest("Should reject other data"):
+            with self.assertRaises(ValueError):
+                markov.MarkovModel.from_bytes(b'XXXX' + bytes(20))
+
+if __name__ == '__main__':
+    unittest.main()
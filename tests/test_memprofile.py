@@ -0,0 +1,84 @@
+#!python
+
+from context import memprofile
+from context import sequence
+from context import sequence_sparse
+from context import pitch
+from context import history
+
+import tracemalloc
+import unittest
+
+class TestMemprofile(unittest.TestCase):
+    def test_profile_memory(self):
+        original = sequence.Sequence.stretch_to
+
+        with memprofile.profile_memory() as prof:
+            self.assertIsNot(sequence.Sequence.stretch_to, original)
+
+            seq = sequence.Sequence([1, 0, 2, 0] * 64)
+            seq.stretch_to(512)
+            seq.reverse()
+            p = pitch.Pitch('C4').transpose_semi(2)
+
+        with self.subTest("Should restore methods and stop tracing"):
+            self.assertIs(sequence.Sequence.stretch_to, original)
+            self.assertFalse(tracemalloc.is_tracing())
+
+        with self.subTest("Should record outermost calls only"):
+            self.assertEqual(prof.ops['Sequence.stretch_to'][0], 1)
+            self.assertEqual(prof.ops.get('Sequence.set', [0])[0], 0)
+            self.assertEqual(prof.ops['Pitch.transpose_semi'][0], 1)
+
+        with self.subTest("Should record allocations"):
+            self.assertGreater(prof.ops['Sequence.stretch_to'][2], 0)
+            self.assertGreater(prof.peak, 0)
+
+        with self.subTest("Should count undo entries"):
+            self.assertEqual(prof.history[0], 2)
+            self.assertGreater(prof.history[1], 0)
+
+    def test_peak(self):
+        with memprofile.profile_memory() as prof:
+            seq = sequence.Sequence([1, 0, 0, 0])
+            big = bytearray(1 << 20)
+            del big
+            seq.reverse()
+
+        self.assertGreaterEqual(prof.peak, 1 << 20)
+
+    def test_history_off(self):
+        history.set_history(False)
+
+        try:
+            with memprofile.profile_memory() as prof:
+                sequence.Sequence([1, 0, 0, 0]).reverse()
+        finally:
+            history.set_history(True)
+
+        self.assertEqual(prof.history, [0, 0])
+
+    def test_bytes_per_step(self):
+        with memprofile.profile_memory() as prof:
+            sequence.Sequence([1, 0, 0, 0])
+            sequence.Sequence([1, 0, 0, 0], options = {'shift-style': 'absolute'})
+            sequence_sparse.SparseSequence([1, 0, 0, 0])
+
+        configs = prof.bytes_per_step
+
+        with self.subTest("Should estimate each configuration seen"):
+            self.assertEqual(len(configs), 3)
+            self.assertIn(('Sequence', ()), configs)
+            self.assertIn(('Sequence', (('shift-style', 'absolute'),)), configs)
+
+        with self.subTest("Sparse sequences should hold less per step"):
+            self.assertLess(configs[('SparseSequence', ())][0], configs[('Sequence', ())][0])
+
+        with self.subTest("Report should list operations and configurations"):
+            report = prof.report()
+            self.assertIn('Sequence.__init__', report)
+            self.assertIn('SparseSequence', report)
+            self.assertIn('undo entries', report)
+
+if __name__ == '__main__':
+    unittest.main()
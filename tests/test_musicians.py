@@ -0,0 +1,95 @@
+#!python
+
+from context import musicians
+from context import history
+from context import sequence
+
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+class TestMusicians(unittest.TestCase):
+    def test_lazy_attributes(self):
+        with self.subTest("Should load classes from their modules"):
+            self.assertIs(musicians.Sequence, sequence.Sequence)
+            self.assertIs(musicians.sequence, sequence)
+
+        with self.subTest("Should load every registered name"):
+            for name in musicians.__all__: self.assertIsNotNone(getattr(musicians, name))
+
+        with self.subTest("Should raise AttributeError for unknown names"):
+            with self.assertRaises(AttributeError):
+                musicians.nothing
+
+        with self.subTest("Should list lazy attributes"):
+            self.assertIn('Pitch', dir(musicians))
+
+    def test_lazy_imports(self):
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        code = ("import sys, musicians; musicians.Pitch('C4'); "
+                "print(' '.join(m for m in ('sequence', 'historian', 'duration') if m in sys.modules))")
+
+        out = subprocess.run([sys.executable, '-c', code], cwd = root,
+                             capture_output = True, text = True, check = True).stdout
+
+        with self.subTest("Pitch should not import sequence modules"):
+            self.assertEqual(out.strip(), '')
+
+    def test_shadowed_module(self):
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        code = ("import sys, types; sys.modules['tempo'] = types.ModuleType('tempo'); "
+                "import musicians; musicians.tempo")
+
+        result = subprocess.run([sys.executable, '-c', code], cwd = root, capture_output = True, text = True)
+
+        with self.subTest("Should not load a same-named module from elsewhere"):
+            self.assertNotEqual(result.returncode, 0)
+            self.assertIn('ImportError', result.stderr)
+
+    def test_path(self):
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        init = os.path.join(root, 'musicians', '__init__.py')
+
+        # load the package by file, from a directory with its own helpers module
+        code = ("import sys, importlib.util; path = list(sys.path); "
+                f"spec = importlib.util.spec_from_file_location('musicians', {init!r}); "
+                "m = importlib.util.module_from_spec(spec); sys.modules['musicians'] = m; spec.loader.exec_module(m); "
+                "m.TempoMap(); import helpers; "
+                "print(sys.path == path, helpers.__file__)")
+
+        with tempfile.TemporaryDirectory() as tmp:
+            with open(os.path.join(tmp, 'helpers.py'), 'w') as f: f.write('')
+
+            env = {k: v for k, v in os.environ.items() if k != 'PYTHONPATH'}
+            out = subprocess.run([sys.executable, '-c', code], cwd = tmp, env = env,
+                                 capture_output = True, text = True, check = True).stdout.split()
+
+            with self.subTest("Should load modules without changing sys.path"):
+                self.assertEqual(out[0], 'True')
+
+            with self.subTest("Should not shadow modules with the same name"):
+                self.assertEqual(os.path.dirname(os.path.realpath(out[1])), os.path.realpath(tmp))
+
+class TestHistory(unittest.TestCase):
+    def tearDown(self):
+        history.set_history(True)
+
+    def test_set_history(self):
+        history.set_history(False)
+        seq = sequence.Sequence([1, 0, 0, 0]).shift(1)
+
+        with self.subTest("Should keep no undo entries when off"):
+            self.assertIsInstance(seq._undomgr, history.NullHistorian)
+            self.assertListEqual(seq.undo().seq, [0, 1, 0, 0])
+
+        history.set_history(True)
+        seq = sequence.Sequence([1, 0, 0, 0]).shift(1)
+
+        with self.subTest("Should undo when on"):
+            self.assertNotIsInstance(seq._undomgr, history.NullHistorian)
+            self.assertListEqual(seq.undo().seq, [1, 0, 0, 0])
+
+if __name__ == '__main__':
+    unittest.main()
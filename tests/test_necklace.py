@@ -0,0 +1,79 @@
+#!python
+
+from context import necklace as nk
+from context import pattern_index as pi
+from context import sequence_gate as sg
+
+import itertools as its
+import unittest
+
+def brute(n, hits = None, max_gap = None, bracelets = False):
+    "Canonical forms of all patterns, by rotating every one of 2^n lists"
+
+    found = set()
+    for t in its.product((0, 1), repeat = n):
+        if hits is not None and sum(t) != hits: continue
+
+        if max_gap is not None:
+            runs = [len(list(g)) for v, g in its.groupby(t + t) if not v]
+            if min(max(runs, default = 0), n) > max_gap: continue
+
+        canon = pi.canonical(list(t))[0]
+        if bracelets: canon = min(canon, pi.canonical(list(canon[::-1]))[0])
+        found.add(canon)
+
+    return found
+
+class TestNecklaces(unittest.TestCase):
+    def test_necklaces(self):
+        for n in range(1, 11):
+            with self.subTest("Should match brute force", n = n):
+                got = [tuple(x) for x in nk.necklaces(n)]
+                self.assertListEqual(got, sorted(brute(n)))
+
+    def test_counts(self):
+        with self.subTest("Should match known necklace counts"):
+            self.assertListEqual([nk.count(n) for n in range(1, 11)], [2, 3, 4, 6, 8, 14, 20, 36, 60, 108])
+
+        with self.subTest("Should match known bracelet counts"):
+            self.assertListEqual([nk.count(n, bracelets = True) for n in range(1, 11)],
+                                 [2, 3, 4, 6, 8, 13, 18, 30, 46, 78])
+
+    def test_constraints(self):
+        for n, hits, gap in [(8, 3, None), (10, 4, 2), (9, None, 1), (12, 5, 3), (7, 0, None), (6, 6, 0)]:
+            with self.subTest("Should match brute force", n = n, hits = hits, max_gap = gap):
+                got = [tuple(x) for x in nk.necklaces(n, hits, max_gap = gap)]
+                self.assertListEqual(got, sorted(brute(n, hits, gap)))
+
+        with self.subTest("Impossible hit counts should give nothing"):
+            self.assertListEqual(list(nk.necklaces(4, 5)), [])
+
+    def test_bracelets(self):
+        for n, hits, gap in [(9, None, None), (12, 5, None), (11, 4, 3)]:
+            got = [tuple(x) for x in nk.bracelets(n, hits, max_gap = gap)]
+
+            with self.subTest("Should give one pattern per class", n = n, hits = hits):
+                classes = [min(c, pi.canonical(list(c[::-1]))[0]) for c in got]
+                self.assertEqual(len(set(classes)), len(got))
+                self.assertSetEqual(set(classes), brute(n, hits, gap, True))
+
+    def test_packed(self):
+        lists = list(nk.necklaces(12, 5))
+        packed = list(nk.necklaces(12, 5, packed = True))
+
+        with self.subTest("Packed patterns should follow sequence_gate"):
+            self.assertListEqual(packed, [sg.pack_gates(x) for x in lists])
+
+    def test_lazy(self):
+        with self.subTest("Should yield without enumerating everything"):
+            gen = nk.necklaces(64, 32)
+            self.assertEqual(sum(next(gen)), 32)
+
+    def test_parallel(self):
+        for kwargs in [{}, {'max_gap': 3}, {'bracelets': True, 'packed': True}]:
+            with self.subTest("Should match a single process", **kwargs):
+                self.assertListEqual(list(nk.necklaces(16, 6, workers = 2, prefix = 5, chunk = 4, **kwargs)),
+                                     list(nk.necklaces(16, 6, **kwargs)))
+
+if __name__ == '__main__':
+    unittest.main()
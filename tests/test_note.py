@@ -0,0 +1,130 @@
+#!python
+
+from context import note as n
+from context import duration as d
+
+import unittest
+
+class Test_Note(unittest.TestCase):
+    def test_init(self):
+        N = n.Note('E4', '8d', 90)
+
+        with self.subTest("Should parse pitch"):
+            self.assertEqual(N.pitch.value, 64)
+
+        with self.subTest("Should keep duration"):
+            self.assertEqual(N.duration, '8d')
+
+    def test_copy(self):
+        N = n.Note('E4', d.Duration('8d'), 90)
+        C = N.copy()
+
+        with self.subTest("Should copy all attributes"):
+            self.assertEqual((C.pitch.value, C.duration, C.velocity), (64, '8d', 90))
+
+        with self.subTest("Should copy mutable values"):
+            self.assertIsNot(C.pitch, N.pitch)
+            self.assertIsNot(C.duration, N.duration)
+
+        with self.subTest("Should copy int durations"):
+            self.assertEqual(n.Note(60, 4).copy().duration, 4)
+
+        with self.subTest("Should keep class"):
+            self.assertIsInstance(n.Rest().copy(), n.Rest)
+
+    def test_from_values(self):
+        N = n.Note.from_values(62, d.PPQ, 70)
+
+        with self.subTest("Should set values"):
+            self.assertEqual((N.pitch_value, N.duration, N.velocity), (62, '4n', 70))
+
+        with self.subTest("Should share durations"):
+            self.assertIs(N.duration, n.Note.from_values(60, d.PPQ).duration)
+            self.assertIs(N.copy().duration, N.duration)
+
+        with self.subTest("Pitch should convert on access"):
+            self.assertEqual(str(N.pitch), 'D4')
+
+    def test_many(self):
+        notes = n.Note.many([60, 62, 64], [d.PPQ] * 3, 100)
+
+        self.assertEqual([N.pitch_value for N in notes], [60, 62, 64])
+        self.assertEqual([N.velocity for N in notes], [100] * 3)
+
+class Test_NoteArray(unittest.TestCase):
+    def setUp(self):
+        self.A = n.NoteArray([n.Note(60, '4n', 100), n.Rest('8n'), n.Note(64, '2n', 80)])
+
+    def test_init(self):
+        with self.subTest("Should store columns"):
+            self.assertEqual(list(self.A.pitch), [60, 0, 64])
+            self.assertEqual(list(self.A.ticks), [d.PPQ, d.PPQ // 2, d.PPQ * 2])
+            self.assertEqual(list(self.A.velocity), [100, 0, 80])
+
+        with self.subTest("Onsets should default to back to back notes"):
+            self.assertEqual(list(self.A.onset), [0, d.PPQ, d.PPQ * 3 // 2])
+
+        with self.subTest("Appending should continue onsets"):
+            self.A.append(n.Note(67))
+            self.assertEqual(self.A.onset[-1], d.PPQ * 7 // 2)
+
+        with self.subTest("Empty input should keep columns aligned"):
+            for A in (n.NoteArray().extend([]), n.NoteArray.from_columns([], [], [])):
+                self.assertEqual((len(A), len(A.onset)), (0, 0))
+                A.append(n.Note(60, '4n'))
+                self.assertEqual(list(A.onset), [0])
+
+    def test_as_list(self):
+        notes = self.A.as_list()
+
+        with self.subTest("Should convert to notes"):
+            self.assertEqual(notes[0].pitch.value, 60)
+            self.assertEqual(notes[2].duration, '2n')
+
+        with self.subTest("Should convert rests"):
+            self.assertIsInstance(notes[1], n.Rest)
+
+    def test_transpose(self):
+        self.A.transpose(70)
+
+        with self.subTest("Should limit to midi range"):
+            self.assertEqual(list(self.A.pitch), [127, 0, 127])
+
+        with self.subTest("Should wrap"):
+            self.A.transpose(2, 12)
+            self.assertEqual(self.A.pitch[0], 117)
+
+    def test_scale_velocity(self):
+        with self.subTest("Should limit to maximum"):
+            self.A.scale_velocity(1.5)
+            self.assertEqual(list(self.A.velocity), [127, 0, 120])
+
+        with self.subTest("Should limit to minimum"):
+            self.A.scale_velocity(-1)
+            self.assertEqual(list(self.A.velocity), [0, 0, 0])
+
+    def test_filter(self):
+        with self.subTest("Should filter by mask"):
+            self.assertEqual(list(self.A.filter([1, 0, 1]).pitch), [60, 64])
+
+        with self.subTest("Should filter by function"):
+            self.assertEqual(list(self.A.filter(lambda p, t, v, o: t > d.PPQ).onset), [d.PPQ * 3 // 2])
+
+        with self.subTest("Should drop rests"):
+            self.assertEqual(len(self.A.without_rests()), 2)
+
+    def test_views(self):
+        v = self.A[1:]
+        v.transpose(1)
+
+        with self.subTest("Slice should be a view"):
+            self.assertEqual(list(self.A.pitch), [60, 0, 65])
+
+        with self.subTest("Index should get a note"):
+            self.assertEqual(v[1].pitch.value, 65)
+
+    def test_total_ticks(self):
+        self.assertEqual(self.A.total_ticks(), d.PPQ * 7 // 2)
+
+if __name__ == '__main__':
+    unittest.main()
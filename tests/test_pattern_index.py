@@ -0,0 +1,62 @@
+#!python
+
+from context import pattern_index as pi
+from context import sequence
+
+import random
+import unittest
+
+class TestCanonical(unittest.TestCase):
+    def test_least_rotation(self):
+        r = random.Random(1)
+
+        for _ in range(200):
+            s = [r.randint(0, 2) for _ in range(r.randint(1, 12))]
+            rotations = [s[i:] + s[:i] for i in range(len(s))]
+
+            with self.subTest("Should match brute force", seq = s):
+                self.assertEqual(pi.least_rotation(s), rotations.index(min(rotations)))
+
+    def test_canonical(self):
+        seq = sequence.Sequence([1, 0, 0, 1, 0, 1, 0, 0])
+        canon, offset = pi.canonical(seq)
+
+        with self.subTest("Should be least rotation"):
+            self.assertTupleEqual(canon, (0, 0, 1, 0, 0, 1, 0, 1))
+
+        with self.subTest("Shifting canonical form by offset should give sequence"):
+            self.assertListEqual(sequence.Sequence(list(canon)).shift(offset).seq, seq.seq)
+
+        with self.subTest("Rotations should share a hash"):
+            self.assertEqual(pi.canonical_hash(seq), pi.canonical_hash(seq.copy().shift(3)))
+            self.assertNotEqual(pi.canonical_hash(seq), pi.canonical_hash([1, 1, 0, 0, 0, 1, 0, 0]))
+            self.assertTrue(pi.is_rotation(seq, seq.copy().shift(-2)))
+
+class TestPatternIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = pi.PatternIndex({'tresillo': [1, 0, 0, 1, 0, 0, 1, 0], 'four': [1, 0, 1, 0, 1, 0, 1, 0]})
+
+    def test_find(self):
+        query = sequence.Sequence([1, 0, 0, 1, 0, 0, 1, 0]).shift(3)
+        found = self.index.find(query)
+
+        with self.subTest("Should find rotations with shift from added sequence"):
+            self.assertListEqual(found, [('tresillo', 3)])
+            self.assertIn(query, self.index)
+            self.assertNotIn([1, 1, 0, 0, 0, 0, 0, 0], self.index)
+
+    def test_add(self):
+        entry, new = self.index.add([0, 1, 0, 1, 0, 1, 0, 1], 'offbeats')
+
+        with self.subTest("Rotations should join existing entry"):
+            self.assertFalse(new)
+            self.assertEqual(len(self.index), 2)
+            self.assertListEqual(self.index.find([1, 0, 1, 0, 1, 0, 1, 0]), [('four', 0), ('offbeats', 1)])
+
+    def test_dedupe(self):
+        seqs = [[1, 1, 0, 0], [0, 1, 1, 0], [1, 0, 1, 0], [0, 0, 1, 1], [0, 1, 0, 1]]
+
+        self.assertListEqual(pi.PatternIndex().dedupe(seqs), [[1, 1, 0, 0], [1, 0, 1, 0]])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+#!python
+
+from context import render
+from context import note
+from context import sequence
+
+import os
+import tempfile
+import unittest
+import wave
+
+from array import array
+
+class TestTimeline(unittest.TestCase):
+    def test_from_notes(self):
+        tl = render.Timeline.from_notes([note.Note('A4', '4n', 127), note.Rest('4n'), note.Note('A5', '8n', 64)])
+
+        with self.subTest("Should place notes in samples at the default tempo"):
+            self.assertListEqual(tl.start.tolist(), [0, 44100])
+            self.assertListEqual(tl.length.tolist(), [22050, 11025])
+
+        with self.subTest("Should convert pitch and velocity"):
+            self.assertListEqual(tl.freq.tolist(), [440.0, 880.0])
+            self.assertAlmostEqual(tl.gain[0], 1.0)
+
+    def test_from_sequence(self):
+        tl = render.Timeline.from_sequence(sequence.Sequence([60, 0, 62, 64]), '16n', [100, 50], gate = 0.5)
+
+        with self.subTest("Should skip rests and loop velocities"):
+            self.assertListEqual(tl.start.tolist(), [0, 11025, 16538])
+            self.assertListEqual([round(g * 127) for g in tl.gain], [100, 100, 50])
+            self.assertEqual(tl.length[0], 2756)
+
+    def test_between(self):
+        tl = render.Timeline().add(100, 50, 440).add(0, 1000, 220).add(500, 10, 110)
+
+        with self.subTest("Should keep events sorted"):
+            self.assertListEqual(tl.start.tolist(), [0, 100, 500])
+
+        with self.subTest("Should find overlapping events"):
+            self.assertListEqual(tl.between(120, 200), [0, 1])
+            self.assertListEqual(tl.between(600, 700), [0])
+
+class TestRender(unittest.TestCase):
+    def setUp(self):
+        self.click = render.OneShot([1.0, 0.5, 0.25])
+        self.drums = render.Track(render.Timeline.from_sequence([1, 0, 1, 1], '16n'), self.click)
+        self.synth = render.Track(render.Timeline.from_sequence([60, 64, 67, 0], '16n'), render.Oscillator('saw'),
+                                  gain = 0.5, pan = 0.5)
+
+    def test_oneshot(self):
+        left, right = self.drums.render(0, 20000, 256)
+
+        with self.subTest("Should place samples at hits"):
+            hits = [ix for ix, v in enumerate(left) if v > 0.7]
+            self.assertListEqual(hits, [0, 11025, 16538])
+
+        with self.subTest("Centre pan should be equal in both channels"):
+            self.assertListEqual(left.tolist(), right.tolist())
+
+    def test_oscillator(self):
+        tone = render.Track(render.Timeline().add(0, 44100, 441), render.Oscillator('sine', 0, 0))
+        left, _ = tone.render(0, 44100)
+
+        with self.subTest("Should play at the event frequency"):
+            crossings = sum(1 for a, b in zip(left, left[1:]) if a < 0 <= b)
+            self.assertIn(crossings, (440, 441))
+
+        with self.subTest("Should be silent after the event"):
+            self.assertEqual(max(map(abs, tone.render(44200, 45000)[0])), 0)
+
+    def test_windows(self):
+        tracks = [self.drums, self.synth]
+        whole = sum(render.render_windows(tracks, window = 1000), array('f'))
+
+        with self.subTest("Should render to the end of the last track"):
+            self.assertEqual(len(whole), 2 * max(t.end for t in tracks))
+
+        with self.subTest("Window and block size should not change the result"):
+            self.assertListEqual(sum(render.render_windows(tracks, block = 100, window = 3), array('f')).tolist(),
+                                 whole.tolist())
+
+        with self.subTest("Workers should not change the result"):
+            self.assertListEqual(sum(render.render_windows(tracks, window = 8, workers = 2), array('f')).tolist(),
+                                 whole.tolist())
+
+    def test_wav(self):
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, 'out.wav')
+            frames = render.render([self.drums, self.synth], path, seconds = 0.5)
+
+            with wave.open(path, 'rb') as f:
+                with self.subTest("Should write 16 bit stereo"):
+                    self.assertEqual((f.getnchannels(), f.getsampwidth(), f.getframerate()), (2, 2, 44100))
+
+                with self.subTest("Should write the requested length"):
+                    self.assertEqual(f.getnframes(), frames)
+                    self.assertEqual(frames, 22050)
+
+            with self.subTest("One-shots should load back from WAV"):
+                data, rate = render.read_wav(path)
+                self.assertEqual((len(data), rate), (22050, 44100))
+
+        with self.subTest("Should clip"):
+            self.assertEqual(array('h', render.to_pcm16(array('f', [2, -2, 0]))).tolist(), [32767, -32767, 0])
+
+if __name__ == '__main__':
+    unittest.main()
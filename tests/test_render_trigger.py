@@ -0,0 +1,75 @@
+#!python
+
+from context import render_trigger as rt
+from context import render
+from context import sequence_gate as sg
+from context import sequence
+from context import tempo
+
+import unittest
+
+from array import array
+
+class TestTriggers(unittest.TestCase):
+    def setUp(self):
+        self.sample = array('f', [1.0, 0.5, 0.25, 0.125])
+
+    def test_offsets(self):
+        with self.subTest("Should place hits at steps"):
+            offsets, gains = rt.trigger_offsets(sg.GateSequence([1, 0, 1, 1]))
+            self.assertListEqual(offsets.tolist(), [0, 11025, 16538])
+            self.assertListEqual(gains.tolist(), [1, 1, 1])
+
+        with self.subTest("Should loop"):
+            offsets, _ = rt.trigger_offsets([1, 0, 0, 0], loops = 3)
+            self.assertListEqual(offsets.tolist(), [0, 22050, 44100])
+
+        with self.subTest("Should follow tempo and steps per beat"):
+            offsets, _ = rt.trigger_offsets([1, 1], steps_per_beat = 2, tempo = tempo.TempoMap(60))
+            self.assertListEqual(offsets.tolist(), [0, 22050])
+
+        with self.subTest("Should swing every second step"):
+            offsets, _ = rt.trigger_offsets([1, 1, 1, 1], swing = 0.5)
+            self.assertListEqual(offsets.tolist(), [0, 8269, 11025, 19294])
+
+    def test_velocities(self):
+        offsets, gains = rt.trigger_offsets(sequence.Sequence([1, 1, 1, 1]), [127, 0])
+
+        with self.subTest("Should loop the velocity lane and skip velocity 0"):
+            self.assertListEqual(offsets.tolist(), [0, 11025])
+            self.assertListEqual(gains.tolist(), [1, 1])
+
+        _, gains = rt.trigger_offsets([1, 1], [127, 64])
+
+        with self.subTest("Should scale gain by velocity"):
+            self.assertAlmostEqual(gains[1], 64 / 127)
+
+    def test_mix(self):
+        out = rt.mix_triggers(self.sample, [0, 2, 9], [1.0, 0.5, 2.0], 10)
+
+        with self.subTest("Should add overlapping hits and cut off the end"):
+            self.assertListEqual(out.tolist(), [1, 0.5, 0.75, 0.375, 0.125, 0.0625, 0, 0, 0, 2])
+
+        with self.subTest("Should size the buffer to fit the last hit"):
+            self.assertEqual(len(rt.mix_triggers(self.sample, [0, 6])), 10)
+
+        with self.subTest("Should match mixing hit by hit"):
+            offsets, gains = rt.trigger_offsets([1, 1, 0, 1] * 4, [127, 90, 30], steps_per_beat = 64)
+            out = rt.render_triggers([1, 1, 0, 1] * 4, self.sample, [127, 90, 30], steps_per_beat = 64)
+
+            expected = [0.0] * len(out)
+            for o, g in zip(offsets, gains):
+                for k, v in enumerate(self.sample): expected[o + k] += v * g
+
+            for a, b in zip(out, expected): self.assertAlmostEqual(a, b, 6)
+
+    def test_track(self):
+        track = rt.trigger_track([1, 0, 1, 0], self.sample, pan = -1)
+        left, right = track.render(0, track.end)
+
+        with self.subTest("Should render with the block renderer"):
+            self.assertListEqual([ix for ix, v in enumerate(left) if v > 0.9], [0, 11025])
+            self.assertLess(max(right), 1e-6)
+
+if __name__ == '__main__':
+    unittest.main()
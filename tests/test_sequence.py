@@ -381,6 +381,52 @@ class TestSequence(unittest.TestCase):
         with self.subTest("Reset should erase cache"):
             self.assertEqual(self.seq._undomgr.size("undo"), 0)
 
+    def test_transaction(self):
+        self.seq.set([1,0,1,0,1,0,1,0])
+
+        with self.subTest("Edits should apply inside transaction"):
+            with self.seq.transaction():
+                for step in range(1, 9): self.seq.replace_step(step, 2)
+                self.seq.append([0,0])
+
+            self.assertListEqual(self.seq.seq, [2,2,2,2,2,2,2,2,0,0])
+
+        with self.subTest("Hits and steps should be counted on exit"):
+            self.assertEqual((self.seq.steps, self.seq.hits), (10, 8))
+
+        with self.subTest("A single undo should revert the transaction"):
+            self.seq.undo()
+            self.assertListEqual(self.seq.seq, [1,0,1,0,1,0,1,0])
+            self.assertEqual(self.seq.hits, 4)
+
+        with self.subTest("Redo should reapply the transaction"):
+            self.seq.redo()
+            self.assertListEqual(self.seq.seq, [2,2,2,2,2,2,2,2,0,0])
+
+        with self.subTest("Exceptions should roll back"):
+            with self.assertRaises(ValueError):
+                with self.seq.transaction():
+                    self.seq.shift(1).remove(2)
+                    with self.seq.transaction():
+                        self.seq.replace_step(1, 9)
+                    raise ValueError
+
+            self.assertListEqual(self.seq.seq, [2,2,2,2,2,2,2,2,0,0])
+            self.assertEqual((self.seq.steps, self.seq.offset), (10, 0))
+
+        with self.subTest("Rolled back transaction should not register undo"):
+            self.seq.undo()
+            self.assertListEqual(self.seq.seq, [1,0,1,0,1,0,1,0])
+
+        with self.subTest("Edits inside a transaction should not copy for undo"):
+            registered = []
+
+            with self.seq.transaction():
+                self.seq._undomgr.register = lambda *args: registered.append(args)
+                self.seq.replace_value(1, 3).remove_step(2).stretch_to(16)
+
+            self.assertListEqual(registered, [])
+
     def test_replace_step(self):
         self.seq.set([1,2,3,4])
         self.seq.replace_step(2, 4)
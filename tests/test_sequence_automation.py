@@ -0,0 +1,120 @@
+#!python
+
+from context import sequence_automation as auto
+from context import sequence_base
+
+import math
+import random
+import unittest
+
+from array import array
+
+class TestBuffers(unittest.TestCase):
+    def test_stretch(self):
+        r = random.Random(3)
+
+        for _ in range(100):
+            data = [r.randint(0, 100) for _ in range(r.randint(1, 16))]
+            size = r.randint(1, 48)
+            if size == len(data): continue
+
+            for style in (0, 5, 'repeat', 'interpolate'):
+                for istyle in ('loop', 'repeat'):
+                    with self.subTest("Should match stretch_seq()", data = data, size = size, style = style):
+                        expected = sequence_base.stretch_seq(data, size, style, istyle, 'auto')
+                        result = auto.stretch_buffer(array('f', data), size, style, istyle, 'auto')
+                        self.assertListEqual(result.tolist(), expected)
+
+        with self.subTest("Should interpolate negative values"):
+            result = auto.stretch_buffer(array('f', [0, -4]), 4, 'interpolate', 'repeat')
+            self.assertListEqual(result.tolist(), [0, -2, -4, -4])
+
+    def test_expand(self):
+        data = [1, 5, 9, 3]
+
+        for style, looplen in [(0, 0), (2, 0), ('repeat', 0), ('loop', 0), ('loop', 2), ('interpolate', 0)]:
+            with self.subTest("Should match expand_seq()", style = style, looplen = looplen):
+                expected = sequence_base.expand_seq(data, 9, style, looplen, 'auto')
+                self.assertListEqual(auto.expand_buffer(array('f', data), 9, style, looplen, 'auto').tolist(), expected)
+
+    def test_resample(self):
+        sine = array('f', [math.sin(2 * math.pi * i / 32) for i in range(32)])
+
+        for method, tolerance in [('linear', 0.01), ('polyphase', 0.001)]:
+            with self.subTest("Should resample smoothly", method = method):
+                result = auto.resample(sine, 128, method)
+                error = max(abs(v - math.sin(2 * math.pi * i / 128)) for i, v in enumerate(result))
+                self.assertLess(error, tolerance)
+
+        with self.subTest("Same size should give the same values"):
+            self.assertListEqual(auto.resample(array('f', [1, 2, 3, 4]), 4, 'polyphase').tolist(), [1, 2, 3, 4])
+
+        with self.subTest("Polyphase shrinking should filter out detail that can't be kept"):
+            fast = array('f', [(-1) ** i for i in range(64)])
+            self.assertLess(max(map(abs, auto.resample(fast, 16, 'polyphase'))), 0.01)
+
+        with self.subTest("Repeat style should hold the last value"):
+            self.assertListEqual(auto.resample(array('f', [0, 2]), 4, istyle = 'repeat').tolist(), [0, 1, 2, 2])
+
+        with self.subTest("Rendering in parts should match rendering at once"):
+            render = auto.resampler(sine, 100, 'polyphase')
+            self.assertListEqual((render(0, 30) + render(30, 100)).tolist(), render(0, 100).tolist())
+
+    def test_envelope(self):
+        data = array('f', [0, 5, -2, 1, 1, 9, 3, -7, 0, 0])
+        mins, maxs = auto.envelope(data, 3)
+
+        with self.subTest("Should keep peaks of each bucket"):
+            self.assertListEqual(mins.tolist(), [-2, 1, -7])
+            self.assertListEqual(maxs.tolist(), [5, 9, 3])
+
+class TestAutomationLane(unittest.TestCase):
+    def setUp(self):
+        self.lane = auto.AutomationLane([0, 10, 20, -5], options = {'stretch-with': 'interpolate'})
+
+    def test_init(self):
+        with self.subTest("Should store a float32 array"):
+            self.assertEqual(self.lane.seq.typecode, 'f')
+            self.assertEqual((self.lane.steps, self.lane.hits), (4, 2))
+
+    def test_stretch(self):
+        with self.subTest("Should stretch with sequence options"):
+            self.lane.stretch_to(8)
+            self.assertListEqual(self.lane.as_list(), [0, 5, 10, 15, 20, 7.5, -5, -2.5])
+
+        with self.subTest("Should undo"):
+            self.lane.undo()
+            self.assertListEqual(self.lane.as_list(), [0, 10, 20, -5])
+
+        with self.subTest("Should expand"):
+            self.lane.expand_to(6, 'interpolate', interpolate_rounding = 'auto')
+            self.assertListEqual(self.lane.as_list(), [0, 10, 20, -5, -2, -1])
+
+    def test_edit(self):
+        with self.subTest("Should insert lists and lanes"):
+            self.lane.insert([1, 2], 2).append(auto.AutomationLane([7]))
+            self.assertListEqual(self.lane.as_list(), [0, 1, 2, 10, 20, -5, 7])
+            self.assertEqual(self.lane.seq.typecode, 'f')
+
+        with self.subTest("Should loop"):
+            self.lane.loop(2)
+            self.assertEqual(self.lane.steps, 14)
+
+    def test_query(self):
+        with self.subTest("Should interpolate between steps"):
+            self.assertEqual(self.lane.value_at(2.5), 15)
+            self.assertEqual(self.lane.value_at(4.5), -2.5)
+
+        with self.subTest("Blocks should join up to the resampled lane"):
+            blocks = list(self.lane.blocks(100, 32))
+            self.assertListEqual([len(b) for b in blocks], [32, 32, 32, 4])
+            self.assertListEqual(sum(blocks, array('f')).tolist(), auto.resample(self.lane.seq, 100).tolist())
+
+        with self.subTest("Resample should register undo"):
+            self.lane.resample_to(8)
+            self.assertListEqual(self.lane.as_list(), [0, 5, 10, 15, 20, 7.5, -5, -2.5])
+            self.lane.undo()
+            self.assertEqual(self.lane.steps, 4)
+
+if __name__ == '__main__':
+    unittest.main()
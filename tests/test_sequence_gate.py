@@ -0,0 +1,125 @@
+#!python
+
+from context import sequence_gate as gate
+from context import sequence_base
+from context import sequence
+
+import unittest
+
+class Test_gate_funcs(unittest.TestCase):
+    def test_pack(self):
+        with self.subTest("Should pack first step into lowest bit"):
+            self.assertEqual(gate.pack_gates([1, 0, 0, 1, 0]), 0b01001)
+
+        with self.subTest("Should unpack"):
+            self.assertListEqual(gate.unpack_gates(0b01001, 5), [1, 0, 0, 1, 0])
+
+    def test_rotate(self):
+        seq = [1, 1, 0, 0, 1, 0, 0]
+        bits = gate.pack_gates(seq)
+
+        for amt in (2, -2, 9):
+            with self.subTest(f"Should shift like shift_seq by {amt}"):
+                self.assertListEqual(gate.unpack_gates(gate.rotate_gates(bits, 7, amt), 7), sequence_base.shift_seq(seq, amt))
+
+    def test_reverse(self):
+        seq = [1, 1, 0, 0, 1, 0, 0, 0, 0, 1, 1]
+
+        self.assertListEqual(gate.unpack_gates(gate.reverse_gates(gate.pack_gates(seq), 11), 11), seq[::-1])
+
+    def test_euclidean(self):
+        self.assertListEqual(gate.unpack_gates(gate.euclidean_gates(16, 5, 1), 16), sequence_base.generate_euclidean(16, 5, 1))
+
+class TestGateSequence(unittest.TestCase):
+    def setUp(self):
+        self.seq = gate.GateSequence([1, 0, 0, 1, 0, 0, 1, 0])
+
+    def test_init(self):
+        with self.subTest("Should count steps and hits"):
+            self.assertEqual((self.seq.steps, self.seq.hits), (8, 3))
+
+        with self.subTest("Should convert from Sequence"):
+            self.assertEqual(gate.GateSequence(sequence.Sequence([0, 3, 0, 2])), [0, 1, 0, 1])
+
+        with self.subTest("Should convert to Sequence"):
+            self.assertIsInstance(self.seq.to_sequence(), sequence.Sequence)
+            self.assertListEqual(self.seq.to_sequence().seq, self.seq.seq)
+
+    def test_shift(self):
+        self.seq.shift(3)
+
+        self.assertEqual(self.seq, [1, 0, 0, 1, 0, 0, 1, 0][-3:] + [1, 0, 0, 1, 0])
+
+        with self.subTest("Offset should match Sequence"):
+            self.assertEqual(self.seq.shift(-4).offset, sequence.Sequence([1, 0, 0, 0]).shift(-1).offset)
+
+    def test_stretch(self):
+        with self.subTest("Should stretch like stretch_seq"):
+            self.assertEqual(self.seq.copy().stretch_to(13, 0), sequence_base.stretch_seq(self.seq.seq, 13, 0))
+
+        with self.subTest("Should shrink like stretch_seq"):
+            self.assertEqual(self.seq.copy().stretch_to(5, 0), sequence_base.stretch_seq(self.seq.seq, 5, 0))
+
+        with self.subTest("Should round offset like Sequence"):
+            S = sequence.Sequence(self.seq.seq).shift(3)
+            self.seq.shift(3)
+            self.assertEqual(self.seq.stretch_to(12, 0).offset, S.stretch_to(12, 0).offset)
+
+    def test_expand(self):
+        with self.subTest("Should loop"):
+            self.assertEqual(self.seq.copy().expand_to(12, 'loop-3'), self.seq.seq + [0, 1, 0, 0])
+
+        with self.subTest("Should trim"):
+            self.assertEqual(self.seq.copy().expand_to(4), [1, 0, 0, 1])
+
+        with self.subTest("Should loop at most the whole sequence"):
+            self.assertEqual(self.seq.copy().expand_to(12, 'loop-20'), sequence_base.expand_seq(self.seq.seq, 12, 'loop', 20))
+
+        with self.subTest("Should fill empty sequences with 0"):
+            self.assertEqual(gate.GateSequence([]).expand_to(3, 'repeat'), [0, 0, 0])
+            self.assertEqual(gate.GateSequence([]).expand_to(3, 'loop-2'), [0, 0, 0])
+
+    def test_loop(self):
+        self.assertEqual(self.seq.copy().loop(3), self.seq.seq * 3)
+
+    def test_splicing(self):
+        with self.subTest("Should insert"):
+            self.assertEqual(self.seq.copy().insert([1, 1], 2), [1, 1, 1, 0, 0, 1, 0, 0, 1, 0])
+
+        with self.subTest("Should remove"):
+            self.assertEqual(self.seq.copy().remove(2, 3), [1, 0, 0, 1, 0])
+
+        with self.subTest("Should replace"):
+            self.assertEqual(self.seq.copy().replace([1, 1, 1], 7, 'trim'), [1, 0, 0, 1, 0, 0, 1, 1])
+
+    def test_steps(self):
+        with self.subTest("Should replace step"):
+            self.seq[2] = 1
+            self.assertEqual(self.seq.hits, 4)
+
+        with self.subTest("Should replace value"):
+            self.seq.replace_value(1, 0, 2)
+            self.assertEqual(self.seq, [0, 0, 0, 1, 0, 0, 1, 0])
+
+        with self.subTest("Should index steps like Sequence"):
+            self.assertEqual(self.seq.get_step(0), sequence.Sequence(self.seq.seq).get_step(0))
+            self.assertRaises(IndexError, self.seq.get_step, 9)
+            self.assertRaises(IndexError, self.seq.replace_step, 9, 1)
+
+    def test_logic(self):
+        other = gate.GateSequence([0, 1, 0, 1, 0, 0, 0, 0])
+
+        with self.subTest("Union"):
+            self.assertEqual(self.seq | other, [1, 1, 0, 1, 0, 0, 1, 0])
+
+        with self.subTest("Intersection"):
+            self.assertEqual(self.seq & other, [0, 0, 0, 1, 0, 0, 0, 0])
+
+        with self.subTest("Exclusive or"):
+            self.assertEqual(self.seq ^ other, [1, 1, 0, 0, 0, 0, 1, 0])
+
+        with self.subTest("Not"):
+            self.assertEqual(~self.seq, [0, 1, 1, 0, 1, 1, 0, 1])
+
+if __name__ == '__main__':
+    unittest.main()
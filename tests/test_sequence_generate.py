@@ -0,0 +1,88 @@
+#!python
+
+from context import sequence_generate as gen
+from context import sequence
+
+import unittest
+
+class TestGenerate(unittest.TestCase):
+    def test_seeds(self):
+        with self.subTest("Derived seeds should be stable and distinct"):
+            self.assertEqual(gen.derive_seed(1, 2), gen.derive_seed(1, 2))
+            self.assertEqual(len(set(gen.spawn(1, 100))), 100)
+
+        with self.subTest("Same seed should give same batch"):
+            self.assertEqual(gen.probability(5, 16, seed = 3).data, gen.probability(5, 16, seed = 3).data)
+            self.assertNotEqual(gen.probability(5, 16, seed = 3).data, gen.probability(5, 16, seed = 4).data)
+
+    def test_workers(self):
+        one = gen.generate(gen._walk_row, 10, 7, steps = 8, start = 60, moves = (-1, 1), low = 0, high = 127,
+                           every = 1, rounding = 'auto')
+        many = gen.generate(gen._walk_row, 10, 7, workers = 2, chunk = 3, steps = 8, start = 60, moves = (-1, 1),
+                            low = 0, high = 127, every = 1, rounding = 'auto')
+
+        self.assertEqual(one.data, many.data)
+
+    def test_batch(self):
+        b = gen.Batch.from_rows([[1, 0], [0, 2]], seed = 1)
+
+        with self.subTest("Should index rows"):
+            self.assertListEqual(b[1], [0, 2])
+            self.assertListEqual(b[-2], [1, 0])
+            self.assertEqual(len(b), 2)
+
+        with self.subTest("Should make sequences"):
+            seqs = b.to_sequences()
+            self.assertIsInstance(seqs[0], sequence.Sequence)
+            self.assertListEqual(seqs[1].seq, [0, 2])
+            self.assertListEqual(list(b.as_dict(['kick', 'snare'])), ['kick', 'snare'])
+
+    def test_euclidean(self):
+        b = gen.euclidean(20, 16, (3, 7), shift = True, value = 100, seed = 1)
+
+        for row in b:
+            with self.subTest("Rows should be euclidean", row = row):
+                hits = sum(1 for v in row if v)
+                self.assertTrue(3 <= hits <= 7)
+                self.assertEqual(set(row) - {0}, {100})
+
+                # a rotation of the plain rhythm
+                plain = [100 if v else 0 for v in sequence.generate_euclidean(16, hits)]
+                self.assertIn(tuple(row), {tuple(plain[i:] + plain[:i]) for i in range(16)})
+
+    def test_probability(self):
+        with self.subTest("Probabilities 0 and 1 should be exact"):
+            self.assertListEqual(gen.probability(2, 4, [1, 0], value = 5, seed = 1).as_list(), [[5, 0, 5, 0]] * 2)
+
+    def test_random_walk(self):
+        b = gen.random_walk(10, 32, (0, 10), moves = (-3, 3), low = 0, high = 10, seed = 1)
+
+        with self.subTest("Walks should stay in bounds"):
+            self.assertTrue(all(0 <= v <= 10 for v in b.data))
+
+        with self.subTest("Walks should move by the given moves"):
+            for row in b:
+                self.assertTrue(all(abs(a - b) in (0, 1, 2, 3) for a, b in zip(row, row[1:])))
+
+        with self.subTest("Interpolated walks should have steps values"):
+            self.assertEqual(gen.random_walk(3, 10, every = 4, seed = 1).steps, 10)
+
+        with self.subTest("Rounding should give ints or be rejected"):
+            self.assertTrue(all(type(v) == int for v in gen.random_walk(3, 10, every = 4, rounding = 'up', seed = 1).data))
+            self.assertRaises(ValueError, gen.random_walk, 3, 10, every = 4, rounding = 'none')
+
+    def test_humanize_mask(self):
+        b = gen.Batch.from_rows([[100, 0, 100, 0]] * 4)
+
+        with self.subTest("Humanize should keep rests and stay in range"):
+            h = gen.humanize(b, 5, seed = 1)
+            for row in h:
+                self.assertEqual(row[1], 0)
+                self.assertTrue(95 <= row[0] <= 105)
+
+        with self.subTest("Mask should only remove values"):
+            for row in gen.mask(b, 0.5, seed = 1):
+                self.assertTrue(all(v in (0, o) for v, o in zip(row, [100, 0, 100, 0])))
+
+if __name__ == '__main__':
+    unittest.main()
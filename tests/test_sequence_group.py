@@ -0,0 +1,56 @@
+#!python
+
+from context import sequence_group as sg
+from context import sequence
+from context import sequence_gate
+
+import unittest
+
+class TestSequenceGroup(unittest.TestCase):
+    def setUp(self):
+        self.group = sg.SequenceGroup({'gate': [1, 0, 1, 0], 'pitch': sequence.Sequence([60, 0, 64, 0])})
+
+    def test_labels(self):
+        with self.subTest("Should add sequences by label"):
+            self.assertListEqual(list(self.group.labels), ['gate', 'pitch'])
+            self.assertListEqual(self.group['gate'].seq, [1, 0, 1, 0])
+            self.assertIn('pitch', self.group)
+
+        with self.subTest("Should default labels to numbers"):
+            self.group.add(sequence.Sequence([1]))
+            self.assertListEqual(self.group[2].seq, [1])
+
+        with self.subTest("Setting a label should replace its sequence"):
+            self.group['gate'] = [1, 1]
+            self.assertListEqual(self.group['gate'].seq, [1, 1])
+            self.assertEqual(len(self.group.seqs), 3)
+
+    def test_transaction(self):
+        with self.subTest("Edits should apply to every sequence"):
+            with self.group.transaction():
+                self.group['gate'].replace_step(2, 1)
+                self.group['pitch'].replace_step(2, 62)
+
+            self.assertListEqual(self.group['gate'].seq, [1, 1, 1, 0])
+            self.assertEqual(self.group['gate'].hits, 3)
+
+        with self.subTest("Each sequence should undo the transaction in one step"):
+            self.group['pitch'].undo()
+            self.assertListEqual(self.group['pitch'].seq, [60, 0, 64, 0])
+
+        with self.subTest("Exceptions should roll back every sequence and the group"):
+            self.group['clap'] = sequence_gate.GateSequence([1, 0])
+
+            with self.assertRaises(KeyError):
+                with self.group.transaction():
+                    self.group['gate'].shift(1)
+                    self.group['clap'].replace_step(2, 1)
+                    self.group['new'] = [1]
+                    raise KeyError
+
+            self.assertListEqual(self.group['gate'].seq, [1, 1, 1, 0])
+            self.assertListEqual(self.group['clap'].seq, [1, 0])
+            self.assertNotIn('new', self.group)
+
+if __name__ == '__main__':
+    unittest.main()
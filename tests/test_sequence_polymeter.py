@@ -0,0 +1,99 @@
+#!python
+
+from context import sequence_polymeter as poly
+from context import sequence
+from context import sequence_gate as sg
+
+import itertools as its
+import unittest
+
+from sequence_base import loop_seq
+
+class TestPolymeter(unittest.TestCase):
+    def setUp(self):
+        self.kick = sequence.Sequence([1, 0, 0, 0])
+        self.hat = sequence.Sequence([1, 1, 0])
+        self.bell = sequence.Sequence([1, 0, 0, 1, 0])
+        self.pm = poly.Polymeter({'kick': self.kick, 'hat': self.hat, 'bell': self.bell})
+
+    def looped(self):
+        "Lanes looped out to the period, the slow way"
+
+        n = self.pm.period
+        return [loop_seq(s.seq, n // s.steps) for s in (self.kick, self.hat, self.bell)]
+
+    def test_period(self):
+        with self.subTest("Period should be the lcm of lane lengths"):
+            self.assertEqual((self.pm.period, len(self.pm), self.pm.steps), (60, 60, 60))
+
+    def test_labels(self):
+        pm = poly.Polymeter([[1, 0], [1, 0, 0]], labels = [1, 2])
+
+        with self.subTest("Should keep int labels"):
+            self.assertListEqual(list(pm.labels), [1, 2])
+
+        with self.subTest("Adding with an existing label should replace like setting it"):
+            pm.add(sequence.Sequence([0, 1]), 1)
+            pm[2] = [0, 0, 1]
+            self.assertListEqual(pm.window(1, 2), [(0, 0), (1, 0)])
+            self.assertEqual(len(pm.seqs), 2)
+
+        with self.subTest("Default labels should not replace existing ones"):
+            pm.add(sequence.Sequence([1]))
+            self.assertListEqual(list(pm.labels), [1, 2, 3])
+
+    def test_value(self):
+        kick, hat, bell = self.looped()
+
+        with self.subTest("Should match looped lanes"):
+            for t in range(1, 61):
+                self.assertEqual(self.pm.value('hat', t), hat[t - 1])
+                self.assertTupleEqual(self.pm.get_step(t), (kick[t - 1], hat[t - 1], bell[t - 1]))
+
+        with self.subTest("Steps past the period should wrap"):
+            self.assertTupleEqual(self.pm.get_step(61), self.pm.get_step(1))
+
+    def test_iter(self):
+        with self.subTest("Should iterate one period of combined steps"):
+            self.assertListEqual(list(self.pm), list(zip(*self.looped())))
+
+        with self.subTest("Should be lazy"):
+            steps = self.pm.iter_steps(length = 0)
+            self.assertEqual(len(list(its.islice(steps, 1000))), 1000)
+
+    def test_window(self):
+        combined = list(zip(*self.looped())) * 2
+
+        with self.subTest("Window should match combined steps"):
+            self.assertListEqual(self.pm.window(58, 10), combined[57:67])
+
+        with self.subTest("Lane window should match looped lane"):
+            self.assertListEqual(self.pm.lane_window('bell', 3, 7), [0, 1, 0, 1, 0, 0, 1])
+
+        with self.subTest("Should make sequences"):
+            seqs = self.pm.to_sequences(1, 8)
+            self.assertListEqual(seqs['kick'].seq, [1, 0, 0, 0, 1, 0, 0, 0])
+
+    def test_labels(self):
+        with self.subTest("Should get lanes by label"):
+            self.assertIs(self.pm['hat'], self.hat)
+            self.assertIn('bell', self.pm)
+
+        with self.subTest("Should add lanes from lists and other sequence types"):
+            self.pm['snare'] = [0, 0, 1, 0, 0, 0, 1]
+            self.pm.add(sg.GateSequence([1, 0]), 'clap')
+            self.assertEqual(self.pm.period, 420)
+            self.assertEqual(self.pm.value('snare', 10), 1)
+            self.assertEqual(self.pm.value('clap', 3), 1)
+
+        with self.subTest("Setting a label should replace its lane in place"):
+            self.pm['hat'] = [1, 0]
+            self.assertEqual(self.pm.get_step(2)[1], 0)
+
+    def test_view(self):
+        with self.subTest("Lane edits should show in the view"):
+            self.kick.replace_step(2, 9)
+            self.assertEqual(self.pm.value('kick', 6), 9)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+#!python
+
+from context import sequence_profile as sp
+from context import sequence
+
+import unittest
+
+class TestOptionProfile(unittest.TestCase):
+    def test_sharing(self):
+        a = sequence.Sequence([1, 0, 0, 0])
+        b = sequence.Sequence([0, 1, 0, 0])
+        c = sequence.Sequence([1, 0, 0, 0], options = {'stretch-with': 'repeat'})
+
+        with self.subTest("Same options should share one profile"):
+            self.assertIs(a.profile, b.profile)
+
+        with self.subTest("Different options should have their own profile"):
+            self.assertIsNot(a.profile, c.profile)
+            self.assertEqual(c.profile.stretch_with, 'repeat')
+
+        with self.subTest("setopts should recompile profile"):
+            b.setopts('stretch-with', 'repeat')
+            self.assertIs(b.profile, c.profile)
+            self.assertListEqual(b.stretch_to(8).seq, [0, 0, 1, 1, 0, 0, 0, 0])
+
+        with self.subTest("Cache should be bounded"):
+            for n in range(sp.PROFILE_CACHE_SIZE + 1): sp.compile_options({'loop-length': n})
+            self.assertEqual(sp._cached_profile.cache_info().currsize, sp.PROFILE_CACHE_SIZE)
+
+    def test_immutable(self):
+        p = sp.compile_options({'shift-style': 'absolute'})
+
+        with self.assertRaises(AttributeError):
+            p.shift_style = 'relative'
+
+        with self.assertRaises(TypeError):
+            p.options['shift-style'] = 'relative'
+
+    def test_expand(self):
+        p = sp.compile_options({'expand-with': 'loop-2'})
+
+        with self.subTest("Should parse loop length from style"):
+            self.assertTupleEqual(p.expand_style, ('loop', 2))
+            self.assertListEqual(p.expand([1, 2, 3], 7), [1, 2, 3, 2, 3, 2, 3])
+
+        with self.subTest("Explicit loop length 0 should loop entire sequence"):
+            self.assertListEqual(p.expand([1, 2, 3], 7, loop_length = 0), [1, 2, 3, 1, 2, 3, 1])
+
+        with self.subTest("Explicit style should override profile"):
+            self.assertListEqual(p.expand([1, 2, 3], 5, 'repeat'), [1, 2, 3, 3, 3])
+
+    def test_delete(self):
+        seq = sequence.Sequence([1, 2, 3, 4], options = {'delete-style': 5})
+
+        with self.subTest("Int delete style should fill step"):
+            self.assertListEqual(seq.remove_step(2).seq, [1, 5, 3, 4])
+
+        with self.subTest("Explicit style should override profile"):
+            self.assertListEqual(seq.remove_step(2, 'cut').seq, [1, 3, 4])
+
+if __name__ == '__main__':
+    unittest.main()
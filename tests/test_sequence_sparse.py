@@ -0,0 +1,81 @@
+#!python
+
+from context import sequence_sparse as sparse
+from context import sequence_base
+
+import unittest
+
+class TestSparseSequence(unittest.TestCase):
+    def setUp(self):
+        self.seq = sparse.SparseSequence([0, 3, 0, 0, 5, 0, 0, 1])
+
+    def test_init(self):
+        with self.subTest("Should store non-zero steps"):
+            self.assertEqual(list(self.seq.positions), [1, 4, 7])
+            self.assertEqual(self.seq.values, [3, 5, 1])
+
+        with self.subTest("Should count steps and hits"):
+            self.assertEqual((self.seq.steps, self.seq.hits), (8, 3))
+
+        with self.subTest("Blank sequence should store nothing"):
+            self.assertEqual(len(sparse.SparseSequence(64).positions), 0)
+
+    def test_as_list(self):
+        with self.subTest("Should build full list"):
+            self.assertListEqual(self.seq.as_list(), [0, 3, 0, 0, 5, 0, 0, 1])
+
+        with self.subTest("Iteration should match list"):
+            self.assertListEqual(list(self.seq), self.seq.as_list())
+
+    def test_euclidean(self):
+        seq = sparse.SparseSequence.euclidean(16, 5, 2)
+
+        self.assertListEqual(seq.as_list(), sequence_base.generate_euclidean(16, 5, 2))
+
+    def test_shift(self):
+        with self.subTest("Should shift and wrap"):
+            self.seq.shift(2)
+            self.assertListEqual(self.seq.as_list(), [0, 1, 0, 3, 0, 0, 5, 0])
+            self.assertEqual(list(self.seq.positions), [1, 3, 6])
+
+        with self.subTest("Should undo"):
+            self.seq.undo()
+            self.assertListEqual(self.seq.as_list(), [0, 3, 0, 0, 5, 0, 0, 1])
+
+    def test_stretch(self):
+        dense = sequence_base.stretch_seq(self.seq.as_list(), 13, 0)
+
+        with self.subTest("Should stretch like a list"):
+            self.seq.stretch_to(13, 0)
+            self.assertListEqual(self.seq.as_list(), dense)
+
+        with self.subTest("Should shrink like a list"):
+            self.seq.stretch_to(5, 0)
+            self.assertListEqual(self.seq.as_list(), sequence_base.stretch_seq(dense, 5, 0))
+
+        with self.subTest("Should stretch with other styles"):
+            self.seq.set([1, 2])
+            self.seq.stretch_to(4, "repeat")
+            self.assertListEqual(self.seq.as_list(), [1, 1, 2, 2])
+
+    def test_steps(self):
+        with self.subTest("Should get steps"):
+            self.assertEqual((self.seq[2], self.seq[3], self.seq[8]), (3, 0, 1))
+
+        with self.subTest("Should replace steps and count hits"):
+            self.seq[3] = 7
+            self.seq[2] = 0
+            self.assertListEqual(self.seq.as_list(), [0, 0, 7, 0, 5, 0, 0, 1])
+            self.assertEqual(self.seq.hits, 3)
+
+        with self.subTest("Should cut steps"):
+            self.seq.remove_step(3)
+            self.assertListEqual(self.seq.as_list(), [0, 0, 0, 5, 0, 0, 1])
+
+    def test_replace_value(self):
+        self.seq.replace_value(5, 2)
+
+        self.assertListEqual(self.seq.as_list(), [0, 3, 0, 0, 2, 0, 0, 1])
+
+if __name__ == '__main__':
+    unittest.main()
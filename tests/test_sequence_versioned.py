@@ -0,0 +1,128 @@
+#!python
+
+from context import sequence_versioned as sv
+
+import gc
+import random
+import threading
+import unittest
+import weakref
+
+class TestVersionedSequence(unittest.TestCase):
+    def setUp(self):
+        self.seq = sv.VersionedSequence([1, 0, 2, 0])
+
+    def test_snapshot(self):
+        snap = self.seq.snapshot()
+        self.seq.replace_step(2, 3).stretch_to(8)
+
+        with self.subTest("Old snapshot should be unchanged"):
+            self.assertTupleEqual(snap.seq, (1, 0, 2, 0))
+            self.assertEqual(snap.hits, 2)
+
+        with self.subTest("New snapshot should show edits"):
+            new = self.seq.snapshot()
+            self.assertListEqual(new.as_list(), self.seq.seq)
+            self.assertEqual(new.steps, 8)
+            self.assertGreater(new.version, snap.version)
+
+        with self.subTest("Snapshot hits should match its values"):
+            self.seq.replace_step(2, 0).replace_value(1, 0)
+            self.assertEqual(self.seq.snapshot().hits, sum(1 for v in self.seq.snapshot().seq if v > 0))
+
+        with self.subTest("Snapshots should be immutable"):
+            with self.assertRaises(AttributeError):
+                snap.steps = 2
+
+    def test_publish_once(self):
+        version = self.seq.version
+
+        with self.subTest("Nested writers should publish once"):
+            self.seq.stretch_to(8)
+            self.assertEqual(self.seq.version, version + 1)
+
+        with self.subTest("Undo should publish"):
+            self.seq.undo()
+            self.assertListEqual(list(self.seq), [1, 0, 2, 0])
+            self.assertEqual(self.seq.version, version + 2)
+
+    def test_transaction(self):
+        version = self.seq.version
+
+        with self.seq.transaction():
+            self.seq.replace_step(1, 5).replace_step(3, 5)
+
+            with self.subTest("Readers should not see a transaction in progress"):
+                self.assertTupleEqual(self.seq.snapshot().seq, (1, 0, 2, 0))
+
+        with self.subTest("Transaction should publish once"):
+            self.assertTupleEqual(self.seq.snapshot().seq, (5, 0, 5, 0))
+            self.assertEqual(self.seq.version, version + 1)
+
+    def test_iteration(self):
+        it = iter(self.seq)
+        self.seq.set([5, 5])
+
+        with self.subTest("Iteration should not see later edits"):
+            self.assertListEqual(list(it), [1, 0, 2, 0])
+            self.assertEqual(len(self.seq), 2)
+            self.assertEqual(self.seq[2], 5)
+
+    def test_reclaim(self):
+        ref = weakref.ref(self.seq.snapshot())
+        self.seq.reverse()
+        gc.collect()
+
+        self.assertIsNone(ref())
+
+    def test_concurrent(self):
+        seq = sv.VersionedSequence([1, 0, 0, 0] * 8)
+        stop = threading.Event()
+        errors = []
+
+        def read():
+            last = 0
+            while not stop.is_set():
+                snap = seq.snapshot()
+                values = list(iter(seq))
+
+                if len(snap.seq) != snap.steps or snap.hits != sum(1 for v in snap.seq if v > 0):
+                    errors.append(f'torn snapshot {snap}')
+                if snap.version < last:
+                    errors.append(f'version went back {snap.version} < {last}')
+                if not 16 <= len(values) <= 64:
+                    errors.append(f'bad length {len(values)}')
+
+                last = snap.version
+
+        def write(seed):
+            r = random.Random(seed)
+            for _ in range(300):
+                match r.randrange(5):
+                    case 0:
+                        seq.replace_step(r.randint(1, 16), r.randint(0, 3))
+                    case 1:
+                        seq.stretch_to(r.choice((16, 32, 48)))
+                    case 2:
+                        seq.insert([1, 0], r.randint(1, 8)) if len(seq) < 60 else seq.expand_to(16)
+                    case 3:
+                        seq.shift(r.randint(-3, 3))
+                    case 4:
+                        seq.replace_value(0, 1, 2)
+
+        readers = [threading.Thread(target = read) for _ in range(4)]
+        writers = [threading.Thread(target = write, args = (i,)) for i in range(4)]
+
+        for t in readers + writers: t.start()
+        for t in writers: t.join()
+        stop.set()
+        for t in readers: t.join()
+
+        with self.subTest("Readers should only see complete versions"):
+            self.assertListEqual(errors, [])
+
+        with self.subTest("Final snapshot should match sequence"):
+            self.assertListEqual(seq.snapshot().as_list(), seq.seq)
+
+if __name__ == '__main__':
+    unittest.main()
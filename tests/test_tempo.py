@@ -0,0 +1,73 @@
+#!python
+
+from context import tempo as t
+from context import duration as d
+
+import unittest
+
+class Test_TempoMap(unittest.TestCase):
+    def setUp(self):
+        # 120bpm 4/4, 60bpm from bar 3, 3/4 from bar 5
+        self.T = t.TempoMap(120)
+        self.T.set_tempo(60, d.PPQ * 8)
+        self.T.set_meter(3, '4n', d.PPQ * 16)
+
+    def test_ticks_to_seconds(self):
+        with self.subTest("Should convert at initial tempo"):
+            self.assertAlmostEqual(self.T.ticks_to_seconds(d.PPQ * 4), 2.0)
+
+        with self.subTest("Should accumulate across tempo changes"):
+            self.assertAlmostEqual(self.T.ticks_to_seconds(d.PPQ * 10), 6.0)
+
+    def test_seconds_to_ticks(self):
+        with self.subTest("Should convert at initial tempo"):
+            self.assertAlmostEqual(self.T.seconds_to_ticks(1.0), d.PPQ * 2)
+
+        with self.subTest("Should accumulate across tempo changes"):
+            self.assertAlmostEqual(self.T.seconds_to_ticks(6.0), d.PPQ * 10)
+
+    def test_arrays(self):
+        ticks = [0, d.PPQ * 4, d.PPQ * 10, d.PPQ * 2]
+
+        with self.subTest("Should convert many ticks"):
+            self.assertSequenceEqual(list(self.T.ticks_to_seconds_array(ticks)), [0.0, 2.0, 6.0, 1.0])
+
+        with self.subTest("Should convert many seconds"):
+            self.assertSequenceEqual(list(self.T.seconds_to_ticks_array([0.0, 2.0, 6.0, 1.0])), ticks)
+
+    def test_positions(self):
+        with self.subTest("Should find bar and beat"):
+            self.assertEqual(self.T.ticks_to_position(d.PPQ * 5 + 10), (2, 2, 10))
+
+        with self.subTest("Should count bars across meter changes"):
+            self.assertEqual(self.T.ticks_to_position(d.PPQ * 20), (6, 2, 0))
+
+        with self.subTest("Should convert positions back to ticks"):
+            self.assertEqual(self.T.position_to_ticks(6, 2), d.PPQ * 20)
+
+        with self.subTest("Should seek by seconds"):
+            self.assertEqual(self.T.position_at(6.0), (3, 3, 0))
+
+    def test_durations(self):
+        with self.subTest("Should time a duration at a position"):
+            self.assertAlmostEqual(self.T.duration_to_seconds('2n', d.PPQ * 8), 2.0)
+
+        with self.subTest("Should time onsets of a run of durations"):
+            self.assertSequenceEqual(list(self.T.onset_seconds(['1n', '1n', '2n'])), [0.0, 2.0, 4.0])
+
+    def test_changes(self):
+        with self.subTest("Changes added out of order should match in order"):
+            T = t.TempoMap(120).set_meter(3, '4n', d.PPQ * 16).set_tempo(60, d.PPQ * 8)
+            T.set_tempo(90, d.PPQ * 4).set_tempo(120, d.PPQ * 4)
+            T.set_meter(4, '4n', d.PPQ * 4).set_meter(4, '4n', d.PPQ * 4)
+
+            for ticks in range(0, d.PPQ * 24, d.PPQ // 2):
+                self.assertAlmostEqual(T.ticks_to_seconds(ticks), self.T.ticks_to_seconds(ticks))
+                self.assertEqual(T.ticks_to_position(ticks), self.T.ticks_to_position(ticks))
+
+        with self.subTest("Should validate initial tempo and meter"):
+            self.assertRaises(ValueError, t.TempoMap, 0)
+            self.assertRaises(ValueError, t.TempoMap, 120, 0)
+
+if __name__ == '__main__':
+    unittest.main()